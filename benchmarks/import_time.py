@@ -0,0 +1,75 @@
+"""
+Import-time benchmark of the package.
+
+Usage:
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --repeat 20 --max-ms 10
+
+Each statement runs in a fresh interpreter, so that nothing is cached in
+`sys.modules`, and is timed from inside it (interpreter startup excluded).
+With `--max-ms`, the command exits with status 1 when `import scv2py` takes
+longer than the given number of milliseconds.
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+from typing import Dict, List, Optional
+
+# Statements measured, from the cheapest to the most expensive
+STATEMENTS : Dict[str, str] = {
+    'import scv2py': 'import scv2py',
+    'services': 'from scv2py.services import AccountServiceEndpoint',
+    'session': 'from scv2py import SCV2Session',
+    'wildcard': 'from scv2py import *'
+}
+
+_TIMER : str = 'import time; started = time.perf_counter(); {statement}; print(time.perf_counter() - started)'
+
+def measure(statement : str, repeat : int) -> float:
+    """
+    Get the median time taken by `statement` in a fresh interpreter, in milliseconds.
+    """
+    samples : List[float] = [ ]
+
+    for _ in range(repeat):
+        output : str = subprocess.run(
+            [sys.executable, '-c', _TIMER.format(statement=statement)],
+            check=True, capture_output=True, text=True
+        ).stdout
+        samples.append(float(output) * 1000)
+
+    return statistics.median(samples)
+
+def loaded_modules(statement : str) -> int:
+    """
+    Get the number of modules of the package loaded by `statement`.
+    """
+    output : str = subprocess.run(
+        [sys.executable, '-c', f"import sys; {statement}; print(sum(1 for name in sys.modules if name.split('.')[0] == 'scv2py'))"],
+        check=True, capture_output=True, text=True
+    ).stdout
+    return int(output)
+
+def main(argv : Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.import_time', description='Import-time benchmark of scv2py')
+    parser.add_argument('--repeat', type=int, default=10, help='Fresh interpreters per statement (default: 10)')
+    parser.add_argument('--max-ms', type=float, help='Fail when `import scv2py` takes longer than this')
+    args = parser.parse_args(argv)
+
+    results : Dict[str, float] = { }
+
+    for name, statement in STATEMENTS.items():
+        results[name] = measure(statement, args.repeat)
+        print(f'{statement:<55} {results[name]:>8.2f} ms   {loaded_modules(statement):>3} scv2py modules')
+
+    if args.max_ms is not None and results['import scv2py'] > args.max_ms:
+        print(f"REGRESSION import scv2py: {results['import scv2py']:.2f} ms, maximum {args.max_ms} ms")
+        return 1
+
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,425 @@
+"""
+Local stand-in for a SAP Sales/Service Cloud V2 tenant, used by the benchmarks.
+
+The server answers on `https://127.0.0.1:<port>/sap/c4c/api/v1/<service>/<endpoint>[/<id>]`,
+the URL layout built by SCV2Session, with in-memory collections. It implements
+the subset of the API the client relies on: `$top`, `$skip`, `$count`, `$orderby`,
+`$filter` comparisons (`eq`, `ne`, `gt`, `ge`, `lt`, `le`) combined with `and`, `or`
+and parentheses, entity reads and writes, ETags and `If-Match`.
+
+Latency, the maximum page size, 429 responses and ETag checks are configurable,
+so that runs are reproducible on any machine.
+
+Example:
+    with MockTenant(latency=0.005, throttle_every=50) as tenant:
+        tenant.seed('account-service', 'accounts', 10000)
+        session = SCV2Session(sc_host=tenant.host, sc_user='user', sc_password='password',
+                              sc_verify_ssl=tenant.certificate)
+"""
+
+import json
+import os
+import random
+import re
+import shutil
+import ssl
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+API_BASE_PATH : str = '/sap/c4c/api/v1/'
+
+# Tokens of a $filter expression: parentheses, string literals and bare words
+_FILTER_TOKEN = re.compile(r"\(|\)|'(?:[^']|'')*'|[^\s()]+")
+
+_COMPARISONS : Dict[str, Any] = {
+    'eq': lambda a, b: a == b,
+    'ne': lambda a, b: a != b,
+    'gt': lambda a, b: a is not None and b is not None and a > b,
+    'ge': lambda a, b: a is not None and b is not None and a >= b,
+    'lt': lambda a, b: a is not None and b is not None and a < b,
+    'le': lambda a, b: a is not None and b is not None and a <= b
+}
+
+def _get_path(entity : dict, path : str) -> Any:
+    value : Any = entity
+    for segment in path.split('/'):
+        value = value.get(segment) if isinstance(value, dict) else None
+    # IDs are compared case insensitively, as the tenant normalizes UUIDs
+    return value.lower() if path == 'id' and isinstance(value, str) else value
+
+def _literal(token : str) -> Any:
+    if token.startswith("'"):
+        return token[1:-1].replace("''", "'")
+    if token in ('true', 'false', 'null'):
+        return { 'true': True, 'false': False, 'null': None }[token]
+    try:
+        return float(token) if '.' in token or 'e' in token.lower() else int(token)
+    except ValueError:
+        # Unquoted timestamps (e.g. 2024-05-01T10:00:00Z) compare as strings
+        return token
+
+def _parse_filter(expression : str) -> Callable[[dict], bool]:
+    # Recursive descent parser: or > and > comparisons and parentheses
+    tokens : List[str] = _FILTER_TOKEN.findall(expression)
+    position : List[int] = [0]
+
+    def peek() -> Optional[str]:
+        return tokens[position[0]] if position[0] < len(tokens) else None
+
+    def take() -> str:
+        token : Optional[str] = peek()
+        if token is None:
+            raise ValueError(f"Unexpected end of filter '{expression}'")
+        position[0] += 1
+        return token
+
+    def parse_or() -> Callable[[dict], bool]:
+        terms = [parse_and()]
+        while peek() == 'or':
+            take()
+            terms.append(parse_and())
+        return terms[0] if len(terms) == 1 else (lambda entity: any(term(entity) for term in terms))
+
+    def parse_and() -> Callable[[dict], bool]:
+        factors = [parse_factor()]
+        while peek() == 'and':
+            take()
+            factors.append(parse_factor())
+        return factors[0] if len(factors) == 1 else (lambda entity: all(factor(entity) for factor in factors))
+
+    def parse_factor() -> Callable[[dict], bool]:
+        if peek() == '(':
+            take()
+            inner = parse_or()
+            if take() != ')':
+                raise ValueError(f"Unbalanced parentheses in filter '{expression}'")
+            return inner
+
+        path, operator, value = take(), take(), _literal(take())
+        if operator not in _COMPARISONS:
+            raise ValueError(f"Unsupported operator '{operator}'")
+        if path == 'id' and isinstance(value, str):
+            value = value.lower()
+
+        compare = _COMPARISONS[operator]
+        return lambda entity: compare(_get_path(entity, path), value)
+
+    condition = parse_or()
+    if peek() is not None:
+        raise ValueError(f"Unexpected '{peek()}' in filter '{expression}'")
+    return condition
+
+def _sort(items : List[dict], orderby : str) -> List[dict]:
+    # Stable sorts, from the last key to the first one. Missing values come first.
+    for clause in reversed([clause.split() for clause in orderby.split(',') if clause.strip()]):
+        path, descending = clause[0], len(clause) > 1 and clause[1].lower() == 'desc'
+        values : Dict[int, Any] = { id(entity): _get_path(entity, path) for entity in items }
+        items = sorted(items, key=lambda entity: (values[id(entity)] is not None, values[id(entity)]), reverse=descending)
+    return items
+
+def _self_signed_certificate(directory : str) -> Tuple[str, str]:
+    # Python cannot create certificates on its own: the openssl command line is used
+    openssl : Optional[str] = shutil.which('openssl')
+    if openssl is None:
+        raise RuntimeError("The mock tenant requires the 'openssl' command to create its certificate")
+
+    certificate : str = os.path.join(directory, 'certificate.pem')
+    key : str = os.path.join(directory, 'key.pem')
+
+    subprocess.run([
+        openssl, 'req', '-x509', '-newkey', 'rsa:2048', '-nodes', '-days', '1',
+        '-subj', '/CN=127.0.0.1', '-addext', 'subjectAltName=IP:127.0.0.1',
+        '-keyout', key, '-out', certificate
+    ], check=True, capture_output=True)
+
+    return certificate, key
+
+class _Handler(BaseHTTPRequestHandler):
+    # Keep-alive connections, as served by the tenant
+    protocol_version = 'HTTP/1.1'
+
+    # Headers and body are written separately: without this, delayed ACKs add ~40 ms per call
+    disable_nagle_algorithm = True
+
+    server : "_Server"
+
+    def log_message(self, format : str, *args) -> None:
+        pass
+
+    def __send(self, status : int, body : Any = None, headers : Dict[str, str] = None) -> None:
+        content : bytes = b'' if body is None else json.dumps(body).encode('utf-8')
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(content)))
+        for name, value in (headers or { }).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(content)
+
+    def __handle(self) -> None:
+        tenant : MockTenant = self.server.tenant
+
+        length : int = int(self.headers.get('Content-Length') or 0)
+        body : bytes = self.rfile.read(length) if length else b''
+
+        url = urlsplit(self.path)
+        if not url.path.startswith(API_BASE_PATH):
+            return self.__send(404, { 'error': 'Unknown path' })
+
+        parts : List[str] = url.path[len(API_BASE_PATH):].strip('/').split('/')
+        if len(parts) not in (2, 3):
+            return self.__send(404, { 'error': 'Unknown path' })
+
+        status, payload, headers = tenant.handle(
+            self.command,
+            collection=(parts[0], parts[1]),
+            resource_id=parts[2] if len(parts) == 3 else None,
+            params={ name: values[-1] for name, values in parse_qs(url.query).items() },
+            headers=self.headers,
+            body=json.loads(body) if body else None
+        )
+
+        self.__send(status, payload, headers)
+
+    do_GET = do_POST = do_PATCH = do_PUT = do_DELETE = __handle
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    tenant : "MockTenant"
+
+    def handle_error(self, request, client_address) -> None:
+        # Clients closing their connection early (e.g. on a timeout) are expected
+        if not isinstance(sys.exc_info()[1], (ConnectionError, ssl.SSLError)):
+            super().handle_error(request, client_address)
+
+class MockTenant:
+    """
+    In-memory SC v2 tenant served over HTTPS on the loopback interface.
+
+    Args:
+        latency: Time spent by the server before answering each request, in seconds
+        jitter: Random extra latency, up to this number of seconds
+        max_page_size: Maximum number of entities returned by a collection GET
+        throttle_every: Answer every N-th request with a 429. `None` disables throttling.
+        retry_after: `Retry-After` value sent with the 429 responses, in seconds
+        etags: Whether entities carry an ETag, and writes require a matching `If-Match`
+        seed: Seed of the random generator used for the jitter
+    """
+
+    def __init__(self,
+                 latency : float = 0.0,
+                 jitter : float = 0.0,
+                 max_page_size : int = 1000,
+                 throttle_every : int = None,
+                 retry_after : int = 0,
+                 etags : bool = True,
+                 seed : int = 0) -> None:
+
+        if latency < 0 or jitter < 0:
+            raise ValueError("Latency cannot be negative")
+
+        if max_page_size <= 0:
+            raise ValueError("Max page size must be a positive integer")
+
+        if throttle_every is not None and throttle_every <= 1:
+            raise ValueError("Throttle interval must be greater than 1")
+
+        self.latency = latency
+        self.jitter = jitter
+        self.max_page_size = max_page_size
+        self.throttle_every = throttle_every
+        self.retry_after = retry_after
+        self.etags = etags
+
+        self.__random = random.Random(seed)
+        self.__lock = threading.Lock()
+        self.__collections : Dict[Tuple[str, str], Dict[str, dict]] = { }
+        self.__versions : Dict[str, int] = { }
+        self.__requests : int = 0
+        self.__throttled : int = 0
+
+        self.__directory : Optional[str] = None
+        self.__server : Optional[_Server] = None
+        self.__thread : Optional[threading.Thread] = None
+
+    def __enter__(self) -> "MockTenant":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
+
+    @property
+    def host(self) -> str:
+        """
+        Host name to pass as `sc_host` to the sessions, port included.
+        """
+        return f'127.0.0.1:{self.__server.server_address[1]}'
+
+    @property
+    def certificate(self) -> str:
+        """
+        Path of the self-signed certificate of the server, to pass as `sc_verify_ssl`.
+        """
+        return os.path.join(self.__directory, 'certificate.pem')
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """
+        Number of requests received, and of requests answered with a 429.
+        """
+        with self.__lock:
+            return { 'requests': self.__requests, 'throttled': self.__throttled }
+
+    def start(self) -> None:
+        """
+        Start serving on a free port, in a background thread.
+        """
+        self.__directory = tempfile.mkdtemp(prefix='scv2-mock-')
+        certificate, key = _self_signed_certificate(self.__directory)
+
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(certificate, key)
+
+        self.__server = _Server(('127.0.0.1', 0), _Handler)
+        self.__server.socket = context.wrap_socket(self.__server.socket, server_side=True)
+        self.__server.tenant = self
+
+        self.__thread = threading.Thread(target=self.__server.serve_forever, name='scv2-mock-tenant', daemon=True)
+        self.__thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop the server and remove its certificate.
+        """
+        if self.__server is not None:
+            self.__server.shutdown()
+            self.__server.server_close()
+            self.__server = None
+
+        if self.__directory is not None:
+            shutil.rmtree(self.__directory, ignore_errors=True)
+            self.__directory = None
+
+    def seed(self, service : str, endpoint : str, count : int) -> List[str]:
+        """
+        Fill a collection with generated entities.
+
+        Args:
+            service: Service path, e.g. `account-service`
+            endpoint: Endpoint path, e.g. `accounts`
+            count: Number of entities to create
+
+        Returns:
+            The IDs of the created entities
+        """
+        ids : List[str] = [ ]
+
+        for index in range(count):
+            entity : dict = self.__new_entity({
+                'displayId': str(index + 1),
+                'formattedName': f'Account {index + 1}',
+                'lifeCycleStatus': 'ACTIVE',
+                'countryCode': 'DE'
+            })
+            self.__collections.setdefault((service, endpoint), { })[entity['id']] = entity
+            ids.append(entity['id'])
+
+        return ids
+
+    def __new_entity(self, payload : dict) -> dict:
+        entity : dict = dict(payload)
+        entity['id'] = entity.get('id') or str(uuid.UUID(int=self.__random.getrandbits(128)))
+        entity['adminData'] = { 'createdOn': time.strftime('%Y-%m-%dT%H:%M:%SZ'), 'updatedOn': time.strftime('%Y-%m-%dT%H:%M:%SZ') }
+        self.__versions[entity['id']] = 1
+        return entity
+
+    def __etag(self, resource_id : str) -> Dict[str, str]:
+        return { 'ETag': f'W/"{self.__versions[resource_id]}"' } if self.etags else { }
+
+    def handle(self, method : str, collection : Tuple[str, str], resource_id : Optional[str], params : Dict[str, str], headers, body : Any) -> Tuple[int, Any, Dict[str, str]]:
+        """
+        Answer a request, as `(status, body, headers)`.
+        """
+        with self.__lock:
+            self.__requests += 1
+            throttled : bool = self.throttle_every is not None and self.__requests % self.throttle_every == 0
+            if throttled:
+                self.__throttled += 1
+            delay : float = self.latency + (self.__random.uniform(0, self.jitter) if self.jitter else 0.0)
+
+        if delay:
+            time.sleep(delay)
+
+        if throttled:
+            return 429, { 'error': 'Too many requests' }, { 'Retry-After': str(self.retry_after) }
+
+        with self.__lock:
+            entities : Dict[str, dict] = self.__collections.setdefault(collection, { })
+
+            if resource_id is None:
+                if method == 'GET':
+                    return self.__read_collection(entities, params)
+                if method == 'POST':
+                    entity : dict = self.__new_entity(body or { })
+                    entities[entity['id']] = entity
+                    return 201, { 'value': entity }, self.__etag(entity['id'])
+                return 405, { 'error': 'Method not allowed' }, { }
+
+            entity : Optional[dict] = entities.get(resource_id)
+            if entity is None:
+                return 404, { 'error': 'Not found' }, { }
+
+            if method == 'GET':
+                return 200, { 'value': entity }, self.__etag(resource_id)
+
+            if method in ('PATCH', 'PUT', 'DELETE') and self.etags:
+                if_match : Optional[str] = headers.get('If-Match')
+                if if_match and if_match != self.__etag(resource_id)['ETag']:
+                    return 412, { 'error': 'Precondition failed' }, { }
+
+            if method == 'DELETE':
+                del entities[resource_id]
+                return 204, None, { }
+
+            if method in ('PATCH', 'PUT'):
+                if method == 'PUT':
+                    entity = { 'id': resource_id, 'adminData': entity['adminData'] }
+                entity.update(body or { })
+                entity['adminData'] = dict(entity['adminData'], updatedOn=time.strftime('%Y-%m-%dT%H:%M:%SZ'))
+                entities[resource_id] = entity
+                self.__versions[resource_id] += 1
+                return 200, { 'value': entity }, self.__etag(resource_id)
+
+            return 405, { 'error': 'Method not allowed' }, { }
+
+    def __read_collection(self, entities : Dict[str, dict], params : Dict[str, str]) -> Tuple[int, Any, Dict[str, str]]:
+        items : List[dict] = list(entities.values())
+
+        if '$filter' in params:
+            try:
+                condition = _parse_filter(params['$filter'])
+            except ValueError as e:
+                return 400, { 'error': str(e) }, { }
+            items = [entity for entity in items if condition(entity)]
+
+        if '$orderby' in params:
+            items = _sort(items, params['$orderby'])
+
+        skip : int = int(params.get('$skip', 0))
+        top : int = min(int(params.get('$top', self.max_page_size)), self.max_page_size)
+
+        payload : dict = { 'value': items[skip:skip + top] }
+        if params.get('$count') == 'true':
+            payload['count'] = len(items)
+
+        return 200, payload, { }
@@ -0,0 +1,210 @@
+"""
+Benchmarks of the client against the local mock tenant.
+
+Usage:
+    python -m benchmarks.run                    # run and compare with the baselines
+    python -m benchmarks.run --save-baseline    # run and store the results as baselines
+    python -m benchmarks.run --scenario pagination --latency 0.01
+
+Each scenario reports its throughput (operations per second) and the p50/p99
+latency of the calls sent to the tenant, read from a SCV2Tracer. Results are
+compared with `benchmarks/baselines.json`: a throughput drop or a latency
+increase larger than the tolerances is reported as a regression, and makes the
+command exit with status 1.
+
+The mock tenant runs in the same process as the client, so both share the CPU
+and the GIL: results are meant to compare client versions on the same machine,
+not to predict the performance against a real tenant.
+
+Baselines depend on the machine: store them again when moving to another host.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+from typing import Dict, List, Optional
+
+from scv2py.services import SCV2Service, AccountServiceEndpoint
+from scv2py.core.session import SCV2Session
+from scv2py.core.batch import SCV2ClientBatchRequest
+from scv2py.core.retry import SCV2RetryPolicy
+from scv2py.core.tracing import SCV2Tracer
+
+from benchmarks.mock_tenant import MockTenant
+
+BASELINES_PATH : str = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines.json')
+
+SERVICE : SCV2Service = SCV2Service.ACCOUNT_SERVICE
+ENDPOINT : AccountServiceEndpoint = AccountServiceEndpoint.ACCOUNT
+
+def _percentile(samples : List[float], percentile : float) -> float:
+    # Nearest-rank percentile
+    if not samples:
+        return 0.0
+    ordered : List[float] = sorted(samples)
+    return ordered[max(0, min(len(ordered) - 1, int(round(percentile / 100 * len(ordered) + 0.5)) - 1))]
+
+def _call_durations(tracer : SCV2Tracer) -> List[float]:
+    # Attempt spans carry an `attempt` argument, their ttfb/download parts do not
+    return [
+        event['dur'] / 1000
+        for event in tracer.to_chrome_trace()['traceEvents']
+        if event['ph'] == 'X' and event['cat'] == 'http' and 'attempt' in event['args']
+    ]
+
+def _single_get(session : SCV2Session, ids : List[str], size : int) -> int:
+    for index in range(size):
+        session.get(service=SERVICE, endpoint=ENDPOINT, resource_id=ids[index % len(ids)], use_cache=False).raise_for_status()
+    return size
+
+def _pagination(session : SCV2Session, ids : List[str], size : int) -> int:
+    return sum(1 for _ in session.iter_collection(service=SERVICE, endpoint=ENDPOINT, orderby='id', page_size=size))
+
+def _batch(session : SCV2Session, ids : List[str], size : int) -> int:
+    batch = SCV2ClientBatchRequest()
+    for index in range(size):
+        batch.add_get_request(str(index), SERVICE, ENDPOINT, resource_id=ids[index % len(ids)])
+
+    results : Dict[str, dict] = session.execute_batch(batch, max_workers=8)
+    return sum(1 for result in results.values() if result['success'])
+
+def _bulk_write(session : SCV2Session, ids : List[str], size : int) -> int:
+    items = ({ 'formattedName': f'Benchmark {index}', 'countryCode': 'DE' } for index in range(size))
+    results : List[dict] = session.bulk_write(SERVICE, ENDPOINT, items, max_workers=8)
+    return sum(1 for result in results if result['success'])
+
+# Scenario name: (function, size argument, unit of the operations)
+SCENARIOS : Dict[str, tuple] = {
+    'single_get': (_single_get, 200, 'calls'),
+    'pagination': (_pagination, 500, 'entities'),
+    'batch': (_batch, 500, 'requests'),
+    'bulk_write': (_bulk_write, 500, 'writes')
+}
+
+def run_scenario(name : str, latency : float, throttle_every : Optional[int], entities : int, repeat : int) -> dict:
+    """
+    Run a scenario `repeat` times against a fresh mock tenant.
+
+    Returns:
+        Dictionary with the median `throughput`, the `p50_ms` and `p99_ms`
+        latency of all the calls, and the number of `calls` and `throttled` calls
+    """
+    function, size, unit = SCENARIOS[name]
+
+    throughputs : List[float] = [ ]
+    durations : List[float] = [ ]
+
+    with MockTenant(latency=latency, throttle_every=throttle_every) as tenant:
+        ids : List[str] = tenant.seed(SERVICE.value, ENDPOINT.value, entities)
+
+        for _ in range(repeat):
+            tracer = SCV2Tracer()
+
+            with SCV2Session(sc_host=tenant.host,
+                             sc_user='benchmark',
+                             sc_password='benchmark',
+                             sc_verify_ssl=tenant.certificate,
+                             sc_retry_policy=SCV2RetryPolicy(max_retries=5, backoff_factor=0.001, jitter=False),
+                             sc_tracer=tracer) as session:
+                started : float = time.perf_counter()
+                operations : int = function(session, ids, size)
+                elapsed : float = time.perf_counter() - started
+
+            throughputs.append(operations / elapsed)
+            durations.extend(_call_durations(tracer))
+
+        stats : Dict[str, int] = tenant.stats
+
+    return {
+        'unit': unit,
+        'throughput': round(statistics.median(throughputs), 1),
+        'p50_ms': round(_percentile(durations, 50), 3),
+        'p99_ms': round(_percentile(durations, 99), 3),
+        'calls': stats['requests'],
+        'throttled': stats['throttled']
+    }
+
+def compare(results : Dict[str, dict], baselines : Dict[str, dict], tolerance : float, latency_tolerance : float) -> List[str]:
+    """
+    Get the regressions of the results against the baselines.
+
+    Tail latencies vary more from run to run than throughput, hence their own tolerance.
+    """
+    regressions : List[str] = [ ]
+
+    for name, result in results.items():
+        baseline : Optional[dict] = baselines.get(name)
+        if baseline is None:
+            continue
+
+        if result['throughput'] < baseline['throughput'] * (1 - tolerance):
+            regressions.append(f"{name}: throughput {result['throughput']} {result['unit']}/s, baseline {baseline['throughput']}")
+
+        for key in ('p50_ms', 'p99_ms'):
+            if result[key] > baseline[key] * (1 + latency_tolerance):
+                regressions.append(f"{name}: {key[:3]} {result[key]} ms, baseline {baseline[key]} ms")
+
+    return regressions
+
+def main(argv : Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.run', description='Benchmarks of scv2py against a local mock tenant')
+    parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS), help='Scenario to run (default: all); may be repeated')
+    parser.add_argument('--latency', type=float, default=0.002, help='Server latency of each call, in seconds (default: 0.002)')
+    parser.add_argument('--throttle-every', type=int, default=100, help='Answer every N-th call with a 429 (default: 100, 0 disables)')
+    parser.add_argument('--entities', type=int, default=5000, help='Entities in the mock collection (default: 5000)')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs of each scenario (default: 3)')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed relative throughput drop (default: 0.25)')
+    parser.add_argument('--latency-tolerance', type=float, default=1.0, help='Allowed relative p50/p99 increase (default: 1.0)')
+    parser.add_argument('--baselines', default=BASELINES_PATH, help='Path of the baselines file')
+    parser.add_argument('--save-baseline', action='store_true', help='Store the results as the new baselines')
+    args = parser.parse_args(argv)
+
+    # requests prefers these variables over the `verify` of the session,
+    # which would reject the self-signed certificate of the mock tenant
+    for variable in ('REQUESTS_CA_BUNDLE', 'CURL_CA_BUNDLE'):
+        os.environ.pop(variable, None)
+
+    results : Dict[str, dict] = { }
+
+    for name in args.scenario or SCENARIOS:
+        results[name] = run_scenario(name, args.latency, args.throttle_every or None, args.entities, args.repeat)
+        result = results[name]
+        print(f"{name:<12} {result['throughput']:>10.1f} {result['unit']}/s   "
+              f"p50 {result['p50_ms']:>8.3f} ms   p99 {result['p99_ms']:>8.3f} ms   "
+              f"calls {result['calls']} ({result['throttled']} throttled)")
+
+    config : dict = { 'latency': args.latency, 'throttle_every': args.throttle_every, 'entities': args.entities, 'repeat': args.repeat }
+
+    stored : dict = { }
+    if os.path.exists(args.baselines):
+        with open(args.baselines, 'r', encoding='utf-8') as baselines_file:
+            stored = json.load(baselines_file)
+
+    if args.save_baseline:
+        scenarios : dict = dict(stored.get('scenarios', { }))
+        scenarios.update(results)
+        with open(args.baselines, 'w', encoding='utf-8') as baselines_file:
+            json.dump({ 'config': config, 'scenarios': scenarios }, baselines_file, indent=2, sort_keys=True)
+            baselines_file.write('\n')
+        print(f'Baselines stored in {args.baselines}')
+        return 0
+
+    if not stored:
+        print('No baselines to compare with; run with --save-baseline to store them.')
+        return 0
+
+    if stored.get('config') != config:
+        print(f"Warning: baselines were recorded with {stored.get('config')}, not {config}")
+
+    regressions : List[str] = compare(results, stored.get('scenarios', { }), args.tolerance, args.latency_tolerance)
+    for regression in regressions:
+        print(f'REGRESSION {regression}')
+
+    return 1 if regressions else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -4,45 +4,145 @@ SAP Sales/Service Cloud V2 API Wrapper
 A Python library for interacting with the SAP Sales/Service Cloud V2 API.
 """
 
+import importlib
+
+from typing import TYPE_CHECKING, Dict, List
+
 __version__ = '0.1.0'
 
-# Import public API classes
-from scv2py.core.session import SCV2Session
-from scv2py.core.request import SCV2Request, SCV2RequestBuilder, SCV2RequestType
-from scv2py.core.batch import SCV2ClientBatchRequest
-
-# Import service definitions
-from scv2py.services import (
-    SCV2Service,
-    SalesTerritoryServiceEndpoint,
-    CollectionsIntegrationServiceEndpoint,
-    ContactPersonServiceEndpoint,
-    OrganizationalUnitServiceEndpoint
-)
-
-# Import exceptions
-from scv2py.exceptions import (
-    SCV2InvalidEndpointException,
-    SCV2ConnectionError,
-    SCV2RequestError,
-    SCV2TimeoutError
-)
+# Public API, with the module defining each name.
+# Modules are imported on first access (see `__getattr__`), so that `import scv2py`
+# does not load `requests`, the sessions or the service definitions up front.
+_LAZY_ATTRIBUTES : Dict[str, str] = {
+    'SCV2Session': 'scv2py.core.session',
+    'SCV2AsyncSession': 'scv2py.core.async_session',
+    'SCV2Request': 'scv2py.core.request',
+    'SCV2RequestBuilder': 'scv2py.core.request',
+    'SCV2RequestType': 'scv2py.core.request',
+    'SCV2ClientBatchRequest': 'scv2py.core.batch',
+    'SCV2BatchPlan': 'scv2py.core.plan',
+    'SCV2RetryPolicy': 'scv2py.core.retry',
+    'SCV2RateLimiter': 'scv2py.core.rate_limit',
+    'SCV2FileRateLimiter': 'scv2py.core.rate_limit',
+    'SCV2ResponseCache': 'scv2py.core.cache',
+    'SCV2ETagStore': 'scv2py.core.etag',
+    'SCV2Metrics': 'scv2py.core.metrics',
+    'SCV2Tracer': 'scv2py.core.tracing',
+    'SCV2CodeListStore': 'scv2py.core.code_list',
+    'SCV2Record': 'scv2py.core.records',
+    'record_type': 'scv2py.core.records',
+    'to_records': 'scv2py.core.records',
+    'export_collection': 'scv2py.core.export',
+    'SCV2DeltaSync': 'scv2py.core.sync',
+    'SCV2BulkWriter': 'scv2py.core.bulk',
+    'SCV2CancellationToken': 'scv2py.core.cancellation',
+    'SCV2DecodePool': 'scv2py.core.decode_pool',
+
+    # Service definitions
+    'SCV2Service': 'scv2py.services',
+    'SalesTerritoryServiceEndpoint': 'scv2py.services',
+    'CollectionsIntegrationServiceEndpoint': 'scv2py.services',
+    'ContactPersonServiceEndpoint': 'scv2py.services',
+    'OrganizationalUnitServiceEndpoint': 'scv2py.services',
+    'AccountHierarchyServiceEndpoint': 'scv2py.services',
+    'AccountServiceEndpoint': 'scv2py.services',
+    'ActivityAssignmentServiceEndpoint': 'scv2py.services',
+    'ActivityPlanServiceEndpoint': 'scv2py.services',
+    'AppointmentServiceEndpoint': 'scv2py.services',
+    'CaseServiceEndpoint': 'scv2py.services',
+    'CompetitorProductServiceEndpoint': 'scv2py.services',
+    'DocumentServiceServiceEndpoint': 'scv2py.services',
+    'EmployeeServiceEndpoint': 'scv2py.services',
+    'FunctionalLocationServiceEndpoint': 'scv2py.services',
+    'IndividualCustomerServiceEndpoint': 'scv2py.services',
+    'InstalledBaseServiceEndpoint': 'scv2py.services',
+    'ChatServiceEndpoint': 'scv2py.services',
+    'InteractionEmailServiceEndpoint': 'scv2py.services',
+    'InteractionPhoneServiceEndpoint': 'scv2py.services',
+    'LeadServiceEndpoint': 'scv2py.services',
+    'OpportunityServiceEndpoint': 'scv2py.services',
+    'ProductGroupServiceEndpoint': 'scv2py.services',
+    'ProductServiceEndpoint': 'scv2py.services',
+
+    # Exceptions
+    'SCV2InvalidEndpointException': 'scv2py.exceptions',
+    'SCV2ConnectionError': 'scv2py.exceptions',
+    'SCV2RequestError': 'scv2py.exceptions',
+    'SCV2TimeoutError': 'scv2py.exceptions',
+    'SCV2CancelledError': 'scv2py.exceptions'
+}
 
 # Define what's available with wildcard imports
-__all__ = [
-    'SCV2Session',
-    'SCV2Request',
-    'SCV2RequestBuilder',
-    'SCV2RequestType',
-    'SCV2ClientBatchRequest',
-    'ODataQueryParameter',
-    'SCV2Service',
-    'SalesTerritoryServiceEndpoint',
-    'CollectionsIntegrationServiceEndpoint',
-    'ContactPersonServiceEndpoint',
-    'OrganizationalUnitServiceEndpoint',
-    'SCV2InvalidEndpointException',
-    'SCV2ConnectionError',
-    'SCV2RequestError',
-    'SCV2TimeoutError'
-]
\ No newline at end of file
+__all__ : List[str] = list(_LAZY_ATTRIBUTES)
+
+def __getattr__(name : str):
+    module : str = _LAZY_ATTRIBUTES.get(name)
+
+    if module is None:
+        raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+
+    value = getattr(importlib.import_module(module), name)
+
+    # Later accesses do not go through `__getattr__` anymore
+    globals()[name] = value
+
+    return value
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
+
+# Static analyzers and IDEs do not run `__getattr__`
+if TYPE_CHECKING:
+    from scv2py.core.session import SCV2Session
+    from scv2py.core.async_session import SCV2AsyncSession
+    from scv2py.core.request import SCV2Request, SCV2RequestBuilder, SCV2RequestType
+    from scv2py.core.batch import SCV2ClientBatchRequest
+    from scv2py.core.plan import SCV2BatchPlan
+    from scv2py.core.retry import SCV2RetryPolicy
+    from scv2py.core.rate_limit import SCV2RateLimiter, SCV2FileRateLimiter
+    from scv2py.core.cache import SCV2ResponseCache
+    from scv2py.core.etag import SCV2ETagStore
+    from scv2py.core.metrics import SCV2Metrics
+    from scv2py.core.tracing import SCV2Tracer
+    from scv2py.core.code_list import SCV2CodeListStore
+    from scv2py.core.records import SCV2Record, record_type, to_records
+    from scv2py.core.export import export_collection
+    from scv2py.core.sync import SCV2DeltaSync
+    from scv2py.core.bulk import SCV2BulkWriter
+    from scv2py.core.cancellation import SCV2CancellationToken
+    from scv2py.core.decode_pool import SCV2DecodePool
+
+    from scv2py.services import (
+        SCV2Service,
+        SalesTerritoryServiceEndpoint,
+        CollectionsIntegrationServiceEndpoint,
+        ContactPersonServiceEndpoint,
+        OrganizationalUnitServiceEndpoint,
+        AccountHierarchyServiceEndpoint,
+        AccountServiceEndpoint,
+        ActivityAssignmentServiceEndpoint,
+        ActivityPlanServiceEndpoint,
+        AppointmentServiceEndpoint,
+        CaseServiceEndpoint,
+        CompetitorProductServiceEndpoint,
+        DocumentServiceServiceEndpoint,
+        EmployeeServiceEndpoint,
+        FunctionalLocationServiceEndpoint,
+        IndividualCustomerServiceEndpoint,
+        InstalledBaseServiceEndpoint,
+        ChatServiceEndpoint,
+        InteractionEmailServiceEndpoint,
+        InteractionPhoneServiceEndpoint,
+        LeadServiceEndpoint,
+        OpportunityServiceEndpoint,
+        ProductGroupServiceEndpoint,
+        ProductServiceEndpoint
+    )
+
+    from scv2py.exceptions import (
+        SCV2InvalidEndpointException,
+        SCV2ConnectionError,
+        SCV2RequestError,
+        SCV2TimeoutError,
+        SCV2CancelledError
+    )
@@ -0,0 +1,104 @@
+"""
+Command-line interface of the scv2py package.
+
+Usage:
+    python -m scv2py export --service opportunity-service --endpoint opportunities --output opportunities.ndjson
+
+Credentials are read from the SCV2_HOST, SCV2_USER and SCV2_PASSWORD
+environment variables unless given as options.
+"""
+
+import argparse
+import os
+import sys
+
+from contextlib import nullcontext
+from typing import List, Optional
+
+from scv2py.services import SCV2Service, SCV2BaseEndpoint
+from scv2py.services._internal.validators import InternalAPIEndpointSanitizer
+
+from scv2py.core.session import SCV2Session
+from scv2py.core.export import export_collection, EXPORT_FORMATS
+from scv2py.core.decode_pool import SCV2DecodePool
+
+def _parse_service(value : str) -> SCV2Service:
+    # Services can be given by name (OPPORTUNITY_SERVICE) or by value (opportunity-service)
+    for service in SCV2Service:
+        if value in (service.name, service.value) or value.upper() == service.name:
+            return service
+
+    raise argparse.ArgumentTypeError(f"Unknown service '{value}'")
+
+def _parse_endpoint(service : SCV2Service, value : str) -> SCV2BaseEndpoint:
+    for endpoint in InternalAPIEndpointSanitizer.get_endpoint_type(service):
+        if value in (endpoint.name, endpoint.value) or value.upper() == endpoint.name:
+            return endpoint
+
+    raise ValueError(f"Unknown endpoint '{value}' for service {service.name}")
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='python -m scv2py', description='SAP Sales/Service Cloud V2 API tools')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    export = commands.add_parser('export', help='Export a collection to NDJSON or CSV files')
+    export.add_argument('--host', default=os.environ.get('SCV2_HOST'), help='Tenant host name (default: $SCV2_HOST)')
+    export.add_argument('--user', default=os.environ.get('SCV2_USER'), help='User name (default: $SCV2_USER)')
+    export.add_argument('--password', default=os.environ.get('SCV2_PASSWORD'), help='Password (default: $SCV2_PASSWORD)')
+    export.add_argument('--service', required=True, type=_parse_service, help='Service name or path, e.g. opportunity-service')
+    export.add_argument('--endpoint', required=True, help='Endpoint name or path, e.g. opportunities')
+    export.add_argument('--output', required=True, help='Output file path; may contain an {index} placeholder when rotating')
+    export.add_argument('--format', default='ndjson', choices=EXPORT_FORMATS, help='Output format (default: ndjson)')
+    export.add_argument('--filter', help='OData $filter expression')
+    export.add_argument('--select', help='Comma separated list of fields; defines the CSV columns')
+    export.add_argument('--orderby', default='id', help='OData $orderby expression (default: id)')
+    export.add_argument('--page-size', type=int, default=1000, help='Entities per page (default: 1000)')
+    export.add_argument('--rows-per-file', type=int, help='Start a new output file every N rows')
+    export.add_argument('--stream', action='store_true', help='Decode pages incrementally while they are received')
+    export.add_argument('--timeout', type=int, default=60, help='Timeout of each call, in seconds (default: 60)')
+    export.add_argument('--decode-workers', type=int, help='Decode the pages in N worker processes')
+
+    return parser
+
+def main(argv : Optional[List[str]] = None) -> int:
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+
+    if not args.host or not args.user or not args.password:
+        parser.error('host, user and password are required (options or SCV2_HOST/SCV2_USER/SCV2_PASSWORD)')
+
+    try:
+        endpoint = _parse_endpoint(args.service, args.endpoint)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.decode_workers is not None and args.stream:
+        parser.error('--decode-workers cannot be combined with --stream')
+
+    if args.decode_workers is not None and args.decode_workers <= 0:
+        parser.error('--decode-workers must be a positive integer')
+
+    decode_pool = SCV2DecodePool(max_workers=args.decode_workers) if args.decode_workers is not None else None
+
+    with SCV2Session(sc_host=args.host, sc_user=args.user, sc_password=args.password, sc_timeout=args.timeout) as session, decode_pool or nullcontext():
+        result = export_collection(
+            session=session,
+            service=args.service,
+            endpoint=endpoint,
+            path=args.output,
+            file_format=args.format,
+            filter=args.filter,
+            select=args.select,
+            orderby=args.orderby,
+            page_size=args.page_size,
+            rows_per_file=args.rows_per_file,
+            stream=args.stream,
+            decode_pool=decode_pool
+        )
+
+    print(f"Exported {result['rows']} rows to {len(result['files'])} file(s)", file=sys.stderr)
+
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,514 @@
+import asyncio
+import itertools
+import time
+
+from typing import Mapping, Tuple
+
+try:
+    import httpx
+except ImportError: # pragma: no cover - optional dependency
+    httpx = None
+
+from scv2py.services import SCV2BaseEndpoint, SCV2Service
+from scv2py.services._internal.validators import InternalAPIEndpointSanitizer
+
+from scv2py.exceptions import SCV2InvalidEndpointException, SCV2ConnectionError, SCV2RequestError, SCV2TimeoutError
+
+from scv2py.core.request import SCV2Request, SCV2QueryParameterType, SCV2RequestType
+
+from scv2py.core.retry import SCV2RetryPolicy
+
+from scv2py.core.rate_limit import SCV2RateLimiter
+
+from scv2py.core.etag import SCV2ETagStore
+
+from scv2py.core.cache import SCV2ResponseCache
+
+from scv2py.core.single_flight import _AsyncSingleFlight
+
+from scv2py.core.metrics import SCV2Metrics
+
+from scv2py.core.tracing import SCV2Tracer
+
+class SCV2AsyncSession:
+    """
+    asyncio counterpart of SCV2Session.
+
+    Exposes the same methods as SCV2Session as coroutines, running on a pooled
+    `httpx.AsyncClient`. Requires the optional `httpx` dependency:
+
+        pip install scv2py[async]
+    """
+
+    # This must be set to the full domain name of the tenant.
+    # Example: my1122334.de1.test.crm.cloud.sap
+    __sc_host : str
+
+    # Protocol to be used to call the SAP Sales/Service Cloud V2 API
+    # Hardcoded to HTTPS, as HTTP is not supported nor secure.
+    __sc_prot : str = 'https'
+
+    # Whether or not to use SSL Verification.
+    # Default: `True`
+    __sc_vssl : bool = True
+
+    # The time in seconds after a hanging call can timeout.
+    __sc_timeout : int = 60
+
+    # The API base endpoint path
+    __sc_api_base_path : str = '/sap/c4c/api/v1/'
+
+    # Call URLs of all the endpoints, by service and endpoint. Built once per session.
+    __sc_routes : Mapping[Tuple[SCV2Service, SCV2BaseEndpoint], str]
+
+    # This is the User that will perform the calls
+    __sc_user : str
+    # Password of the user.
+    __sc_pass : str
+
+    # Static request headers
+    __sc_request_headers : dict
+
+    # Maximum number of connections kept open towards the tenant.
+    __sc_pool_maxsize : int = 10
+
+    # Retry policy applied to every call. `None` disables retries.
+    __sc_retry_policy : SCV2RetryPolicy = None
+
+    # Client-side rate limiter applied to every call. `None` disables rate limiting.
+    __sc_rate_limiter : SCV2RateLimiter = None
+
+    # Last known ETags of the entities, used to fill `If-Match` on PATCH. `None` disables tracking.
+    __sc_etag_store : SCV2ETagStore = None
+
+    # Coalesces identical concurrent GET requests into one call. `None` when disabled.
+    __sc_single_flight : _AsyncSingleFlight = None
+
+    # Registry recording the metrics of every call. `None` disables instrumentation.
+    __sc_metrics : SCV2Metrics = None
+
+    # Timeline of the calls, exportable as Chrome trace JSON. `None` disables tracing.
+    __sc_tracer : SCV2Tracer = None
+
+    # Persistent, pooled client
+    __sc_client : "httpx.AsyncClient"
+
+    def __init__(self,
+                 sc_host : str,
+                 sc_user : str,
+                 sc_password : str,
+                 sc_verify_ssl : bool = True,
+                 sc_timeout : int = 60,
+                 sc_pool_maxsize : int = 10,
+                 sc_retry_policy : SCV2RetryPolicy = None,
+                 sc_rate_limiter : SCV2RateLimiter = None,
+                 sc_etag_store : SCV2ETagStore = None,
+                 sc_coalesce_gets : bool = False,
+                 sc_metrics : SCV2Metrics = None,
+                 sc_tracer : SCV2Tracer = None) -> None:
+
+        if httpx is None:
+            raise ImportError("SCV2AsyncSession requires the 'httpx' package. Install it with: pip install scv2py[async]")
+
+        if not sc_host:
+            raise ValueError("Host cannot be empty")
+
+        if not sc_user or not sc_password:
+            raise ValueError("User credentials cannot be empty")
+
+        if sc_timeout <= 0:
+            raise ValueError("Timeout must be a positive integer")
+
+        if sc_pool_maxsize <= 0:
+            raise ValueError("Pool size must be a positive integer")
+
+        self.__sc_host = sc_host
+        self.__sc_routes = InternalAPIEndpointSanitizer.build_routing_table(f'{self.__sc_prot}://{sc_host}{self.__sc_api_base_path}')
+        self.__sc_vssl = sc_verify_ssl
+        self.__sc_timeout = sc_timeout
+        self.__sc_user = sc_user
+        self.__sc_pass = sc_password
+        self.__sc_pool_maxsize = sc_pool_maxsize
+        self.__sc_retry_policy = sc_retry_policy
+        self.__sc_rate_limiter = sc_rate_limiter
+        self.__sc_etag_store = sc_etag_store
+        self.__sc_single_flight = _AsyncSingleFlight() if sc_coalesce_gets else None
+        self.__sc_metrics = sc_metrics
+        self.__sc_tracer = sc_tracer
+        self.__sc_trace_ids = itertools.count()
+
+        self.__sc_client = httpx.AsyncClient(
+            auth=(self.__sc_user, self.__sc_pass),
+            verify=self.__sc_vssl,
+            timeout=self.__sc_timeout,
+            limits=httpx.Limits(
+                max_connections=self.__sc_pool_maxsize,
+                max_keepalive_connections=self.__sc_pool_maxsize
+            )
+        )
+
+        self.__sc_request_headers = { }
+
+    async def __aenter__(self):
+        return self
+
+    @property
+    def metrics(self) -> SCV2Metrics:
+        """
+        The metrics registry of the session, or `None` if instrumentation is disabled.
+        """
+        return self.__sc_metrics
+
+    @property
+    def tracer(self) -> SCV2Tracer:
+        """
+        The tracer of the session, or `None` if tracing is disabled.
+        """
+        return self.__sc_tracer
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    def __get_call_url(self, service : SCV2Service, endpoint : SCV2BaseEndpoint) -> str:
+        # Validating the service and endpoint and building the URL is a single lookup.
+        # Endpoints not defined on the passed service are not part of the table.
+        req_url : str = self.__sc_routes.get((service, endpoint))
+
+        if req_url is None:
+            raise SCV2InvalidEndpointException(f'Endpoint {getattr(endpoint, "name", endpoint)} is not defined on service {getattr(service, "name", service)}.')
+
+        return req_url
+
+    async def __make_request(self, service : SCV2Service, endpoint : SCV2BaseEndpoint, http_method : str, req_url : str, req_params : dict, req_payload : dict, req_headers : dict) -> "httpx.Response":
+
+        attempt : int = 0
+
+        # Coroutines share the thread of the event loop: their spans are recorded
+        # as async spans, each call on its own track.
+        trace_id : int = None if self.__sc_tracer is None else next(self.__sc_trace_ids)
+
+        while True:
+            # Every attempt, retries included, counts towards the rate limit
+            if self.__sc_rate_limiter is not None:
+                # Blocking limiters (e.g. file locks) would stall every task of the event loop
+                if self.__sc_rate_limiter.blocking:
+                    delay = await asyncio.to_thread(self.__sc_rate_limiter.reserve, service)
+                else:
+                    delay = self.__sc_rate_limiter.reserve(service)
+                if delay > 0:
+                    waited : float = time.perf_counter()
+                    await asyncio.sleep(delay)
+                    if self.__sc_tracer is not None:
+                        self.__sc_tracer.async_span('rate limit', 'wait', trace_id, waited, time.perf_counter(), service=service.value)
+
+            started : float = time.perf_counter()
+
+            try:
+                response = await self.__sc_client.request(
+                    method=http_method.upper(),
+                    url=req_url,
+                    json=req_payload if req_payload else None,
+                    params=req_params,
+                    headers=req_headers
+                    )
+            except httpx.HTTPError as e:
+                if self.__sc_metrics is not None:
+                    self.__sc_metrics.observe_error(service, endpoint, http_method, e, time.perf_counter() - started)
+
+                if self.__sc_tracer is not None:
+                    self.__sc_tracer.async_span(f'{http_method} {service.value}/{endpoint.value}', 'http', trace_id, started, time.perf_counter(),
+                                                url=req_url, attempt=attempt, error=type(e).__name__)
+
+                delay = None if self.__sc_retry_policy is None else self.__sc_retry_policy.get_error_delay(
+                    attempt=attempt,
+                    http_method=http_method,
+                    req_headers=req_headers,
+                    request_sent=not isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout))
+                )
+
+                if delay is None:
+                    # Connection timeouts are reported as connection errors, as `requests` does.
+                    if isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout, httpx.NetworkError)):
+                        raise SCV2ConnectionError(f"Connection error: {str(e)}") from e
+                    if isinstance(e, httpx.TimeoutException):
+                        raise SCV2TimeoutError(f"Request timed out: {str(e)}") from e
+                    raise SCV2RequestError(f"Request error: {str(e)}") from e
+
+                if self.__sc_metrics is not None:
+                    self.__sc_metrics.observe_retry(service, endpoint, http_method)
+
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+
+            if self.__sc_metrics is not None:
+                self.__sc_metrics.observe_response(
+                    service, endpoint, http_method,
+                    status_code=response.status_code,
+                    duration=time.perf_counter() - started,
+                    request_bytes=len(response.request.content or b''),
+                    response_bytes=len(response.content or b'')
+                )
+
+            # httpx reads the body before returning: the span covers the whole exchange
+            if self.__sc_tracer is not None:
+                self.__sc_tracer.async_span(f'{http_method} {service.value}/{endpoint.value}', 'http', trace_id, started, time.perf_counter(),
+                                            url=req_url, attempt=attempt, status=response.status_code)
+
+            delay = None if self.__sc_retry_policy is None else self.__sc_retry_policy.get_response_delay(
+                attempt=attempt,
+                http_method=http_method,
+                req_headers=req_headers,
+                status_code=response.status_code,
+                response_headers=response.headers
+            )
+
+            if delay is None:
+                return response
+
+            if self.__sc_metrics is not None:
+                self.__sc_metrics.observe_retry(service, endpoint, http_method)
+
+            await response.aclose()
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def __track_etag(self, service : SCV2Service, endpoint : SCV2BaseEndpoint, resource_id : str, response : "httpx.Response") -> "httpx.Response":
+        if self.__sc_etag_store is not None:
+            self.__sc_etag_store.record(service, endpoint, resource_id, response)
+        return response
+
+    async def __read_etag(self, service : SCV2Service, endpoint : SCV2BaseEndpoint, resource_id : str) -> str:
+        # Reads the entity again to get its current ETag (and store it)
+        response : "httpx.Response" = await self.get(service=service, endpoint=endpoint, resource_id=resource_id)
+
+        return response.headers.get('ETag') if response.is_success else None
+
+    async def __send_get(self, service : SCV2Service, endpoint : SCV2BaseEndpoint, resource_id : str, req_url : str, req_params : dict) -> "httpx.Response":
+        response : "httpx.Response" = await self.__make_request(
+            service=service,
+            endpoint=endpoint,
+            http_method='GET',
+            req_url=req_url,
+            req_params=req_params,
+            req_payload={ },
+            req_headers=self.__sc_request_headers
+        )
+
+        if resource_id is None:
+            return response
+
+        return self.__track_etag(service, endpoint, resource_id, response)
+
+    def set_default_headers(self, headers : dict) -> None:
+        self.__sc_request_headers = headers
+
+    async def get(self,
+            service : SCV2Service,
+            endpoint : SCV2BaseEndpoint,
+            resource_id : str = None,
+            filter : str = None,
+            select : str = None,
+            orderby : str = None,
+            search : str = None,
+            top : int = None,
+            skip : int = None,
+            exclude : str = None,
+            count : bool = None) -> "httpx.Response":
+
+        # Generating the request URL
+        req_url : str = self.__get_call_url(service=service, endpoint=endpoint)
+
+        # Initializing the parameter variable
+        # Will stay empty if the UUID is provided.
+        req_params : dict = { }
+
+        # If the resource id is provided, it should be appended at the end of the URL
+        if(not resource_id is None):
+            req_url = f'{req_url}/{resource_id}'
+        else:
+            # Excluding all None parameters
+            req_params = {k: v for k, v in {
+                SCV2QueryParameterType.FILTER.value: filter,
+                SCV2QueryParameterType.SELECT.value: select,
+                SCV2QueryParameterType.ORDERBY.value: orderby,
+                SCV2QueryParameterType.SEARCH.value: search,
+                SCV2QueryParameterType.TOP.value: top,
+                SCV2QueryParameterType.SKIP.value: skip,
+                SCV2QueryParameterType.EXCLUDE.value: exclude,
+                SCV2QueryParameterType.COUNT.value: None if count is None else ('true' if count else 'false')
+            }.items() if v is not None}
+
+        if self.__sc_single_flight is not None:
+            return await self.__sc_single_flight.do(
+                SCV2ResponseCache.make_key(service, endpoint, resource_id, req_params),
+                self.__send_get, service, endpoint, resource_id, req_url, req_params
+            )
+
+        return await self.__send_get(service, endpoint, resource_id, req_url, req_params)
+
+    async def post(self, service : SCV2Service, endpoint : SCV2BaseEndpoint, payload : dict) -> "httpx.Response":
+
+        # Generating the request URL
+        req_url : str = self.__get_call_url(service=service, endpoint=endpoint)
+
+        response : "httpx.Response" = await self.__make_request(
+            service=service,
+            endpoint=endpoint,
+            http_method='POST',
+            req_url=req_url,
+            req_params={ },
+            req_payload=payload,
+            req_headers=self.__sc_request_headers
+        )
+
+        # The ID of the created entity is read from the response
+        return self.__track_etag(service, endpoint, None, response)
+
+    async def patch(self, service : SCV2Service, endpoint : SCV2BaseEndpoint, resource_id : str, payload : dict, etag : str = None) -> "httpx.Response":
+        """
+        Update an entity. Without an explicit `etag`, `If-Match` is filled from the
+        ETag store of the session, as in SCV2Session.patch.
+
+        Raises:
+            ValueError: If no `etag` is given and the session has no ETag store
+        """
+
+        # Without a store to fill it in, the If-Match of the optimistic concurrency check is mandatory
+        if not etag and self.__sc_etag_store is None:
+            raise ValueError("ETag (If-Match header) is required for PATCH requests when the session has no ETag store")
+
+        # For updates, the id  of the resource is appended at the end of the URL
+        req_url : str = f'{self.__get_call_url(service=service, endpoint=endpoint)}/{resource_id}'
+
+        etag_store : SCV2ETagStore = self.__sc_etag_store
+        stored_etag : bool = etag is None and etag_store is not None
+
+        if stored_etag:
+            etag = etag_store.get(service, endpoint, resource_id) or await self.__read_etag(service, endpoint, resource_id)
+
+        while True:
+            req_headers : dict = dict(self.__sc_request_headers)
+            if etag:
+                req_headers['If-Match'] = etag
+
+            response : "httpx.Response" = await self.__make_request(
+                service=service,
+                endpoint=endpoint,
+                http_method='PATCH',
+                req_url=req_url,
+                req_params={ },
+                req_payload=payload,
+                req_headers=req_headers
+            )
+
+            # The stored ETag is outdated: refreshing it and retrying once
+            if response.status_code == 412 and stored_etag and etag_store.retry_on_conflict:
+                stored_etag = False
+                etag = await self.__read_etag(service, endpoint, resource_id)
+                continue
+
+            return self.__track_etag(service, endpoint, resource_id, response)
+
+    async def put(self, service : SCV2Service, endpoint : SCV2BaseEndpoint, resource_id : str, payload : dict) -> "httpx.Response":
+
+        # Generating the request URL
+        req_url : str = self.__get_call_url(service=service, endpoint=endpoint)
+
+        # For updates, the id of the resource is appended at the end of the URL
+        if(not resource_id is None and resource_id != ''):
+            req_url = f'{req_url}/{resource_id}'
+
+        response : "httpx.Response" = await self.__make_request(
+            service=service,
+            endpoint=endpoint,
+            http_method='PUT',
+            req_url=req_url,
+            req_params={ },
+            req_payload=payload,
+            req_headers=self.__sc_request_headers
+        )
+
+        return self.__track_etag(service, endpoint, resource_id or None, response)
+
+    async def delete(self, service : SCV2Service, endpoint : SCV2BaseEndpoint, resource_id : str) -> "httpx.Response":
+
+        # For delete requests, the resource id should be appended at the end of the request URL
+        req_url : str = f'{self.__get_call_url(service=service, endpoint=endpoint)}/{resource_id}'
+
+        response : "httpx.Response" = await self.__make_request(
+            service=service,
+            endpoint=endpoint,
+            http_method='DELETE',
+            req_url=req_url,
+            req_params={ },
+            req_payload={ },
+            req_headers=self.__sc_request_headers
+        )
+
+        if self.__sc_etag_store is not None and response.is_success:
+            self.__sc_etag_store.discard(service, endpoint, resource_id)
+
+        return response
+
+    async def close(self):
+        await self.__sc_client.aclose()
+
+    async def from_request(self, request: SCV2Request) -> "httpx.Response":
+        """
+        Execute a request created with SCV2RequestBuilder.
+
+        Args:
+            request: The SCV2Request object to execute
+
+        Returns:
+            Response from the API
+        """
+        # Validate the request
+        if not isinstance(request, SCV2Request):
+            raise ValueError("Expected an SCV2Request object")
+
+        # Call the appropriate method based on the request type
+        if request.request_type == SCV2RequestType.GET:
+            return await self.get(
+                service=request.service,
+                endpoint=request.endpoint,
+                resource_id=request.resource_id,
+                filter=request.params.get(SCV2QueryParameterType.FILTER.value),
+                select=request.params.get(SCV2QueryParameterType.SELECT.value),
+                orderby=request.params.get(SCV2QueryParameterType.ORDERBY.value),
+                search=request.params.get(SCV2QueryParameterType.SEARCH.value),
+                top=request.params.get(SCV2QueryParameterType.TOP.value),
+                skip=request.params.get(SCV2QueryParameterType.SKIP.value),
+                exclude=request.params.get(SCV2QueryParameterType.EXCLUDE.value),
+                count=request.params.get(SCV2QueryParameterType.COUNT.value)
+            )
+        elif request.request_type == SCV2RequestType.POST:
+            return await self.post(
+                service=request.service,
+                endpoint=request.endpoint,
+                payload=request.payload
+            )
+        elif request.request_type == SCV2RequestType.PATCH:
+            return await self.patch(
+                service=request.service,
+                endpoint=request.endpoint,
+                resource_id=request.resource_id,
+                payload=request.payload,
+                etag=request.headers.get('If-Match')
+            )
+        elif request.request_type == SCV2RequestType.PUT:
+            return await self.put(
+                service=request.service,
+                endpoint=request.endpoint,
+                resource_id=request.resource_id,
+                payload=request.payload
+            )
+        elif request.request_type == SCV2RequestType.DELETE:
+            return await self.delete(
+                service=request.service,
+                endpoint=request.endpoint,
+                resource_id=request.resource_id
+            )
+        else:
+            raise ValueError(f"Unsupported request type: {request.request_type}")
@@ -1,5 +1,7 @@
 from scv2py.services import SCV2Service, SCV2BaseEndpoint
 
+from scv2py.core.plan import SCV2BatchPlan
+
 class SCV2BatchRequestBuilder:
 
     __sc_request : dict = { }
@@ -77,19 +79,19 @@ class SCV2BatchRequestBuilder:
 
 class SCV2ClientBatchRequest:
 
-    __sc_requests : list
-
-    __sc_requests_ids : dict
+    # Requests by ID. Dictionaries keep the insertion order,
+    # so adding and removing a request are both O(1).
+    __sc_requests : dict
 
     def __init__(self):
-        self.__sc_requests = []
-        self.__sc_requests_ids = { }
+        self.__sc_requests = { }
 
-    def __add_request_id(self, request_id : str):
-        if(request_id in self.__sc_requests_ids):
-            raise ValueError(f"Request ID '{request_id}' is already in use")
+    def __add_request(self, entry : dict):
+        # Duplicates are rejected before the batch is modified
+        if(entry['_id'] in self.__sc_requests):
+            raise ValueError(f"Request ID '{entry['_id']}' is already in use")
 
-        self.__sc_requests_ids[request_id] = len(self.__sc_requests) - 1
+        self.__sc_requests[entry['_id']] = entry
 
     def __validate_request_params(self, request_id : str, service : SCV2Service, endpoint : SCV2BaseEndpoint):
         if not request_id:
@@ -125,7 +127,7 @@ class SCV2ClientBatchRequest:
             '$exclude': exclude
         }.items() if v is not None}
 
-        self.__sc_requests.append({
+        self.__add_request({
             '_id': request_id,
             '_priority': priority,
             'http_method': 'GET',
@@ -137,8 +139,6 @@ class SCV2ClientBatchRequest:
             'sc_headers': { }
         })
 
-        self.__add_request_id(request_id=request_id)
-
         return self
     
     def add_post_request(self, request_id : str, service : SCV2Service, endpoint : SCV2BaseEndpoint, payload : dict, priority : int = 0) -> "SCV2ClientBatchRequest":
@@ -148,7 +148,7 @@ class SCV2ClientBatchRequest:
         if not payload:
             raise ValueError(f"Payload is required for POST request '{request_id}'")
 
-        self.__sc_requests.append({
+        self.__add_request({
             '_id': request_id,
             '_priority': priority,
             'http_method': 'POST',
@@ -160,8 +160,6 @@ class SCV2ClientBatchRequest:
             'sc_headers': { }
         })
 
-        self.__add_request_id(request_id=request_id)
-
         return self
     
     def add_patch_request(self,
@@ -170,8 +168,15 @@ class SCV2ClientBatchRequest:
                           endpoint : SCV2BaseEndpoint,
                           resource_id : str,
                           payload : dict,
-                          etag : str,
+                          etag : str = None,
                           priority : int = 0) -> "SCV2ClientBatchRequest":
+        """
+        Add a PATCH request to the batch.
+
+        The `etag` can be omitted when the session has an ETag store
+        (`sc_etag_store`): the `If-Match` value is then filled in when the request is sent.
+        Otherwise, the request fails with a ValueError when it is sent.
+        """
 
         self.__validate_request_params(request_id=request_id, service=service, endpoint=endpoint)
 
@@ -180,11 +185,8 @@ class SCV2ClientBatchRequest:
             
         if not payload:
             raise ValueError(f"Payload is required for PATCH request '{request_id}'")
-            
-        if not etag:
-            raise ValueError(f"ETag is required for PATCH request '{request_id}'")
 
-        self.__sc_requests.append({
+        self.__add_request({
             '_id': request_id,
             '_priority': priority,
             'http_method': 'PATCH',
@@ -193,18 +195,16 @@ class SCV2ClientBatchRequest:
             'sc_resource_id': resource_id,
             'sc_params': None,
             'sc_payload': payload,
-            'sc_headers': { 'If-Match': etag }
+            'sc_headers': { 'If-Match': etag } if etag else { }
         })
 
-        self.__add_request_id(request_id=request_id)
-
         return self
     
     def add_put_request(self, request_id : str, service : SCV2Service, endpoint : SCV2BaseEndpoint, resource_id : str, payload : dict, priority : int = 0) -> "SCV2ClientBatchRequest":
         
         self.__validate_request_params(request_id=request_id, service=service, endpoint=endpoint)
 
-        self.__sc_requests.append({
+        self.__add_request({
             '_id': request_id,
             '_priority': priority,
             'http_method': 'PUT',
@@ -216,15 +216,13 @@ class SCV2ClientBatchRequest:
             'sc_headers': { }
         })
 
-        self.__add_request_id(request_id=request_id)
-
         return self
 
     def add_delete_request(self, request_id : str, service : SCV2Service, endpoint : SCV2BaseEndpoint, resource_id : str, priority : int = 0) -> "SCV2ClientBatchRequest":
         
         self.__validate_request_params(request_id=request_id, service=service, endpoint=endpoint)
 
-        self.__sc_requests.append({
+        self.__add_request({
             '_id': request_id,
             '_priority': priority,
             'http_method': 'DELETE',
@@ -236,8 +234,6 @@ class SCV2ClientBatchRequest:
             'sc_headers': { }
         })
 
-        self.__add_request_id(request_id=request_id)
-
         return self
 
     def add_dependent_request(self,
@@ -251,12 +247,15 @@ class SCV2ClientBatchRequest:
         This allows you to create requests that need data from earlier responses.
         The transform_function receives the parent request's response and must
         return a dictionary with the configuration for the dependent request.
+        It can also return a list of configurations: all of them are then run
+        concurrently, and reported as `request_id[0]`, `request_id[1]`, ...
         
         Args:
             request_id: Unique identifier for this request
             depends_on: ID of the parent request this one depends on
             transform_function: Function that takes the parent response and
                                 returns a request configuration dictionary
+                                (or a list of them)
             priority: Request priority (higher numbers = higher priority)
                             
         Returns:
@@ -278,11 +277,11 @@ class SCV2ClientBatchRequest:
                                     transform_function=transform_func)
         """
         # Check if the request ID is already in use
-        if request_id in self.__sc_requests_ids:
+        if request_id in self.__sc_requests:
             raise ValueError(f"Request ID '{request_id}' is already in use")
         
         # Check if the parent request exists
-        if depends_on not in self.__sc_requests_ids:
+        if depends_on not in self.__sc_requests:
             raise ValueError(f"Parent request '{depends_on}' not found")
             
         # Check if the transform function is callable
@@ -290,7 +289,7 @@ class SCV2ClientBatchRequest:
             raise ValueError("Transform function must be callable")
         
         # Add the dependent request to the batch
-        self.__sc_requests.append({
+        self.__add_request({
             '_id': request_id,
             '_priority': priority,
             'is_dependent': True,
@@ -298,9 +297,6 @@ class SCV2ClientBatchRequest:
             'transform_function': transform_function
         })
         
-        # Register the request ID
-        self.__add_request_id(request_id=request_id)
-        
         return self
 
     def remove_request(self, request_id : str) -> "SCV2ClientBatchRequest":
@@ -313,16 +309,30 @@ class SCV2ClientBatchRequest:
         Returns:
             Self reference for method chaining
         """
-        if request_id in self.__sc_requests_ids:
-            idx = self.__sc_requests_ids[request_id]
-            self.__sc_requests.pop(idx)
-            
-            # Rebuild the request ID mapping
-            self.__sc_requests_ids = {}
-            for i, req in enumerate(self.__sc_requests):
-                self.__sc_requests_ids[req['_id']] = i
-        
+        self.__sc_requests.pop(request_id, None)
+
         return self
 
+    def __contains__(self, request_id : str) -> bool:
+        return request_id in self.__sc_requests
+
+    def __len__(self) -> int:
+        return len(self.__sc_requests)
+
     def get_requests(self):
-        return self.__sc_requests
\ No newline at end of file
+        return list(self.__sc_requests.values())
+
+    def compile(self) -> SCV2BatchPlan:
+        """
+        Validate the batch and compile it into a reusable SCV2BatchPlan.
+
+        String values of the requests may contain `{name}` placeholders,
+        bound to actual values each time the plan is executed.
+
+        Returns:
+            The compiled plan, independent from later changes to this batch
+
+        Raises:
+            ValueError: If a dependency is missing or the dependencies form a cycle
+        """
+        return SCV2BatchPlan(self.get_requests())
\ No newline at end of file
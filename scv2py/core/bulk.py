@@ -0,0 +1,202 @@
+import itertools
+
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+from scv2py.services import SCV2Service, SCV2BaseEndpoint
+
+from scv2py.exceptions import SCV2RequestError
+
+from scv2py.core.executor import SCV2BatchExecutor
+from scv2py.core.response import read_created_id
+
+# HTTP methods supported by the bulk writer
+BULK_METHODS : tuple = ('POST', 'PATCH', 'PUT')
+
+class SCV2BulkWriter:
+    """
+    Writes large numbers of entities (create or update) through a bounded
+    concurrent pipeline.
+
+    Items are read lazily from the input iterable: at most `max_pending`
+    writes are outstanding at any time, so the input can be a generator over
+    a file or a database cursor of any size. A failed write never stops the
+    load; its error is reported in the per-item result instead.
+
+    Example:
+        writer = SCV2BulkWriter(session, max_workers=16)
+        for result in writer.iter_write(SCV2Service.CONTACT_PERSON_SERVICE, ContactPersonServiceEndpoint.CONTACT_PERSON, payloads):
+            if not result['success']:
+                print(result['index'], result['status'], result['error'])
+    """
+
+    # The session used to perform the calls
+    __sc_session : "SCV2Session"
+
+    # Maximum number of writes in flight at the same time
+    __sc_max_workers : int
+
+    # Maximum number of items taken from the input and not yet reported
+    __sc_max_pending : int
+
+    def __init__(self, session : "SCV2Session", max_workers : int = 8, max_pending : int = None) -> None:
+
+        if max_workers <= 0:
+            raise ValueError("Max workers must be a positive integer")
+
+        if max_pending is not None and max_pending < max_workers:
+            raise ValueError("Max pending must be at least as large as max workers")
+
+        self.__sc_session = session
+        self.__sc_max_workers = max_workers
+        self.__sc_max_pending = max_pending or max_workers * 2
+
+    @staticmethod
+    def __make_entry(index : int, http_method : str, service : SCV2Service, endpoint : SCV2BaseEndpoint, item : Any) -> dict:
+        # Items are converted to the same entries built by the SCV2ClientBatchRequest add_* methods
+        resource_id, etag = None, None
+
+        if http_method == 'POST':
+            payload = item
+        elif isinstance(item, tuple) and len(item) in (2, 3):
+            resource_id, payload = item[0], item[1]
+            etag = item[2] if len(item) == 3 else None
+        else:
+            raise ValueError(f"{http_method} items must be (resource_id, payload) or (resource_id, payload, etag) tuples")
+
+        if not payload:
+            raise ValueError(f"Payload is required for {http_method} item {index}")
+
+        if http_method != 'POST' and not resource_id:
+            raise ValueError(f"Resource ID is required for {http_method} item {index}")
+
+        return {
+            '_id': index,
+            '_priority': 0,
+            'http_method': http_method,
+            'sc_service': service,
+            'sc_endpoint': endpoint,
+            'sc_resource_id': resource_id,
+            'sc_params': None,
+            'sc_payload': payload,
+            'sc_headers': { 'If-Match': etag } if etag else { }
+        }
+
+    @staticmethod
+    def __make_result(entry : dict, response = None, error : Exception = None) -> dict:
+        result : dict = {
+            'index': entry['_id'],
+            'resource_id': entry['sc_resource_id'],
+            'success': False,
+            'status': None,
+            'etag': None,
+            'error': error
+        }
+
+        if response is not None:
+            result['status'] = response.status_code
+            result['etag'] = response.headers.get('ETag')
+
+            if response.ok:
+                result['success'] = True
+
+                if result['resource_id'] is None:
+                    result['resource_id'] = read_created_id(response)
+            else:
+                result['error'] = SCV2RequestError(f"Request failed with status {response.status_code}: {response.text[:500]}")
+
+            # Only the result is kept: the connection and the body can be released
+            response.close()
+
+        return result
+
+    def __write_entry(self, entry : dict):
+        return self.__sc_session.from_request(SCV2BatchExecutor.to_request(entry))
+
+    def iter_write(self,
+                   service : SCV2Service,
+                   endpoint : SCV2BaseEndpoint,
+                   items : Iterable[Any],
+                   http_method : str = 'POST') -> Iterator[dict]:
+        """
+        Write the items, yielding one result per item as the writes complete.
+
+        Args:
+            service: The service to write to
+            endpoint: The endpoint to write to
+            items: For POST, the payloads to create. For PATCH and PUT,
+                   `(resource_id, payload)` or `(resource_id, payload, etag)` tuples.
+            http_method: One of POST, PATCH or PUT
+
+        Returns:
+            An iterator over the results, in completion order. Each result is a
+            dictionary with the `index` of the item in the input, its `resource_id`
+            (the created ID for POST), `success`, `status`, `etag` and `error`.
+        """
+        http_method = http_method.upper()
+
+        if http_method not in BULK_METHODS:
+            raise ValueError(f"Unsupported bulk method '{http_method}', expected one of: {', '.join(BULK_METHODS)}")
+
+        if not service or not endpoint:
+            raise ValueError("Service and endpoint must be provided")
+
+        source : Iterator[Tuple[int, Any]] = iter(enumerate(items))
+
+        exhausted : bool = False
+
+        in_flight : Dict[Future, dict] = { }
+
+        with ThreadPoolExecutor(max_workers=self.__sc_max_workers, thread_name_prefix='scv2-bulk') as pool:
+            try:
+                while True:
+                    # Backpressure: the input is only read while there is room in the pipeline.
+                    # Invalid items are reported right away, without taking room.
+                    while not exhausted and len(in_flight) < self.__sc_max_pending:
+                        room : int = self.__sc_max_pending - len(in_flight)
+                        taken : int = 0
+
+                        for index, item in itertools.islice(source, room):
+                            taken += 1
+                            try:
+                                entry = SCV2BulkWriter.__make_entry(index, http_method, service, endpoint, item)
+                            except ValueError as e:
+                                yield SCV2BulkWriter.__make_result({ '_id': index, 'sc_resource_id': None }, error=e)
+                                continue
+
+                            in_flight[pool.submit(self.__write_entry, entry)] = entry
+
+                        exhausted = taken < room
+
+                    if not in_flight:
+                        return
+
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+
+                    for future in done:
+                        entry = in_flight.pop(future)
+
+                        try:
+                            yield SCV2BulkWriter.__make_result(entry, response=future.result())
+                        except Exception as e:
+                            yield SCV2BulkWriter.__make_result(entry, error=e)
+            finally:
+                # The consumer stopped early: the queued writes are not sent
+                for future in in_flight:
+                    future.cancel()
+
+    def write(self,
+              service : SCV2Service,
+              endpoint : SCV2BaseEndpoint,
+              items : Iterable[Any],
+              http_method : str = 'POST') -> List[dict]:
+        """
+        Write all the items and collect their results.
+
+        Args:
+            service, endpoint, items, http_method: As in `iter_write`
+
+        Returns:
+            The results of all the items, ordered as the input
+        """
+        return sorted(self.iter_write(service, endpoint, items, http_method), key=lambda result: result['index'])
@@ -0,0 +1,165 @@
+import threading
+import time
+
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional, Set, Tuple
+
+from scv2py.services import SCV2Service, SCV2BaseEndpoint
+
+class SCV2CacheEntry:
+    """
+    A cached GET response.
+    """
+    __slots__ = ('response', 'etag', 'expires_at', 'size')
+
+    def __init__(self, response, etag : Optional[str], expires_at : float, size : int) -> None:
+        self.response = response
+        self.etag = etag
+        self.expires_at = expires_at
+        self.size = size
+
+    @property
+    def is_fresh(self) -> bool:
+        return time.monotonic() < self.expires_at
+
+class SCV2ResponseCache:
+    """
+    Thread-safe LRU cache of GET responses, used by SCV2Session when passed as `sc_cache`.
+
+    Entries are keyed on service, endpoint, resource id and the normalized query
+    parameters. Fresh entries are served without calling the tenant. Once an entry
+    expires it is revalidated with `If-None-Match`, and a 304 answer reuses the
+    cached body. The cache is bounded both in number of entries and in bytes;
+    the least recently used entries are evicted first.
+
+    Write requests (POST, PATCH, PUT, DELETE) sent through the session
+    invalidate the cached entries of the same service and endpoint.
+    """
+
+    # Seconds during which an entry is served without revalidation
+    __ttl : float
+
+    # Maximum number of entries
+    __max_entries : int
+
+    # Maximum total size of the cached bodies, in bytes. `None` means unbounded.
+    __max_bytes : Optional[int]
+
+    def __init__(self, ttl : float = 60.0, max_entries : int = 1024, max_bytes : int = None) -> None:
+
+        if ttl < 0:
+            raise ValueError("TTL cannot be negative")
+
+        if max_entries <= 0:
+            raise ValueError("Max entries must be a positive integer")
+
+        if max_bytes is not None and max_bytes <= 0:
+            raise ValueError("Max bytes must be a positive integer")
+
+        self.__ttl = ttl
+        self.__max_entries = max_entries
+        self.__max_bytes = max_bytes
+
+        self.__lock = threading.Lock()
+        self.__entries : "OrderedDict[Hashable, SCV2CacheEntry]" = OrderedDict()
+        self.__index : Dict[Tuple[SCV2Service, SCV2BaseEndpoint], Set[Hashable]] = { }
+        self.__size : int = 0
+
+    @staticmethod
+    def make_key(service : SCV2Service, endpoint : SCV2BaseEndpoint, resource_id : Optional[str], params : Optional[dict]) -> Hashable:
+        """
+        Build the cache key of a GET request.
+
+        Query parameters are normalized, so that the same query built
+        in a different order or with different value types hits the same entry.
+        """
+        normalized = tuple(sorted((str(k), str(v)) for k, v in (params or { }).items() if v is not None))
+
+        return (service, endpoint, resource_id, normalized)
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def __remove(self, key : Hashable) -> None:
+        entry : SCV2CacheEntry = self.__entries.pop(key)
+        self.__size -= entry.size
+
+        keys = self.__index.get(key[:2])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self.__index[key[:2]]
+
+    def get(self, key : Hashable) -> Optional[SCV2CacheEntry]:
+        """
+        Get an entry, fresh or stale, marking it as recently used.
+        Stale entries which cannot be revalidated are dropped.
+        """
+        with self.__lock:
+            entry : SCV2CacheEntry = self.__entries.get(key)
+
+            if entry is None:
+                return None
+
+            if not entry.is_fresh and not entry.etag:
+                self.__remove(key)
+                return None
+
+            self.__entries.move_to_end(key)
+
+            return entry
+
+    def put(self, key : Hashable, response) -> None:
+        """
+        Cache a successful GET response.
+        """
+        size : int = len(response.content or b'')
+
+        # Bodies larger than the whole cache are not worth caching
+        if self.__max_bytes is not None and size > self.__max_bytes:
+            return
+
+        entry = SCV2CacheEntry(
+            response=response,
+            etag=response.headers.get('ETag'),
+            expires_at=time.monotonic() + self.__ttl,
+            size=size
+        )
+
+        with self.__lock:
+            if key in self.__entries:
+                self.__remove(key)
+
+            self.__entries[key] = entry
+            self.__index.setdefault(key[:2], set()).add(key)
+            self.__size += size
+
+            while len(self.__entries) > self.__max_entries or (self.__max_bytes is not None and self.__size > self.__max_bytes):
+                self.__remove(next(iter(self.__entries)))
+
+    def refresh(self, key : Hashable) -> Optional[SCV2CacheEntry]:
+        """
+        Mark an entry as fresh again, after the tenant confirmed it with a 304.
+        """
+        with self.__lock:
+            entry : SCV2CacheEntry = self.__entries.get(key)
+
+            if entry is not None:
+                entry.expires_at = time.monotonic() + self.__ttl
+                self.__entries.move_to_end(key)
+
+            return entry
+
+    def invalidate(self, service : SCV2Service, endpoint : SCV2BaseEndpoint) -> None:
+        """
+        Drop all the entries of a service endpoint.
+        """
+        with self.__lock:
+            for key in list(self.__index.get((service, endpoint), ())):
+                self.__remove(key)
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__entries.clear()
+            self.__index.clear()
+            self.__size = 0
@@ -0,0 +1,141 @@
+import threading
+import time
+
+from typing import Optional
+
+from scv2py.exceptions import SCV2CancelledError
+
+# Token bound to the current thread, read by the sessions before each call
+_local = threading.local()
+
+# Interval at which a waiting token checks the cancellation of its parent, in seconds
+_PARENT_POLL_INTERVAL : float = 0.05
+
+def current_token() -> Optional["SCV2CancellationToken"]:
+    """
+    Get the cancellation token bound to the current thread, if any.
+    """
+    return getattr(_local, 'token', None)
+
+class SCV2CancellationToken:
+    """
+    Cooperative cancellation of a group of calls, with an optional deadline.
+
+    The token is cancelled when `cancel()` is called, when its deadline passes
+    or when its parent is cancelled. Calls sent while a token is bound to the
+    thread (`with token:`) check it first: once cancelled, no new call is sent
+    and SCV2CancelledError is raised. Calls sent before the deadline have their
+    timeout reduced to the remaining time, and a timeout caused by the deadline
+    is reported as SCV2CancelledError as well.
+
+    Calls already waiting for the tenant are not interrupted by `cancel()`:
+    they complete, or time out, on their own.
+
+    Batch executions and paginated reads take a token (`cancel_token`) and/or
+    an overall `deadline`, and bind them to their worker threads.
+
+    Example:
+        token = SCV2CancellationToken(timeout=10)
+        with token:
+            session.get(...)
+    """
+
+    # Deadline, as a `time.monotonic()` value. `None` when the token has no deadline.
+    __deadline : Optional[float]
+
+    # Token whose cancellation cancels this one as well
+    __parent : Optional["SCV2CancellationToken"]
+
+    def __init__(self, timeout : float = None, parent : "SCV2CancellationToken" = None) -> None:
+
+        if timeout is not None and timeout < 0:
+            raise ValueError("Timeout cannot be negative")
+
+        self.__deadline = None if timeout is None else time.monotonic() + timeout
+        self.__parent = parent
+        self.__event = threading.Event()
+        self.__previous = threading.local()
+
+    def __enter__(self) -> "SCV2CancellationToken":
+        # Tokens bound before this one, per thread, restored on exit
+        if not hasattr(self.__previous, 'tokens'):
+            self.__previous.tokens = [ ]
+        self.__previous.tokens.append(current_token())
+        _local.token = self
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        _local.token = self.__previous.tokens.pop()
+
+    def cancel(self) -> None:
+        """
+        Cancel the token: calls not sent yet are dropped.
+        """
+        self.__event.set()
+
+    @property
+    def expired(self) -> bool:
+        """
+        Whether the deadline of the token, or of one of its parents, has passed.
+        """
+        remaining : Optional[float] = self.remaining()
+        return remaining is not None and remaining <= 0
+
+    @property
+    def cancelled(self) -> bool:
+        """
+        Whether the token was cancelled, explicitly or by its deadline.
+        """
+        if self.__event.is_set() or self.expired:
+            return True
+        return self.__parent is not None and self.__parent.cancelled
+
+    def remaining(self) -> Optional[float]:
+        """
+        Get the time left before the deadline, in seconds, or `None` without a deadline.
+        """
+        remaining : Optional[float] = None if self.__deadline is None else self.__deadline - time.monotonic()
+
+        if self.__parent is not None:
+            parent_remaining : Optional[float] = self.__parent.remaining()
+            if parent_remaining is not None and (remaining is None or parent_remaining < remaining):
+                remaining = parent_remaining
+
+        return remaining
+
+    @property
+    def reason(self) -> Optional[str]:
+        """
+        Why the token was cancelled (`deadline exceeded` or `cancelled`), or `None`.
+        """
+        if self.expired:
+            return 'deadline exceeded'
+        if self.cancelled:
+            return 'cancelled'
+        return None
+
+    def wait(self, timeout : float) -> bool:
+        """
+        Sleep for `timeout` seconds, waking up early if the token is cancelled.
+
+        Returns:
+            Whether the token is cancelled
+        """
+        ends : float = time.monotonic() + timeout
+
+        while not self.cancelled:
+            left : float = ends - time.monotonic()
+            if left <= 0:
+                return False
+
+            # The cancellation of a parent does not set this token's event
+            self.__event.wait(left if self.__parent is None else min(left, _PARENT_POLL_INTERVAL))
+
+        return True
+
+    def raise_if_cancelled(self) -> None:
+        """
+        Raise SCV2CancelledError if the token was cancelled.
+        """
+        if self.cancelled:
+            raise SCV2CancelledError(f"Operation {self.reason}")
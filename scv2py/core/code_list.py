@@ -0,0 +1,209 @@
+import json
+import os
+import tempfile
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Optional, Tuple
+
+from scv2py.services import (
+    SCV2Service,
+    SCV2BaseEndpoint,
+    AppointmentServiceEndpoint,
+    LeadServiceEndpoint,
+    OpportunityServiceEndpoint,
+    ProductServiceEndpoint
+)
+
+# Value-help endpoints loaded when no explicit list is given
+DEFAULT_CODE_LISTS : Tuple[Tuple[SCV2Service, SCV2BaseEndpoint], ...] = (
+    (SCV2Service.OPPORTUNITY_SERVICE, OpportunityServiceEndpoint.CATEGORY),
+    (SCV2Service.OPPORTUNITY_SERVICE, OpportunityServiceEndpoint.FORECAST_CATEGORY),
+    (SCV2Service.OPPORTUNITY_SERVICE, OpportunityServiceEndpoint.LIFECYCLE_STATUS),
+    (SCV2Service.OPPORTUNITY_SERVICE, OpportunityServiceEndpoint.PRIORITY),
+    (SCV2Service.OPPORTUNITY_SERVICE, OpportunityServiceEndpoint.REASON_FOR_STATUS),
+    (SCV2Service.OPPORTUNITY_SERVICE, OpportunityServiceEndpoint.SALES_PHASE),
+    (SCV2Service.OPPORTUNITY_SERVICE, OpportunityServiceEndpoint.SOURCE),
+    (SCV2Service.LEAD_SERVICE, LeadServiceEndpoint.QUALIFICATION),
+    (SCV2Service.LEAD_SERVICE, LeadServiceEndpoint.REASON_FOR_STATUS),
+    (SCV2Service.LEAD_SERVICE, LeadServiceEndpoint.SOURCE),
+    (SCV2Service.LEAD_SERVICE, LeadServiceEndpoint.STATUS),
+    (SCV2Service.PRODUCT_SERVICE, ProductServiceEndpoint.SALES_STATUS),
+    (SCV2Service.PRODUCT_SERVICE, ProductServiceEndpoint.TYPE),
+    (SCV2Service.PRODUCT_SERVICE, ProductServiceEndpoint.UNIT_OF_MEASURE),
+    (SCV2Service.APPOINTMENT_SERVICE, AppointmentServiceEndpoint.APPOINTMENT_CATEGORY),
+    (SCV2Service.APPOINTMENT_SERVICE, AppointmentServiceEndpoint.APPOINTMENT_PRIORITY),
+    (SCV2Service.APPOINTMENT_SERVICE, AppointmentServiceEndpoint.APPOINTMENT_STATUS)
+)
+
+class SCV2CodeListStore:
+    """
+    In-memory store of code lists (value-help endpoints), with an optional disk snapshot.
+
+    All the code lists are fetched in parallel once, then every code to
+    description lookup is a dictionary access. When a snapshot path is given,
+    `load` reads the snapshot instead of calling the tenant as long as it is
+    younger than `max_age`, and writes a new one after fetching.
+
+    Example:
+        store = SCV2CodeListStore(session, snapshot_path='code_lists.json')
+        store.load()
+        store.describe(SCV2Service.OPPORTUNITY_SERVICE, OpportunityServiceEndpoint.SALES_PHASE, 'Z1')
+    """
+
+    # Session used to fetch the code lists
+    __session : "SCV2Session"
+
+    # Code lists handled by the store
+    __code_lists : Tuple[Tuple[SCV2Service, SCV2BaseEndpoint], ...]
+
+    # Path of the snapshot file. `None` disables the snapshot.
+    __snapshot_path : Optional[str]
+
+    # Maximum age of a snapshot, in seconds, before the tenant is called again
+    __max_age : float
+
+    # Fields holding the code and its description in the code list entities
+    __code_field : str
+    __description_field : str
+
+    def __init__(self,
+                 session : "SCV2Session",
+                 code_lists : Iterable[Tuple[SCV2Service, SCV2BaseEndpoint]] = None,
+                 snapshot_path : str = None,
+                 max_age : float = 24 * 60 * 60,
+                 code_field : str = 'code',
+                 description_field : str = 'description') -> None:
+
+        self.__session = session
+        self.__code_lists = tuple(code_lists) if code_lists is not None else DEFAULT_CODE_LISTS
+        self.__snapshot_path = snapshot_path
+        self.__max_age = max_age
+        self.__code_field = code_field
+        self.__description_field = description_field
+
+        self.__lock = threading.Lock()
+        self.__values : Dict[Tuple[SCV2Service, SCV2BaseEndpoint], Dict[str, str]] = { }
+        self.__loaded_at : Optional[float] = None
+
+    @staticmethod
+    def __snapshot_key(service : SCV2Service, endpoint : SCV2BaseEndpoint) -> str:
+        return f'{service.value}/{endpoint.value}'
+
+    @property
+    def loaded_at(self) -> Optional[float]:
+        """
+        Unix timestamp of the moment the code lists were fetched from the tenant.
+        """
+        return self.__loaded_at
+
+    def __fetch(self, service : SCV2Service, endpoint : SCV2BaseEndpoint) -> Dict[str, str]:
+        return {
+            str(entity[self.__code_field]): entity.get(self.__description_field)
+            for entity in self.__session.iter_collection(service=service, endpoint=endpoint, page_size=1000, prefetch=False)
+            if self.__code_field in entity
+        }
+
+    def __read_snapshot(self) -> bool:
+        if not self.__snapshot_path or not os.path.exists(self.__snapshot_path):
+            return False
+
+        try:
+            with open(self.__snapshot_path, 'r', encoding='utf-8') as snapshot_file:
+                snapshot : dict = json.load(snapshot_file)
+        except (OSError, ValueError):
+            return False
+
+        created_at : float = snapshot.get('created_at', 0)
+        stored : dict = snapshot.get('code_lists', { })
+
+        if time.time() - created_at > self.__max_age:
+            return False
+
+        # The snapshot is only usable if it covers all the code lists of the store
+        keys = { (service, endpoint): SCV2CodeListStore.__snapshot_key(service, endpoint) for service, endpoint in self.__code_lists }
+        if any(key not in stored for key in keys.values()):
+            return False
+
+        with self.__lock:
+            self.__values = { code_list: dict(stored[key]) for code_list, key in keys.items() }
+            self.__loaded_at = created_at
+
+        return True
+
+    def save(self) -> None:
+        """
+        Write the loaded code lists to the snapshot file.
+        The file is replaced atomically, so concurrent readers never see a partial snapshot.
+        """
+        if not self.__snapshot_path:
+            raise ValueError("No snapshot path configured")
+
+        with self.__lock:
+            snapshot : dict = {
+                'created_at': self.__loaded_at or time.time(),
+                'code_lists': {
+                    SCV2CodeListStore.__snapshot_key(service, endpoint): values
+                    for (service, endpoint), values in self.__values.items()
+                }
+            }
+
+        directory : str = os.path.dirname(os.path.abspath(self.__snapshot_path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.scv2-code-lists-')
+
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as tmp_file:
+                json.dump(snapshot, tmp_file)
+            os.replace(tmp_path, self.__snapshot_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def load(self, force : bool = False, max_workers : int = 8) -> None:
+        """
+        Load all the code lists, from the snapshot if it is recent enough, otherwise from the tenant.
+
+        Args:
+            force: Ignore the snapshot and fetch the code lists from the tenant
+            max_workers: Maximum number of code lists fetched at the same time
+
+        Raises:
+            SCV2RequestError: If one of the code lists cannot be fetched
+        """
+        if not force and self.__read_snapshot():
+            return
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='scv2-code-list') as pool:
+            futures = {
+                code_list: pool.submit(self.__fetch, *code_list)
+                for code_list in self.__code_lists
+            }
+            values = { code_list: future.result() for code_list, future in futures.items() }
+
+        with self.__lock:
+            self.__values = values
+            self.__loaded_at = time.time()
+
+        if self.__snapshot_path:
+            self.save()
+
+    def get_code_list(self, service : SCV2Service, endpoint : SCV2BaseEndpoint) -> Dict[str, str]:
+        """
+        Get a whole code list, as a code to description dictionary.
+        """
+        values = self.__values.get((service, endpoint))
+
+        if values is None:
+            raise KeyError(f'Code list {endpoint.name} of service {service.name} is not loaded')
+
+        return values
+
+    def describe(self, service : SCV2Service, endpoint : SCV2BaseEndpoint, code : str, default : str = None) -> Optional[str]:
+        """
+        Get the description of a code.
+
+        Returns:
+            The description of the code, or `default` if the code is unknown
+        """
+        return self.get_code_list(service, endpoint).get(str(code), default)
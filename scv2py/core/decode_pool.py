@@ -0,0 +1,153 @@
+import json
+import os
+
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+
+from scv2py.core.response import raise_for_status
+from scv2py.core.records import SCV2Record, record_type
+
+def decode_page(content : bytes, transform : Callable[[Any], Any] = None) -> List[Any]:
+    """
+    Decode the body of a collection response and apply `transform` to each entity.
+
+    Runs in the worker processes of SCV2DecodePool. Entities are extracted as
+    in `read_records`: the `value` array, or a single `value` object.
+    """
+    payload = json.loads(content)
+
+    if isinstance(payload, dict):
+        payload = payload.get('value', [])
+
+    entities : List[Any] = payload if isinstance(payload, list) else [payload]
+
+    if transform is None:
+        return entities
+
+    return [transform(entity) for entity in entities]
+
+class _RecordBuilder:
+    # Picklable transform building the records of a projection in the worker processes.
+    # The record class is created again in each process, and is not pickled.
+
+    def __init__(self, select : Union[str, Iterable[str]]) -> None:
+        self.select = select
+        self.record_class = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return { 'select': self.select }
+
+    def __setstate__(self, state : Dict[str, Any]) -> None:
+        self.select = state['select']
+        self.record_class = None
+
+    def __call__(self, entity : Dict[str, Any]) -> SCV2Record:
+        if self.record_class is None:
+            self.record_class = record_type(self.select)
+        return self.record_class.from_entity(entity)
+
+class SCV2DecodePool:
+    """
+    Process pool decoding collection pages outside of the calling process.
+
+    JSON decoding and per-entity transformations are CPU bound and hold the GIL,
+    so a single extraction keeps one core busy while the network waits. Passed
+    as `decode_pool` to `SCV2Session.iter_collection`, `extract_collection` or
+    `export_collection`, the raw body of each page is sent to a worker process,
+    decoded there and transformed with `transform`, and the results are
+    returned in page order.
+
+    `transform` is applied to every entity and must return one item per entity.
+    It is sent to the worker processes, so it must be picklable: a module level
+    function or an instance of a module level class, not a lambda. The results
+    are pickled back to the calling process: the pool pays off when the
+    transform is expensive or shrinks the entities (e.g. projections, records).
+
+    With the `spawn` start method (Windows, macOS), the main module must be
+    guarded by `if __name__ == '__main__':`.
+
+    Example:
+        with SCV2DecodePool(max_workers=4, transform=to_row) as pool:
+            for row in session.extract_collection(service, endpoint, decode_pool=pool):
+                ...
+    """
+
+    # Function applied to each decoded entity. `None` returns the entities as they are.
+    __transform : Optional[Callable[[Any], Any]]
+
+    # Number of worker processes
+    __max_workers : int
+
+    # Worker processes
+    __pool : ProcessPoolExecutor
+
+    def __init__(self, max_workers : int = None, transform : Callable[[Any], Any] = None) -> None:
+
+        if max_workers is not None and max_workers <= 0:
+            raise ValueError("Max workers must be a positive integer")
+
+        self.__transform = transform
+        self.__max_workers = max_workers or os.cpu_count() or 1
+        self.__pool = ProcessPoolExecutor(max_workers=self.__max_workers)
+
+    def __enter__(self) -> "SCV2DecodePool":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    @property
+    def max_workers(self) -> int:
+        """
+        The number of worker processes, which is also the number of pages
+        requested at the same time by `iter_collection`.
+        """
+        return self.__max_workers
+
+    @property
+    def transform(self) -> Optional[Callable[[Any], Any]]:
+        """
+        The function applied to each decoded entity, if any.
+        """
+        return self.__transform
+
+    def submit(self, response, select : Union[str, Iterable[str]] = None) -> Future:
+        """
+        Send the body of a collection response to a worker process.
+
+        The status of the response is checked in the calling thread.
+
+        Args:
+            response: A `requests` response of a collection GET, not streamed
+            select: Build SCV2Record instances of this projection instead of
+                    applying `transform`
+
+        Returns:
+            A future of the list of transformed entities
+
+        Raises:
+            SCV2RequestError: If the response carries an error status code
+            ValueError: If both `select` and a transform are set
+        """
+        raise_for_status(response)
+
+        transform = self.__transform
+
+        if select is not None:
+            if transform is not None:
+                raise ValueError("Records cannot be built by a decode pool with a transform")
+            transform = _RecordBuilder(select)
+
+        return self.__pool.submit(decode_page, response.content, transform)
+
+    def decode(self, response, select : Union[str, Iterable[str]] = None) -> List[Any]:
+        """
+        Decode and transform a collection response in a worker process, waiting for the result.
+        """
+        return self.submit(response, select).result()
+
+    def close(self) -> None:
+        """
+        Stop the worker processes.
+        """
+        self.__pool.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,112 @@
+import threading
+
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+from scv2py.services import SCV2Service, SCV2BaseEndpoint
+
+from scv2py.core.response import read_created_id
+
+class SCV2ETagStore:
+    """
+    Thread-safe LRU store of the last known ETag of each entity, used by the
+    sessions when passed as `sc_etag_store`.
+
+    The ETags returned by single entity GET, POST, PATCH and PUT responses are
+    recorded, keyed on service, endpoint and resource id. A PATCH sent without
+    an explicit ETag then takes its `If-Match` value from the store, saving the
+    GET otherwise needed before every update. If the stored ETag is outdated
+    (412 Precondition Failed), the entity is read again and the PATCH is retried once.
+    """
+
+    # Maximum number of stored ETags
+    __max_entries : int
+
+    # Whether a PATCH using a stored ETag is retried after a 412 answer
+    __retry_on_conflict : bool
+
+    def __init__(self, max_entries : int = 100000, retry_on_conflict : bool = True) -> None:
+
+        if max_entries <= 0:
+            raise ValueError("Max entries must be a positive integer")
+
+        self.__max_entries = max_entries
+        self.__retry_on_conflict = retry_on_conflict
+
+        self.__lock = threading.Lock()
+        self.__etags : "OrderedDict[Hashable, str]" = OrderedDict()
+
+    @property
+    def retry_on_conflict(self) -> bool:
+        return self.__retry_on_conflict
+
+    def __len__(self) -> int:
+        return len(self.__etags)
+
+    def get(self, service : SCV2Service, endpoint : SCV2BaseEndpoint, resource_id : str) -> Optional[str]:
+        """
+        Get the last known ETag of an entity, or `None` if it is unknown.
+        """
+        key = (service, endpoint, resource_id)
+
+        with self.__lock:
+            etag : Optional[str] = self.__etags.get(key)
+
+            if etag is not None:
+                self.__etags.move_to_end(key)
+
+            return etag
+
+    def put(self, service : SCV2Service, endpoint : SCV2BaseEndpoint, resource_id : str, etag : str) -> None:
+        """
+        Store the ETag of an entity.
+        """
+        key = (service, endpoint, resource_id)
+
+        with self.__lock:
+            self.__etags[key] = etag
+            self.__etags.move_to_end(key)
+
+            while len(self.__etags) > self.__max_entries:
+                self.__etags.popitem(last=False)
+
+    def discard(self, service : SCV2Service, endpoint : SCV2BaseEndpoint, resource_id : str) -> None:
+        """
+        Forget the ETag of an entity.
+        """
+        with self.__lock:
+            self.__etags.pop((service, endpoint, resource_id), None)
+
+    def record(self, service : SCV2Service, endpoint : SCV2BaseEndpoint, resource_id : Optional[str], response) -> None:
+        """
+        Store the ETag of a single entity response, if it has one.
+
+        Args:
+            service: The service of the call
+            endpoint: The endpoint of the call
+            resource_id: The ID of the entity. For created entities (POST),
+                         `None`: the ID is read from the response body.
+            response: A `requests` or `httpx` response
+        """
+        if response.status_code >= 300:
+            return
+
+        etag : Optional[str] = response.headers.get('ETag')
+
+        if not etag:
+            return
+
+        if resource_id is None:
+            resource_id = read_created_id(response)
+
+            if resource_id is None:
+                return
+
+        self.put(service, endpoint, resource_id, etag)
+
+    def clear(self) -> None:
+        """
+        Remove all the stored ETags.
+        """
+        with self.__lock:
+            self.__etags.clear()
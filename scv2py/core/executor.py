@@ -0,0 +1,431 @@
+import heapq
+import itertools
+import time
+
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from contextlib import nullcontext
+from typing import Any, Callable, Dict, Generator, Hashable, Iterator, List, Optional, Tuple, Union
+
+from scv2py.exceptions import SCV2RequestError, SCV2CancelledError
+
+from scv2py.core.request import SCV2Request, SCV2RequestType
+from scv2py.core.batch import SCV2ClientBatchRequest
+from scv2py.core.plan import SCV2BatchPlan
+from scv2py.core.cache import SCV2ResponseCache
+from scv2py.core.optimizer import merge_resource_gets, split_merged_response
+from scv2py.core.metrics import SCV2Metrics
+from scv2py.core.tracing import SCV2Tracer
+from scv2py.core.cancellation import SCV2CancellationToken
+
+# Interval at which a cancellable execution with queued requests checks its token, in seconds
+_CANCEL_POLL_INTERVAL : float = 0.1
+
+class _FanOut:
+    # Requests returned by a transform function returning a list
+    __slots__ = ('requests',)
+
+    def __init__(self, requests : list) -> None:
+        self.requests = list(requests)
+
+class SCV2BatchExecutor:
+    """
+    Runs the requests of a SCV2ClientBatchRequest concurrently on a bounded
+    worker pool, sharing the connection pool of the owning SCV2Session.
+
+    Ready requests are dispatched by descending `_priority` (ties keep the
+    order in which they were added). A dependent request is scheduled as soon
+    as its parent finishes, without waiting for unrelated requests.
+
+    Identical GET requests (same service, endpoint, resource id and parameters)
+    are sent only once while in flight: the duplicates share the response.
+
+    With `merge_gets`, GET requests reading single entities of the same service
+    and endpoint are merged into a few collection GETs filtering on their IDs
+    (see `merge_resource_gets`). Each request still gets its own result, holding
+    a response equivalent to the single entity one. Entities missing from the
+    merged answer, and the requests of a failed merged GET, are read one by one.
+    Split responses carry an `ETag` header only when the entity has an
+    `@odata.etag` annotation. As the ETags of single entity reads are needed
+    by the ETag store of the session, GETs are not merged when it has one.
+
+    Once the cancellation token of an execution is cancelled (or its deadline
+    passes), the requests not sent yet are dropped with a SCV2CancelledError
+    result, as are the dependents of cancelled requests. Calls already in
+    flight complete, or time out by the deadline.
+    """
+
+    # The session used to perform the calls
+    __sc_session : "SCV2Session"
+
+    # Maximum number of requests in flight at the same time
+    __sc_max_workers : int
+
+    # Whether single entity GET requests are merged into collection GETs
+    __sc_merge_gets : bool
+
+    def __init__(self, session : "SCV2Session", max_workers : int = 8, merge_gets : bool = False) -> None:
+
+        if max_workers <= 0:
+            raise ValueError("Max workers must be a positive integer")
+
+        self.__sc_session = session
+        self.__sc_max_workers = max_workers
+        self.__sc_merge_gets = merge_gets
+
+    @staticmethod
+    def to_request(entry : Union[dict, SCV2Request]) -> SCV2Request:
+        """
+        Convert a batch entry (or the output of a transform function) to a SCV2Request.
+
+        Args:
+            entry: Either a SCV2Request or a request configuration dictionary
+                   using the same keys as the SCV2ClientBatchRequest entries
+
+        Returns:
+            The equivalent SCV2Request
+        """
+        if isinstance(entry, SCV2Request):
+            return entry
+
+        if not isinstance(entry, dict):
+            raise ValueError(f"Unsupported request configuration: {type(entry).__name__}")
+
+        if not entry.get('http_method'):
+            raise ValueError("HTTP method is required")
+
+        return SCV2Request(
+            request_type=SCV2RequestType(entry['http_method'].upper()),
+            service=entry.get('sc_service'),
+            endpoint=entry.get('sc_endpoint'),
+            resource_id=entry.get('sc_resource_id'),
+            params=entry.get('sc_params') or {},
+            payload=entry.get('sc_payload'),
+            headers=entry.get('sc_headers') or {}
+        )
+
+    @staticmethod
+    def __make_result(response = None, error : Exception = None) -> dict:
+        return {
+            'success': error is None and response is not None and response.ok,
+            'response': response,
+            'error': error
+        }
+
+    @staticmethod
+    def __get_key(entry : dict) -> Optional[Hashable]:
+        # Only plain GET entries can be compared before being sent
+        if entry.get('is_dependent') or entry.get('http_method', '').upper() != 'GET':
+            return None
+
+        return SCV2ResponseCache.make_key(entry.get('sc_service'), entry.get('sc_endpoint'), entry.get('sc_resource_id'), entry.get('sc_params'))
+
+    @staticmethod
+    def __cancelled(entry : dict, token : SCV2CancellationToken) -> SCV2CancelledError:
+        return SCV2CancelledError(f"Request '{entry['_id']}' was not sent: batch {token.reason or 'cancelled'}")
+
+    def __run_entry(self, entry : dict, parent_response = None, queued_at : float = None, token : SCV2CancellationToken = None):
+        if token is not None and token.cancelled:
+            raise SCV2BatchExecutor.__cancelled(entry, token)
+
+        tracer : SCV2Tracer = self.__sc_session.tracer
+
+        # The token is bound to the worker thread, where the session reads it
+        with token or nullcontext():
+            if tracer is None:
+                return self.__send_entry(entry, parent_response)
+
+            tracer.async_span('queue', 'batch', entry['_id'], queued_at, time.perf_counter())
+
+            # The spans of the calls made for the entry are tagged with its ID
+            with tracer.scope(request_id=entry['_id']):
+                return self.__send_entry(entry, parent_response, tracer)
+
+    def __send_entry(self, entry : dict, parent_response = None, tracer : SCV2Tracer = None):
+        # Dependent requests are resolved right before being sent, so that
+        # the transform function runs on a worker thread and not on the scheduler.
+        if entry.get('is_dependent'):
+            if tracer is None:
+                entry = entry['transform_function'](parent_response)
+            else:
+                with tracer.measure('transform', 'batch'):
+                    entry = entry['transform_function'](parent_response)
+
+            # Fanned out requests are scheduled by the caller, each on its own worker
+            if isinstance(entry, (list, tuple)):
+                return _FanOut(entry)
+        elif '_request' in entry:
+            entry = entry['_request']
+
+        return self.__sc_session.from_request(SCV2BatchExecutor.to_request(entry))
+
+    @staticmethod
+    def __fan_out_result(request_id : str, fan_out : dict) -> dict:
+        failed : int = fan_out['failed']
+        total : int = len(fan_out['responses'])
+
+        return {
+            'success': failed == 0,
+            'response': fan_out['responses'],
+            'error': None if failed == 0 else SCV2RequestError(f"{failed} of {total} requests fanned out by '{request_id}' did not succeed")
+        }
+
+    def iter_results(self,
+                     batch : Union[SCV2ClientBatchRequest, SCV2BatchPlan],
+                     params : Dict[str, Any] = None,
+                     deadline : float = None,
+                     cancel_token : SCV2CancellationToken = None) -> Iterator[Tuple[str, dict]]:
+        """
+        Execute the batch, yielding `(request_id, result)` pairs as requests complete.
+
+        Results are produced as soon as each request finishes, so fast requests are
+        not held back by slow ones, and results can be dropped once processed.
+
+        A transform function may return a list of requests (fan-out). Each of them
+        runs concurrently and is reported as `request_id[index]`; the result of
+        `request_id` itself comes once all of them completed, with the list of
+        their responses as `response`. Dependents of a fanned out request receive
+        that list as well.
+
+        Args:
+            batch: The batch, or compiled plan, to execute
+            params: The values bound to the placeholders of a compiled plan
+            deadline: Maximum duration of the execution, in seconds
+            cancel_token: Token cancelling the execution when cancelled
+
+        Returns:
+            An iterator of `(request_id, result)` pairs, where each result is a
+            dictionary with the `success`, `response` and `error` keys
+        """
+        token : SCV2CancellationToken = None
+        if deadline is not None or cancel_token is not None:
+            token = SCV2CancellationToken(timeout=deadline, parent=cancel_token)
+
+        results : Iterator[Tuple[str, dict]] = self.__iter_results(batch, params, token)
+
+        if self.__sc_session.metrics is not None:
+            results = self.__observed_results(results)
+
+        return results
+
+    @staticmethod
+    def __build_graph(entries : List[dict]) -> Generator[Tuple[str, dict], None, Tuple[List[dict], Dict[str, List[dict]]]]:
+        # Splits the entries of a batch into independent and dependent requests,
+        # yielding the failed results of the dependents whose parent is missing
+        known_ids : set = { entry['_id'] for entry in entries }
+        roots : List[dict] = [ ]
+        children : Dict[str, List[dict]] = { }
+
+        for entry in entries:
+            if entry.get('is_dependent'):
+                children.setdefault(entry['depends_on'], []).append(entry)
+            else:
+                roots.append(entry)
+
+        # Dependents whose parent is no longer part of the batch can never run
+        for parent_id in [p for p in children if p not in known_ids]:
+            for child in children.pop(parent_id):
+                yield child['_id'], SCV2BatchExecutor.__make_result(
+                    error=SCV2RequestError(f"Parent request '{parent_id}' not found")
+                )
+
+        return roots, children
+
+    def __iter_results(self, batch : Union[SCV2ClientBatchRequest, SCV2BatchPlan], params : Dict[str, Any] = None, token : SCV2CancellationToken = None) -> Iterator[Tuple[str, dict]]:
+        # Independent requests, and dependent requests indexed by the ID of the request they wait for.
+        # A compiled plan comes with its graph already validated and sorted by priority.
+        if isinstance(batch, SCV2BatchPlan):
+            roots, children = batch.bind_graph(params)
+        else:
+            roots, children = yield from SCV2BatchExecutor.__build_graph(batch.get_requests())
+
+        # Merged reads may lose the ETags that the store would record
+        if self.__sc_merge_gets and self.__sc_session.etag_store is None:
+            roots = merge_resource_gets(roots)
+
+        # Ready requests, ordered by descending priority and insertion order,
+        # with the time they became ready
+        sequence = itertools.count()
+        queued_at : float = time.perf_counter()
+        ready : list = [(-entry['_priority'], next(sequence), entry, None, queued_at) for entry in roots]
+        heapq.heapify(ready)
+
+        in_flight : Dict[Future, List[dict]] = { }
+
+        # In flight GET calls, by request key
+        in_flight_gets : Dict[Hashable, Future] = { }
+
+        # Progress of the fanned out requests, by ID of the dependent request which created them
+        fan_outs : Dict[str, dict] = { }
+
+        with ThreadPoolExecutor(max_workers=self.__sc_max_workers, thread_name_prefix='scv2-batch') as pool:
+            while ready or in_flight:
+
+                cancelled : bool = token is not None and token.cancelled
+
+                # Keep the pool saturated with the highest priority requests.
+                # Once cancelled, all the ready requests are dropped at once.
+                while ready and (cancelled or len(in_flight) < self.__sc_max_workers):
+                    _, _, entry, parent_response, queued_at = heapq.heappop(ready)
+
+                    if cancelled:
+                        # Completed right away, without taking a worker
+                        future = Future()
+                        future.set_exception(SCV2BatchExecutor.__cancelled(entry, token))
+                        in_flight[future] = [entry]
+                        continue
+
+                    key = SCV2BatchExecutor.__get_key(entry)
+
+                    # Duplicates of an in flight GET wait for its response, without taking a worker
+                    if key is not None and key in in_flight_gets:
+                        in_flight[in_flight_gets[key]].append(entry)
+                        continue
+
+                    future = pool.submit(self.__run_entry, entry, parent_response, queued_at, token)
+                    in_flight[future] = [entry]
+
+                    if key is not None:
+                        in_flight_gets[key] = future
+
+                # Queued requests are dropped as soon as the token is cancelled,
+                # instead of when one of the calls in flight returns
+                poll : Optional[float] = None
+                if token is not None and ready and not cancelled:
+                    remaining : Optional[float] = token.remaining()
+                    poll = _CANCEL_POLL_INTERVAL if remaining is None else max(0.0, min(remaining, _CANCEL_POLL_INTERVAL))
+
+                done, _ = wait(in_flight, timeout=poll, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    completed = in_flight.pop(future)
+
+                    key = SCV2BatchExecutor.__get_key(completed[0])
+                    if key is not None and in_flight_gets.get(key) is future:
+                        del in_flight_gets[key]
+
+                    pending : List[Tuple[str, dict]] = [ ]
+
+                    try:
+                        outcome = future.result()
+                        result = None if isinstance(outcome, _FanOut) else SCV2BatchExecutor.__make_result(response=outcome)
+                    except Exception as e:
+                        outcome, result = None, SCV2BatchExecutor.__make_result(error=e)
+
+                    if isinstance(outcome, _FanOut):
+                        # Scheduling the requests returned by the transform function
+                        entry = completed[0]
+                        fan_outs[entry['_id']] = { 'responses': [None] * len(outcome.requests), 'remaining': len(outcome.requests), 'failed': 0 }
+
+                        for index, request in enumerate(outcome.requests):
+                            heapq.heappush(ready, (-entry['_priority'], next(sequence), {
+                                '_id': f"{entry['_id']}[{index}]",
+                                '_priority': entry['_priority'],
+                                '_fan_out_of': entry['_id'],
+                                '_fan_out_index': index,
+                                '_request': request
+                            }, None, time.perf_counter()))
+
+                        if not outcome.requests:
+                            pending.append((entry['_id'], SCV2BatchExecutor.__fan_out_result(entry['_id'], fan_outs.pop(entry['_id']))))
+
+                        completed = [ ]
+
+                    for entry in completed:
+                        if '_fan_out_of' in entry:
+                            pending.append((entry['_id'], result))
+
+                            parent_id : str = entry['_fan_out_of']
+                            fan_out : dict = fan_outs[parent_id]
+                            fan_out['responses'][entry['_fan_out_index']] = result['response']
+                            fan_out['failed'] += 0 if result['success'] else 1
+                            fan_out['remaining'] -= 1
+
+                            if fan_out['remaining'] == 0:
+                                pending.append((parent_id, SCV2BatchExecutor.__fan_out_result(parent_id, fan_outs.pop(parent_id))))
+                            continue
+
+                        if '_members' not in entry:
+                            pending.append((entry['_id'], result))
+                            continue
+
+                        # Splitting a merged GET back into the results of the requests it replaced
+                        responses : Dict[str, object] = { }
+                        if result['success']:
+                            try:
+                                responses = split_merged_response(entry, result['response'])
+                            except Exception:
+                                responses = { }
+
+                        for member in entry['_members']:
+                            if responses.get(member['_id']) is not None:
+                                pending.append((member['_id'], SCV2BatchExecutor.__make_result(response=responses[member['_id']])))
+                            else:
+                                heapq.heappush(ready, (-member['_priority'], next(sequence), member, None, time.perf_counter()))
+
+                    for request_id, request_result in pending:
+                        yield request_id, request_result
+
+                    # Releasing the dependents of the completed requests.
+                    # If the parent failed, its dependents (and theirs) are failed as well.
+                    while pending:
+                        parent_id, parent_result = pending.pop()
+                        for child in children.pop(parent_id, []):
+                            if parent_result['success']:
+                                heapq.heappush(ready, (-child['_priority'], next(sequence), child, parent_result['response'], time.perf_counter()))
+                                continue
+
+                            # Dependents of a cancelled request are cancelled as well
+                            if isinstance(parent_result['error'], SCV2CancelledError):
+                                error = SCV2CancelledError(f"Parent request '{parent_id}' was cancelled")
+                            else:
+                                error = SCV2RequestError(f"Parent request '{parent_id}' did not succeed")
+
+                            child_result = SCV2BatchExecutor.__make_result(error=error)
+                            pending.append((child['_id'], child_result))
+                            yield child['_id'], child_result
+
+    def __observed_results(self, results : Iterator[Tuple[str, dict]]) -> Iterator[Tuple[str, dict]]:
+        # Records the duration and outcome of the batch in the metrics of the session
+        metrics : SCV2Metrics = self.__sc_session.metrics
+        started : float = time.perf_counter()
+        succeeded, failed = 0, 0
+
+        try:
+            for request_id, result in results:
+                if result['success']:
+                    succeeded += 1
+                else:
+                    failed += 1
+                yield request_id, result
+        finally:
+            metrics.observe_batch(time.perf_counter() - started, succeeded, failed)
+
+    def execute(self,
+                batch : Union[SCV2ClientBatchRequest, SCV2BatchPlan],
+                on_result : Callable[[str, dict], None] = None,
+                params : Dict[str, Any] = None,
+                deadline : float = None,
+                cancel_token : SCV2CancellationToken = None) -> Dict[str, dict]:
+        """
+        Execute the batch and collect all the results.
+
+        Args:
+            batch: The batch, or compiled plan, to execute
+            params: The values bound to the placeholders of a compiled plan
+            on_result: Optional function called with `(request_id, result)`
+                       as soon as each request completes
+            deadline: Maximum duration of the execution, in seconds
+            cancel_token: Token cancelling the execution when cancelled
+
+        Returns:
+            Dictionary mapping each request ID to its result. Requests dropped
+            by a cancellation have a SCV2CancelledError as `error`.
+        """
+        results : Dict[str, dict] = { }
+
+        for request_id, result in self.iter_results(batch, params, deadline=deadline, cancel_token=cancel_token):
+            if on_result is not None:
+                on_result(request_id, result)
+            results[request_id] = result
+
+        return results
@@ -0,0 +1,226 @@
+import csv
+import json
+import os
+import queue
+import threading
+
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Optional
+
+from scv2py.services import SCV2Service, SCV2BaseEndpoint
+
+from scv2py.core.records import record_type
+from scv2py.core.decode_pool import SCV2DecodePool
+
+# Supported output formats
+EXPORT_FORMATS : tuple = ('ndjson', 'csv')
+
+# Marks the end of the fetched data in the hand-off queue
+_END = object()
+
+class _FetchError:
+    # Carries an exception raised by the fetch stage to the write stage
+    def __init__(self, error : BaseException) -> None:
+        self.error = error
+
+class _RotatingWriter:
+    # Writes rows to one or more files, starting a new file every `rows_per_file` rows.
+
+    def __init__(self, path : str, file_format : str, columns : Optional[List[str]], rows_per_file : Optional[int], buffer_size : int) -> None:
+        self.__path = path
+        self.__format = file_format
+        self.__columns = columns
+        self.__rows_per_file = rows_per_file
+        self.__buffer_size = buffer_size
+        self.__projection = record_type(columns) if columns else None
+
+        self.__file = None
+        self.__csv_writer = None
+        self.__file_rows : int = 0
+
+        self.files : List[str] = [ ]
+        self.rows : int = 0
+
+    def __file_path(self, index : int) -> str:
+        if '{index' in self.__path:
+            return self.__path.format(index=index)
+
+        if self.__rows_per_file is None:
+            return self.__path
+
+        root, extension = os.path.splitext(self.__path)
+        return f'{root}-{index:05d}{extension}'
+
+    def __open_next(self, first_row : Dict[str, Any]) -> None:
+        self.close()
+
+        path : str = self.__file_path(len(self.files))
+        self.__file = open(path, 'w', encoding='utf-8', newline='', buffering=self.__buffer_size)
+        self.__file_rows = 0
+        self.files.append(path)
+
+        if self.__format == 'csv':
+            # Without a projection, the columns are the fields of the first exported entity
+            if self.__columns is None:
+                self.__columns = list(first_row.keys())
+
+            self.__csv_writer = csv.writer(self.__file)
+            self.__csv_writer.writerow(self.__columns)
+
+    def __csv_values(self, row : Dict[str, Any]) -> List[Any]:
+        # Selected columns may be nested paths (e.g. adminData/updatedOn)
+        if self.__projection is not None:
+            values = list(self.__projection.from_entity(row))
+        else:
+            values = [row.get(column) for column in self.__columns]
+
+        # Nested structures are kept as JSON
+        return [json.dumps(value, ensure_ascii=False) if isinstance(value, (dict, list)) else value for value in values]
+
+    def write(self, row : Dict[str, Any]) -> None:
+        if self.__file is None or (self.__rows_per_file is not None and self.__file_rows >= self.__rows_per_file):
+            self.__open_next(row)
+
+        if self.__format == 'csv':
+            self.__csv_writer.writerow(self.__csv_values(row))
+        else:
+            self.__file.write(json.dumps(row, ensure_ascii=False, separators=(',', ':')))
+            self.__file.write('\n')
+
+        self.__file_rows += 1
+        self.rows += 1
+
+    def finish(self) -> None:
+        # Empty collections still produce one (empty) file
+        if not self.files:
+            self.__open_next({ })
+
+        self.close()
+
+    def close(self) -> None:
+        if self.__file is not None:
+            self.__file.close()
+            self.__file = None
+            self.__csv_writer = None
+
+def export_collection(session : "SCV2Session",
+                      service : SCV2Service,
+                      endpoint : SCV2BaseEndpoint,
+                      path : str,
+                      file_format : str = 'ndjson',
+                      filter : str = None,
+                      select : str = None,
+                      orderby : str = None,
+                      search : str = None,
+                      exclude : str = None,
+                      page_size : int = 1000,
+                      rows_per_file : int = None,
+                      buffer_size : int = 1024 * 1024,
+                      queue_size : int = 4,
+                      stream : bool = False,
+                      decode_pool : SCV2DecodePool = None) -> Dict[str, Any]:
+    """
+    Export a whole collection to NDJSON or CSV files with bounded memory.
+
+    The collection is paginated by a fetch thread, which hands pages over to
+    the write stage (running in the calling thread) through a bounded queue:
+    network and disk work at the same time, and at most `queue_size` pages
+    are held in memory.
+
+    Args:
+        session: The session used to read the collection
+        service: The service to read from
+        endpoint: The collection endpoint to export
+        path: Output file path. With `rows_per_file`, it can contain an `{index}`
+              placeholder (e.g. `leads-{index:03d}.ndjson`), otherwise a
+              `-00000` style suffix is added before the extension.
+        file_format: Either `ndjson` or `csv`
+        filter, select, orderby, search, exclude: OData query options, as in `SCV2Session.get`.
+              For CSV exports, `select` also defines the columns.
+        page_size: Number of entities requested per page
+        rows_per_file: Start a new file every this many rows. `None` writes a single file.
+        buffer_size: Size of the write buffer of each file, in bytes
+        queue_size: Maximum number of fetched pages waiting to be written
+        stream: Whether to decode the pages incrementally from the socket
+        decode_pool: Process pool decoding the pages instead of the fetch thread,
+                     with one page request in flight per worker process. Not
+                     supported with `stream`. Its `transform` must return
+                     dictionaries for CSV exports.
+
+    Returns:
+        Dictionary with the number of exported `rows` and the list of written `files`
+    """
+    if file_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format '{file_format}', expected one of: {', '.join(EXPORT_FORMATS)}")
+
+    if rows_per_file is not None and rows_per_file <= 0:
+        raise ValueError("Rows per file must be a positive integer")
+
+    if queue_size <= 0:
+        raise ValueError("Queue size must be a positive integer")
+
+    columns : Optional[List[str]] = [field.strip() for field in select.split(',') if field.strip()] if select else None
+
+    pages : queue.Queue = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+
+    def hand_over(item : Any) -> bool:
+        # Waits for room in the queue, unless the write stage gave up
+        while not stop.is_set():
+            try:
+                pages.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def fetch() -> None:
+        try:
+            entities : Iterator[Any] = session.iter_collection(
+                service=service,
+                endpoint=endpoint,
+                filter=filter,
+                select=select,
+                orderby=orderby,
+                search=search,
+                exclude=exclude,
+                page_size=page_size,
+                prefetch=False,
+                stream=stream,
+                decode_pool=decode_pool
+            )
+
+            while True:
+                page : list = list(islice(entities, page_size))
+                if not page or not hand_over(page):
+                    break
+
+            hand_over(_END)
+        except BaseException as e:
+            hand_over(_FetchError(e))
+
+    fetcher = threading.Thread(target=fetch, name='scv2-export-fetch', daemon=True)
+    fetcher.start()
+
+    writer = _RotatingWriter(path=path, file_format=file_format, columns=columns, rows_per_file=rows_per_file, buffer_size=buffer_size)
+
+    try:
+        while True:
+            page = pages.get()
+
+            if page is _END:
+                break
+
+            if isinstance(page, _FetchError):
+                raise page.error
+
+            for row in page:
+                writer.write(row)
+
+        writer.finish()
+    finally:
+        stop.set()
+        writer.close()
+        fetcher.join()
+
+    return { 'rows': writer.rows, 'files': writer.files }
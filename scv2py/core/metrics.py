@@ -0,0 +1,236 @@
+import bisect
+import threading
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from scv2py.services import SCV2Service, SCV2BaseEndpoint
+
+# Upper bounds of the latency histogram buckets, in seconds
+DEFAULT_BUCKETS : Tuple[float, ...] = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+class _Histogram:
+    # Per bucket (non cumulative) counts, plus the sum and count of the observations
+    __slots__ = ('counts', 'sum', 'count')
+
+    def __init__(self, size : int) -> None:
+        self.counts : List[int] = [0] * (size + 1)
+        self.sum : float = 0.0
+        self.count : int = 0
+
+    def observe(self, bounds : Tuple[float, ...], value : float) -> None:
+        self.counts[bisect.bisect_left(bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+def _escape(value : str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def _labels(names : Tuple[str, ...], values : Tuple, extra : str = '') -> str:
+    labels : List[str] = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        labels.append(extra)
+    return '{' + ','.join(labels) + '}' if labels else ''
+
+def _format_value(value : float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class SCV2Metrics:
+    """
+    In-process registry of call metrics, used by the sessions when passed as `sc_metrics`.
+
+    Every attempt sent to the tenant is recorded per service, endpoint and HTTP
+    method: a latency histogram, the number of calls by status code, the bytes
+    sent and received, the retries and the transport errors. Batch executions
+    record their duration and the number of succeeded and failed requests.
+
+    The metrics can be read as a dictionary with `snapshot`, or exported in
+    the Prometheus text format with `to_prometheus`.
+
+    Example:
+        metrics = SCV2Metrics()
+        session = SCV2Session(..., sc_metrics=metrics)
+        ...
+        print(metrics.to_prometheus())
+    """
+
+    # Upper bounds of the latency histogram buckets, in seconds
+    __buckets : Tuple[float, ...]
+
+    def __init__(self, buckets : Iterable[float] = DEFAULT_BUCKETS) -> None:
+        buckets = tuple(sorted(float(bucket) for bucket in buckets))
+
+        if not buckets or buckets[0] <= 0:
+            raise ValueError("Buckets must be positive numbers")
+
+        self.__buckets = buckets
+        self.__lock = threading.Lock()
+        self.reset()
+
+    @staticmethod
+    def __call_labels(service : SCV2Service, endpoint : SCV2BaseEndpoint, http_method : str) -> Tuple[str, str, str]:
+        return (getattr(service, 'value', service), getattr(endpoint, 'value', endpoint), http_method.upper())
+
+    def reset(self) -> None:
+        """
+        Clear all the recorded metrics.
+        """
+        with self.__lock:
+            self.__latency : Dict[Tuple, _Histogram] = { }
+            self.__statuses : Dict[Tuple, int] = { }
+            self.__errors : Dict[Tuple, int] = { }
+            self.__retries : Dict[Tuple, int] = { }
+            self.__request_bytes : Dict[Tuple, int] = { }
+            self.__response_bytes : Dict[Tuple, int] = { }
+            self.__batch_latency : _Histogram = _Histogram(len(self.__buckets))
+            self.__batch_requests : Dict[str, int] = { 'success': 0, 'failure': 0 }
+
+    def observe_response(self,
+                         service : SCV2Service,
+                         endpoint : SCV2BaseEndpoint,
+                         http_method : str,
+                         status_code : int,
+                         duration : float,
+                         request_bytes : int = 0,
+                         response_bytes : int = 0) -> None:
+        """
+        Record an attempt which received a response.
+        """
+        labels = SCV2Metrics.__call_labels(service, endpoint, http_method)
+
+        with self.__lock:
+            histogram : Optional[_Histogram] = self.__latency.get(labels)
+            if histogram is None:
+                histogram = self.__latency[labels] = _Histogram(len(self.__buckets))
+            histogram.observe(self.__buckets, duration)
+
+            status_labels = labels + (str(status_code),)
+            self.__statuses[status_labels] = self.__statuses.get(status_labels, 0) + 1
+            self.__request_bytes[labels] = self.__request_bytes.get(labels, 0) + request_bytes
+            self.__response_bytes[labels] = self.__response_bytes.get(labels, 0) + response_bytes
+
+    def observe_error(self,
+                      service : SCV2Service,
+                      endpoint : SCV2BaseEndpoint,
+                      http_method : str,
+                      error : BaseException,
+                      duration : float) -> None:
+        """
+        Record an attempt which failed without a response (connection error, timeout, ...).
+        """
+        labels = SCV2Metrics.__call_labels(service, endpoint, http_method)
+
+        with self.__lock:
+            histogram : Optional[_Histogram] = self.__latency.get(labels)
+            if histogram is None:
+                histogram = self.__latency[labels] = _Histogram(len(self.__buckets))
+            histogram.observe(self.__buckets, duration)
+
+            error_labels = labels + (type(error).__name__,)
+            self.__errors[error_labels] = self.__errors.get(error_labels, 0) + 1
+
+    def observe_retry(self, service : SCV2Service, endpoint : SCV2BaseEndpoint, http_method : str) -> None:
+        """
+        Record a retried attempt.
+        """
+        labels = SCV2Metrics.__call_labels(service, endpoint, http_method)
+
+        with self.__lock:
+            self.__retries[labels] = self.__retries.get(labels, 0) + 1
+
+    def observe_batch(self, duration : float, succeeded : int, failed : int) -> None:
+        """
+        Record a batch execution.
+        """
+        with self.__lock:
+            self.__batch_latency.observe(self.__buckets, duration)
+            self.__batch_requests['success'] += succeeded
+            self.__batch_requests['failure'] += failed
+
+    def snapshot(self) -> dict:
+        """
+        Get a copy of the recorded metrics.
+
+        Returns:
+            Dictionary with a `calls` list (one item per service, endpoint and
+            method) and a `batches` summary
+        """
+        with self.__lock:
+            calls : List[dict] = [ ]
+
+            for labels in sorted(set(self.__latency) | set(self.__retries)):
+                histogram : Optional[_Histogram] = self.__latency.get(labels)
+                calls.append({
+                    'service': labels[0],
+                    'endpoint': labels[1],
+                    'method': labels[2],
+                    'count': histogram.count if histogram else 0,
+                    'duration_sum': histogram.sum if histogram else 0.0,
+                    'buckets': dict(zip(self.__buckets + (float('inf'),), histogram.counts)) if histogram else { },
+                    'statuses': { key[3]: value for key, value in self.__statuses.items() if key[:3] == labels },
+                    'errors': { key[3]: value for key, value in self.__errors.items() if key[:3] == labels },
+                    'retries': self.__retries.get(labels, 0),
+                    'request_bytes': self.__request_bytes.get(labels, 0),
+                    'response_bytes': self.__response_bytes.get(labels, 0)
+                })
+
+            return {
+                'calls': calls,
+                'batches': {
+                    'count': self.__batch_latency.count,
+                    'duration_sum': self.__batch_latency.sum,
+                    'requests': dict(self.__batch_requests)
+                }
+            }
+
+    def __histogram_lines(self, name : str, names : Tuple[str, ...], values : Tuple, histogram : _Histogram) -> List[str]:
+        lines : List[str] = [ ]
+        cumulative : int = 0
+
+        for bound, count in zip(self.__buckets + (float('inf'),), histogram.counts):
+            cumulative += count
+            le : str = '+Inf' if bound == float('inf') else _format_value(bound)
+            lines.append(f'{name}_bucket{_labels(names, values, "le=" + chr(34) + le + chr(34))} {cumulative}')
+
+        lines.append(f'{name}_sum{_labels(names, values)} {_format_value(histogram.sum)}')
+        lines.append(f'{name}_count{_labels(names, values)} {histogram.count}')
+
+        return lines
+
+    def to_prometheus(self) -> str:
+        """
+        Export the metrics in the Prometheus text exposition format.
+        """
+        call_names : Tuple[str, ...] = ('service', 'endpoint', 'method')
+
+        with self.__lock:
+            lines : List[str] = [ ]
+
+            lines.append('# HELP scv2_request_duration_seconds Duration of the calls to the tenant, per attempt.')
+            lines.append('# TYPE scv2_request_duration_seconds histogram')
+            for labels, histogram in sorted(self.__latency.items()):
+                lines.extend(self.__histogram_lines('scv2_request_duration_seconds', call_names, labels, histogram))
+
+            counters : Tuple[Tuple[str, str, Tuple[str, ...], Dict[Tuple, int]], ...] = (
+                ('scv2_responses_total', 'Responses received, by status code.', call_names + ('status',), self.__statuses),
+                ('scv2_request_errors_total', 'Attempts failed without a response, by error type.', call_names + ('error',), self.__errors),
+                ('scv2_retries_total', 'Retried attempts.', call_names, self.__retries),
+                ('scv2_request_bytes_total', 'Bytes sent in request bodies.', call_names, self.__request_bytes),
+                ('scv2_response_bytes_total', 'Bytes received in response bodies.', call_names, self.__response_bytes)
+            )
+
+            for name, description, names, values in counters:
+                lines.append(f'# HELP {name} {description}')
+                lines.append(f'# TYPE {name} counter')
+                for labels, value in sorted(values.items()):
+                    lines.append(f'{name}{_labels(names, labels)} {value}')
+
+            lines.append('# HELP scv2_batch_duration_seconds Duration of the batch executions.')
+            lines.append('# TYPE scv2_batch_duration_seconds histogram')
+            lines.extend(self.__histogram_lines('scv2_batch_duration_seconds', (), (), self.__batch_latency))
+
+            lines.append('# HELP scv2_batch_requests_total Requests completed by batch executions, by outcome.')
+            lines.append('# TYPE scv2_batch_requests_total counter')
+            for outcome, value in self.__batch_requests.items():
+                lines.append(f'scv2_batch_requests_total{_labels(("outcome",), (outcome,))} {value}')
+
+            return '\n'.join(lines) + '\n'
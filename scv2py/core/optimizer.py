@@ -0,0 +1,179 @@
+import json
+
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import quote_plus
+
+import requests
+
+from requests.structures import CaseInsensitiveDict
+
+from scv2py.core.response import read_records
+
+# Default maximum length of a merged `$filter`, once URL encoded.
+# Keeps the request line well below the usual 8 KB limit of gateways.
+MAX_FILTER_LENGTH : int = 4000
+
+# Default maximum number of resource IDs read by a merged GET
+MAX_IDS_PER_QUERY : int = 100
+
+def _id_condition(key_field : str, resource_id : Any) -> str:
+    # OData string literals escape single quotes by doubling them
+    if isinstance(resource_id, str):
+        return f"{key_field} eq '{resource_id.replace(chr(39), chr(39) * 2)}'"
+    return f'{key_field} eq {resource_id}'
+
+def _normalize_id(resource_id : Any) -> Any:
+    return resource_id.lower() if isinstance(resource_id, str) else resource_id
+
+def _is_mergeable(entry : dict) -> bool:
+    # Single entity reads (GET by resource id, without custom headers)
+    return (not entry.get('is_dependent')
+            and (entry.get('http_method') or '').upper() == 'GET'
+            and entry.get('sc_resource_id') not in (None, '')
+            and not entry.get('sc_headers'))
+
+def merge_resource_gets(entries : List[dict],
+                        key_field : str = 'id',
+                        max_filter_length : int = MAX_FILTER_LENGTH,
+                        max_ids : int = MAX_IDS_PER_QUERY,
+                        min_group_size : int = 2) -> List[dict]:
+    """
+    Rewrite the single entity GET entries of a batch into collection GETs.
+
+    Entries reading different resource IDs of the same service and endpoint are
+    grouped into GETs filtering on `id eq '...' or id eq '...'`, chunked so that
+    the encoded filter stays below `max_filter_length` characters. Each merged
+    entry lists the entries it replaces under `_members`. Other entries, and
+    groups smaller than `min_group_size`, are returned unchanged.
+
+    Args:
+        entries: The entries of a SCV2ClientBatchRequest
+        key_field: The key property of the entities
+        max_filter_length: Maximum length of the URL encoded `$filter` of a merged GET
+        max_ids: Maximum number of resource IDs read by a merged GET
+        min_group_size: Minimum number of entries worth merging
+
+    Returns:
+        The rewritten list of entries
+    """
+    groups : Dict[Tuple[Any, Any], List[dict]] = { }
+
+    for entry in entries:
+        if _is_mergeable(entry):
+            groups.setdefault((entry['sc_service'], entry['sc_endpoint']), []).append(entry)
+
+    merged_ids : set = set()
+    merged_entries : List[dict] = [ ]
+
+    for (service, endpoint), members in groups.items():
+        # The same resource may be read by several entries
+        resource_ids : List[Any] = list(dict.fromkeys(entry['sc_resource_id'] for entry in members))
+
+        if len(resource_ids) < min_group_size:
+            continue
+
+        chunks : List[List[Any]] = [ ]
+        chunk : List[Any] = [ ]
+        length : int = 0
+
+        for resource_id in resource_ids:
+            # Each condition is joined with ' or ' (4 characters once encoded)
+            condition_length : int = len(quote_plus(_id_condition(key_field, resource_id))) + 4
+
+            if chunk and (length + condition_length > max_filter_length or len(chunk) >= max_ids):
+                chunks.append(chunk)
+                chunk, length = [ ], 0
+
+            chunk.append(resource_id)
+            length += condition_length
+
+        chunks.append(chunk)
+
+        for chunk in chunks:
+            # Chunks of a single resource are left as they are
+            if len(chunk) < min_group_size:
+                continue
+
+            chunk_ids : set = set(chunk)
+            chunk_members : List[dict] = [entry for entry in members if entry['sc_resource_id'] in chunk_ids]
+
+            merged_entries.append({
+                '_id': f"__merged-{chunk_members[0]['_id']}",
+                '_priority': max(entry['_priority'] for entry in chunk_members),
+                '_members': chunk_members,
+                'http_method': 'GET',
+                'sc_service': service,
+                'sc_endpoint': endpoint,
+                'sc_resource_id': None,
+                'sc_params': {
+                    '$filter': ' or '.join(_id_condition(key_field, resource_id) for resource_id in chunk),
+                    '$top': len(chunk)
+                },
+                'sc_payload': None,
+                'sc_headers': { }
+            })
+
+            merged_ids.update(id(entry) for entry in chunk_members)
+
+    if not merged_entries:
+        return entries
+
+    # Merged GETs take the place of the first entry they replace
+    rewritten : List[dict] = [ ]
+    pending : Dict[int, dict] = { id(merged['_members'][0]): merged for merged in merged_entries }
+
+    for entry in entries:
+        if id(entry) in pending:
+            rewritten.append(pending[id(entry)])
+        elif id(entry) not in merged_ids:
+            rewritten.append(entry)
+
+    return rewritten
+
+def _entity_response(source : requests.Response, entity : Any) -> requests.Response:
+    # Builds the response a single entity GET would have returned
+    response = requests.Response()
+    response.status_code = 200
+    response.reason = 'OK'
+    response.url = source.url
+    response.request = source.request
+    response.elapsed = source.elapsed
+    response.encoding = 'utf-8'
+    response.headers = CaseInsensitiveDict({ 'Content-Type': 'application/json' })
+
+    # Collection entities only carry their ETag as an annotation
+    if isinstance(entity, dict) and entity.get('@odata.etag'):
+        response.headers['ETag'] = entity['@odata.etag']
+    response._content = json.dumps({ 'value': entity }, ensure_ascii=False).encode('utf-8')
+    return response
+
+def split_merged_response(merged : dict, response : requests.Response, key_field : str = 'id') -> Dict[str, Optional[requests.Response]]:
+    """
+    Split the response of a merged GET into one response per replaced entry.
+
+    The `ETag` header of the split responses is taken from the `@odata.etag`
+    annotation of the entities; without it, the responses have no ETag.
+
+    Args:
+        merged: A merged entry created by `merge_resource_gets`
+        response: The response of the merged GET
+        key_field: The key property of the entities
+
+    Returns:
+        Dictionary mapping the ID of each replaced entry to the response of its
+        entity, or to `None` if the entity was not part of the collection
+    """
+    entities : Dict[Any, Any] = { }
+
+    # IDs are compared case insensitively, as the tenant may normalize UUIDs
+    for entity in read_records(response):
+        if isinstance(entity, dict) and key_field in entity:
+            entities[_normalize_id(entity[key_field])] = entity
+
+    responses : Dict[str, Optional[requests.Response]] = { }
+
+    for entry in merged['_members']:
+        entity = entities.get(_normalize_id(entry['sc_resource_id']))
+        responses[entry['_id']] = None if entity is None else _entity_response(response, entity)
+
+    return responses
@@ -0,0 +1,224 @@
+import copy
+import re
+
+from typing import Any, Dict, FrozenSet, List, Tuple
+
+# Placeholders bound when a plan is executed, e.g. "accountId eq '{account_id}'".
+# As in str.format, '{{' and '}}' stand for literal braces.
+_PLACEHOLDER = re.compile(r'\{\{|\}\}|\{([A-Za-z_][A-Za-z0-9_]*)\}')
+
+# Request fields which may contain placeholders
+_BOUND_FIELDS : Tuple[str, ...] = ('sc_resource_id', 'sc_params', 'sc_payload', 'sc_headers')
+
+def _tokens(value : Any) -> set:
+    # Placeholder names found in a (possibly nested) value, with '' standing for escaped braces
+    if isinstance(value, str):
+        return set(_PLACEHOLDER.findall(value))
+
+    tokens : set = set()
+
+    if isinstance(value, dict):
+        for item in value.values():
+            tokens |= _tokens(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            tokens |= _tokens(item)
+
+    return tokens
+
+def _bind(value : Any, params : Dict[str, Any]) -> Any:
+    if isinstance(value, str):
+        # Strings without placeholders nor escaped braces are kept as they are
+        if _PLACEHOLDER.search(value) is None:
+            return value
+
+        # A value made of a single placeholder takes the bound value as is (e.g. an integer)
+        match = _PLACEHOLDER.fullmatch(value)
+        if match is not None and match.group(1):
+            return params[match.group(1)]
+
+        return _PLACEHOLDER.sub(lambda m: str(params[m.group(1)]) if m.group(1) else m.group(0)[0], value)
+
+    if isinstance(value, dict):
+        return { key: _bind(item, params) for key, item in value.items() }
+
+    if isinstance(value, list):
+        return [_bind(item, params) for item in value]
+
+    if isinstance(value, tuple):
+        return tuple(_bind(item, params) for item in value)
+
+    return value
+
+class SCV2BatchPlan:
+    """
+    A validated, immutable batch, executed any number of times.
+
+    The dependency graph is checked once, when the plan is compiled: missing
+    parents and cycles raise a ValueError, and the requests are sorted into
+    topological levels (level 0 holds the independent requests, level N the
+    requests depending on level N-1).
+
+    String values of the requests (resource IDs, query parameters, payloads,
+    headers) may contain `{name}` placeholders, bound on every run. As in
+    str.format, `{{` and `}}` stand for literal braces in all the strings.
+    Requests without placeholders nor escaped braces are shared by all the
+    runs instead of being copied.
+
+    The dependency graph is kept as well (the independent requests, sorted by
+    descending priority, and the dependents of each request), so that the
+    executor schedules a plan without scanning its requests on every run.
+
+    Plans are created with `SCV2ClientBatchRequest.compile()`.
+
+    Example:
+        plan = batch.compile()
+        for account_id in account_ids:
+            results = session.execute_batch(plan, params={'account_id': account_id})
+    """
+
+    # Request entries, in insertion order
+    __entries : Tuple[dict, ...]
+
+    # Indexes of the entries containing placeholders or escaped braces, with the placeholder names
+    __templates : Dict[int, FrozenSet[str]]
+
+    # Indexes of the independent entries, by descending priority and insertion order
+    __roots : Tuple[int, ...]
+
+    # Indexes of the dependent entries, by ID of their parent request
+    __children : Dict[str, Tuple[int, ...]]
+
+    # Names of all the placeholders
+    __parameters : FrozenSet[str]
+
+    # Request IDs, by topological level
+    __levels : Tuple[Tuple[str, ...], ...]
+
+    def __init__(self, entries : List[dict]) -> None:
+        # The plan must not change when the source batch does
+        entries = [copy.deepcopy(entry) for entry in entries]
+
+        ids : Dict[str, dict] = { }
+        for entry in entries:
+            if entry['_id'] in ids:
+                raise ValueError(f"Request ID '{entry['_id']}' is already in use")
+            ids[entry['_id']] = entry
+
+        # Kahn's algorithm: each pass takes the requests whose parent is in a previous level
+        children : Dict[str, List[int]] = { }
+        for index, entry in enumerate(entries):
+            if entry.get('is_dependent'):
+                if entry['depends_on'] not in ids:
+                    raise ValueError(f"Parent request '{entry['depends_on']}' of request '{entry['_id']}' not found")
+                children.setdefault(entry['depends_on'], []).append(index)
+
+        roots : List[int] = sorted(
+            (index for index, entry in enumerate(entries) if not entry.get('is_dependent')),
+            key=lambda index: -entries[index]['_priority']
+        )
+
+        levels : List[Tuple[str, ...]] = [ ]
+        level : List[int] = [index for index, entry in enumerate(entries) if not entry.get('is_dependent')]
+        placed : int = 0
+
+        while level:
+            levels.append(tuple(entries[index]['_id'] for index in level))
+            placed += len(level)
+            level = [child for parent in level for child in children.get(entries[parent]['_id'], [])]
+
+        if placed != len(entries):
+            cyclic : List[str] = sorted(str(request_id) for request_id in ids if not any(request_id in lvl for lvl in levels))
+            raise ValueError(f"Circular dependency between requests: {', '.join(cyclic)}")
+
+        templates : Dict[int, FrozenSet[str]] = { }
+        for index, entry in enumerate(entries):
+            tokens : set = set()
+            for field in _BOUND_FIELDS:
+                tokens |= _tokens(entry.get(field))
+            if tokens:
+                templates[index] = frozenset(tokens - { '' })
+
+        self.__entries = tuple(entries)
+        self.__templates = templates
+        self.__parameters = frozenset().union(*templates.values())
+        self.__levels = tuple(levels)
+        self.__roots = tuple(roots)
+        self.__children = { parent: tuple(indexes) for parent, indexes in children.items() }
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    @property
+    def levels(self) -> Tuple[Tuple[str, ...], ...]:
+        """
+        Request IDs grouped by topological level.
+        """
+        return self.__levels
+
+    @property
+    def parameters(self) -> FrozenSet[str]:
+        """
+        Names of the placeholders to bind when executing the plan.
+        """
+        return self.__parameters
+
+    def bind(self, params : Dict[str, Any] = None) -> List[dict]:
+        """
+        Get the request entries of the plan, with their placeholders bound.
+
+        Args:
+            params: The values of the placeholders
+
+        Returns:
+            The request entries, ready to be executed
+
+        Raises:
+            ValueError: If a placeholder has no value
+        """
+        return self.__bind_entries(params)
+
+    def bind_graph(self, params : Dict[str, Any] = None) -> Tuple[List[dict], Dict[str, List[dict]]]:
+        """
+        Get the dependency graph of the plan, with the placeholders of its requests bound.
+
+        Args:
+            params: The values of the placeholders
+
+        Returns:
+            The independent request entries, by descending priority and insertion
+            order, and the dependent request entries by ID of their parent request
+
+        Raises:
+            ValueError: If a placeholder has no value
+        """
+        entries : List[dict] = self.__bind_entries(params)
+
+        roots : List[dict] = [entries[index] for index in self.__roots]
+        children : Dict[str, List[dict]] = { parent: [entries[index] for index in indexes] for parent, indexes in self.__children.items() }
+
+        return roots, children
+
+    def __bind_entries(self, params : Dict[str, Any] = None) -> List[dict]:
+        params = params or { }
+
+        missing : FrozenSet[str] = self.__parameters - params.keys()
+        if missing:
+            raise ValueError(f"Missing values for the plan parameters: {', '.join(sorted(missing))}")
+
+        entries : List[dict] = list(self.__entries)
+
+        for index in self.__templates:
+            entry : dict = dict(entries[index])
+            for field in _BOUND_FIELDS:
+                if field in entry:
+                    entry[field] = _bind(entry[field], params)
+            entries[index] = entry
+
+        return entries
+
+    def get_requests(self) -> List[dict]:
+        """
+        Get the request entries of the plan, without binding the placeholders.
+        """
+        return list(self.__entries)
@@ -0,0 +1,197 @@
+import json
+import threading
+import time
+
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError: # pragma: no cover - not available on Windows
+    fcntl = None
+
+from scv2py.services import SCV2Service
+
+from scv2py.exceptions import SCV2CancelledError
+
+from scv2py.core.cancellation import SCV2CancellationToken
+
+# Key of the bucket shared by all the services of the tenant
+_TENANT_BUCKET : str = '*'
+
+def _take_token(bucket : List[float], rate : float, burst : float, now : float) -> float:
+    # Refill the bucket for the elapsed time, then take one token.
+    # The bucket can go in debt: the returned value is the time needed to repay it,
+    # which is how long the caller has to wait before sending its request.
+    tokens, last = bucket
+    tokens = min(burst, tokens + max(0.0, now - last) * rate) - 1
+    bucket[0], bucket[1] = tokens, now
+
+    return 0.0 if tokens >= 0 else -tokens / rate
+
+def _take_tokens(buckets : Dict[str, List[float]], limits : List[Tuple[str, float, float]], now : float, max_delay : Optional[float]) -> Optional[float]:
+    # Take one token of every bucket, unless the wait would exceed `max_delay`:
+    # the buckets are then left untouched, and `None` is returned.
+    taken : Dict[str, List[float]] = { key: list(buckets.get(key, [burst, now])) for key, _, burst in limits }
+    delay : float = max(_take_token(taken[key], rate, burst, now) for key, rate, burst in limits)
+
+    if max_delay is not None and delay > max_delay:
+        return None
+
+    buckets.update(taken)
+    return delay
+
+class SCV2RateLimiter:
+    """
+    Client-side token bucket rate limiter, shareable between threads.
+
+    Caps the number of requests per second sent to the tenant and, optionally,
+    to single services. A request has to wait for a token of the tenant bucket
+    and of its service bucket (if any).
+
+    Example:
+        limiter = SCV2RateLimiter(rate=20, service_rates={SCV2Service.OPPORTUNITY_SERVICE: 5})
+        session = SCV2Session(..., sc_rate_limiter=limiter)
+    """
+
+    # Requests per second allowed towards the tenant
+    _rate : float
+
+    # Maximum number of requests that can be sent at once after an idle period
+    _burst : float
+
+    # Requests per second allowed towards specific services
+    _service_rates : Dict[SCV2Service, float]
+
+    # Whether `reserve` may block on I/O, in which case async sessions call it from a worker thread
+    blocking : bool = False
+
+    def __init__(self, rate : float, burst : float = None, service_rates : Dict[SCV2Service, float] = None) -> None:
+
+        if rate <= 0:
+            raise ValueError("Rate must be a positive number")
+
+        if burst is not None and burst < 1:
+            raise ValueError("Burst must be at least 1")
+
+        if any(service_rate <= 0 for service_rate in (service_rates or { }).values()):
+            raise ValueError("Service rates must be positive numbers")
+
+        self._rate = float(rate)
+        self._burst = float(burst or max(1.0, rate))
+        self._service_rates = dict(service_rates or { })
+
+        self.__lock = threading.Lock()
+        self.__buckets : Dict[str, List[float]] = { }
+
+    def _get_limits(self, service : Optional[SCV2Service]) -> List[Tuple[str, float, float]]:
+        # (bucket key, rate, burst) of every bucket the request has to go through
+        limits = [(_TENANT_BUCKET, self._rate, self._burst)]
+
+        if service is not None and service in self._service_rates:
+            service_rate = self._service_rates[service]
+            limits.append((service.value, service_rate, min(self._burst, max(1.0, service_rate))))
+
+        return limits
+
+    def reserve(self, service : SCV2Service = None, max_delay : float = None) -> Optional[float]:
+        """
+        Reserve a slot for one request.
+
+        Args:
+            service: The service the request is sent to
+            max_delay: Longest acceptable wait, in seconds. If the request
+                       would have to wait longer, no slot is reserved.
+
+        Returns:
+            The number of seconds to wait before sending the request,
+            or `None` if it would exceed `max_delay`
+        """
+        with self.__lock:
+            return _take_tokens(self.__buckets, self._get_limits(service), time.monotonic(), max_delay)
+
+    def acquire(self, service : SCV2Service = None, cancel_token : SCV2CancellationToken = None) -> None:
+        """
+        Block until one request can be sent.
+
+        Args:
+            service: The service the request is sent to
+            cancel_token: Token of the call. The wait stops when it is cancelled,
+                          and does not start if it would outlive its deadline.
+
+        Raises:
+            SCV2CancelledError: If the token is cancelled, or its deadline passes, before the request can be sent
+        """
+        if cancel_token is None:
+            delay : float = self.reserve(service)
+            if delay > 0:
+                time.sleep(delay)
+            return
+
+        cancel_token.raise_if_cancelled()
+
+        # A slot the deadline would not let the request use is not taken
+        delay : Optional[float] = self.reserve(service, max_delay=cancel_token.remaining())
+        if delay is None:
+            raise SCV2CancelledError("Request not sent: deadline exceeded while waiting for the rate limit")
+
+        if delay > 0:
+            cancel_token.wait(delay)
+
+        cancel_token.raise_if_cancelled()
+
+class SCV2FileRateLimiter(SCV2RateLimiter):
+    """
+    Token bucket rate limiter shared between the processes of one host.
+
+    The buckets are kept in a small state file, locked with `flock` on every
+    reservation, so that all the processes (and threads) pointing to the same
+    file share the same budget. Only available on POSIX systems.
+
+    Example:
+        limiter = SCV2FileRateLimiter('/tmp/scv2-tenant.rate', rate=20)
+    """
+
+    # Path of the shared state file
+    __path : str
+
+    # Reservations wait for the lock of the state file
+    blocking : bool = True
+
+    def __init__(self, path : str, rate : float, burst : float = None, service_rates : Dict[SCV2Service, float] = None) -> None:
+
+        if fcntl is None:
+            raise RuntimeError("SCV2FileRateLimiter requires fcntl, which is not available on this platform")
+
+        if not path:
+            raise ValueError("Path cannot be empty")
+
+        super().__init__(rate=rate, burst=burst, service_rates=service_rates)
+
+        self.__path = path
+        self.__thread_lock = threading.Lock()
+
+    def reserve(self, service : SCV2Service = None, max_delay : float = None) -> Optional[float]:
+        # The wall clock is used instead of the monotonic one,
+        # as the timestamps have to be comparable between processes.
+        with self.__thread_lock, open(self.__path, 'a+') as state_file:
+            fcntl.flock(state_file.fileno(), fcntl.LOCK_EX)
+            try:
+                state_file.seek(0)
+                content : str = state_file.read()
+
+                try:
+                    buckets : Dict[str, List[float]] = json.loads(content) if content else { }
+                except ValueError:
+                    # A corrupted state only resets the buckets
+                    buckets = { }
+
+                delay : Optional[float] = _take_tokens(buckets, self._get_limits(service), time.time(), max_delay)
+
+                state_file.seek(0)
+                state_file.truncate()
+                state_file.write(json.dumps(buckets))
+                state_file.flush()
+            finally:
+                fcntl.flock(state_file.fileno(), fcntl.LOCK_UN)
+
+        return delay
@@ -0,0 +1,147 @@
+import keyword
+import re
+import threading
+
+from typing import Any, Dict, Iterable, Iterator, List, Tuple, Type, Union
+
+class SCV2Record:
+    """
+    Base class of the compact, slotted records built from a `$select` projection.
+
+    Records of the same projection share one class, and therefore one field
+    name table: an instance only stores its values. Fields are accessed as
+    attributes; nested paths such as `adminData/updatedOn` become
+    `adminData_updatedOn`.
+
+    Record classes are created with `record_type`, not directly.
+    """
+    __slots__ = ()
+
+    # Attribute names, in projection order
+    _fields : Tuple[str, ...] = ()
+
+    # Selected paths, in projection order (e.g. 'adminData/updatedOn')
+    _paths : Tuple[str, ...] = ()
+
+    # Selected paths, split in their segments
+    _segments : Tuple[Tuple[str, ...], ...] = ()
+
+    def __init__(self, *values : Any) -> None:
+        if len(values) != len(self._fields):
+            raise TypeError(f"{type(self).__name__} expects {len(self._fields)} values, got {len(values)}")
+
+        for name, value in zip(self._fields, values):
+            object.__setattr__(self, name, value)
+
+    @classmethod
+    def from_entity(cls, entity : Dict[str, Any]) -> "SCV2Record":
+        """
+        Build a record from an entity dictionary, keeping only the projected fields.
+        Missing fields are set to `None`.
+        """
+        values : List[Any] = [ ]
+
+        for segments in cls._segments:
+            value = entity
+            for segment in segments:
+                value = value.get(segment) if isinstance(value, dict) else None
+            values.append(value)
+
+        return cls(*values)
+
+    def _asdict(self) -> Dict[str, Any]:
+        return { name: getattr(self, name) for name in self._fields }
+
+    def __iter__(self) -> Iterator[Any]:
+        return (getattr(self, name) for name in self._fields)
+
+    def __len__(self) -> int:
+        return len(self._fields)
+
+    def __eq__(self, other : object) -> bool:
+        if not isinstance(other, SCV2Record):
+            return NotImplemented
+        return self._paths == other._paths and tuple(self) == tuple(other)
+
+    def __hash__(self) -> int:
+        return hash((self._paths, tuple(self)))
+
+    def __repr__(self) -> str:
+        values : str = ', '.join(f'{name}={getattr(self, name)!r}' for name in self._fields)
+        return f'{type(self).__name__}({values})'
+
+    def __reduce__(self):
+        # Dynamically created classes cannot be pickled by reference:
+        # records are rebuilt from their projection instead.
+        return (_rebuild_record, (self._paths, tuple(self)))
+
+# Record classes, shared by every read using the same projection
+_RECORD_TYPES : Dict[Tuple[str, ...], Type[SCV2Record]] = { }
+_RECORD_TYPES_LOCK = threading.Lock()
+
+def _parse_select(select : Union[str, Iterable[str]]) -> Tuple[str, ...]:
+    fields = select.split(',') if isinstance(select, str) else select
+
+    paths : Tuple[str, ...] = tuple(field.strip() for field in fields if field and field.strip())
+
+    if not paths:
+        raise ValueError("At least one field must be selected")
+
+    if len(set(paths)) != len(paths):
+        raise ValueError("Selected fields must be unique")
+
+    return paths
+
+def _attribute_name(path : str) -> str:
+    name : str = re.sub(r'\W', '_', path)
+
+    if name[0].isdigit() or keyword.iskeyword(name) or name.startswith('_'):
+        name = f'f_{name}'
+
+    return name
+
+def record_type(select : Union[str, Iterable[str]]) -> Type[SCV2Record]:
+    """
+    Get the record class of a `$select` projection.
+
+    Args:
+        select: The selected fields, either as the `$select` string
+                (e.g. "id,displayId,adminData/updatedOn") or as a list
+
+    Returns:
+        The record class, shared by all the calls with the same projection
+    """
+    paths : Tuple[str, ...] = _parse_select(select)
+
+    with _RECORD_TYPES_LOCK:
+        record_class = _RECORD_TYPES.get(paths)
+
+        if record_class is None:
+            fields : Tuple[str, ...] = tuple(_attribute_name(path) for path in paths)
+
+            if len(set(fields)) != len(fields):
+                raise ValueError(f"Selected fields map to clashing attribute names: {', '.join(fields)}")
+
+            record_class = type('SCV2Record', (SCV2Record,), {
+                '__slots__': fields,
+                '_fields': fields,
+                '_paths': paths,
+                '_segments': tuple(tuple(path.split('/')) for path in paths)
+            })
+            _RECORD_TYPES[paths] = record_class
+
+    return record_class
+
+def _rebuild_record(paths : Tuple[str, ...], values : Tuple[Any, ...]) -> SCV2Record:
+    return record_type(paths)(*values)
+
+def to_records(entities : Iterable[Dict[str, Any]], select : Union[str, Iterable[str]]) -> Iterator[SCV2Record]:
+    """
+    Convert entity dictionaries to compact records of the given projection.
+
+    Example:
+        response = session.get(service, endpoint, select='id,displayId', top=500)
+        for record in to_records(read_records(response), 'id,displayId'):
+            print(record.id, record.displayId)
+    """
+    return map(record_type(select).from_entity, entities)
@@ -1,6 +1,6 @@
 from enum import Enum
 from typing import Dict, Any, Optional, List, Union
-from sc2py.services.base import SCV2Service, SCV2BaseEndpoint
+from scv2py.services.base import SCV2Service, SCV2BaseEndpoint
 
 class SCV2RequestType(Enum):
     GET = 'GET'
@@ -123,6 +123,10 @@ class SCV2RequestBuilder:
         self.__params[SCV2QueryParameterType.SKIP.value] = str(count)
         return self
 
+    def count(self, enabled: bool = True) -> "SCV2RequestBuilder":
+        self.__params[SCV2QueryParameterType.COUNT.value] = enabled
+        return self
+
     def exclude(self, fields: Union[str, List[str]]) -> "SCV2RequestBuilder":
         if isinstance(fields, list):
             self.__params[SCV2QueryParameterType.EXCLUDE.value] = ",".join(fields)
@@ -166,9 +170,9 @@ class SCV2RequestBuilder:
         if self.__request_type in [SCV2RequestType.POST, SCV2RequestType.PATCH, SCV2RequestType.PUT]:
             if not self.__payload:
                 raise ValueError(f"Payload is required for {self.__request_type.value} requests")
-                
-        if self.__request_type == SCV2RequestType.PATCH and 'If-Match' not in self.__headers:
-            raise ValueError("ETag (If-Match header) is required for PATCH requests")
+
+        # PATCH requests without an ETag (If-Match header) are checked when sent:
+        # only sessions with an ETag store can fill it in.
 
         return SCV2Request(
             request_type=self.__request_type,
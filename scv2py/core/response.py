@@ -0,0 +1,81 @@
+from typing import Any, List, Optional
+
+from scv2py.exceptions import SCV2RequestError
+
+def raise_for_status(response) -> None:
+    """
+    Raise a SCV2RequestError if the response carries an error status code.
+
+    Works with both `requests` and `httpx` responses.
+    """
+    if response.status_code >= 400:
+        raise SCV2RequestError(f"Request failed with status {response.status_code}: {response.text[:500]}")
+
+def read_records(response) -> List[Any]:
+    """
+    Extract the list of entities from a collection response.
+
+    The API wraps collections in a `value` array. Single entities
+    (`value` being an object) are returned as a one element list.
+
+    Args:
+        response: A `requests` or `httpx` response of a collection GET
+
+    Returns:
+        The entities contained in the response
+    """
+    raise_for_status(response)
+
+    payload = response.json()
+
+    if isinstance(payload, dict):
+        payload = payload.get('value', [])
+
+    if isinstance(payload, list):
+        return payload
+
+    return [payload]
+
+def read_count(response) -> int:
+    """
+    Extract the total count of a collection response requested with `$count=true`.
+
+    Args:
+        response: A `requests` or `httpx` response of a collection GET
+
+    Returns:
+        The total number of entities matching the request
+    """
+    raise_for_status(response)
+
+    payload = response.json()
+
+    if isinstance(payload, dict):
+        for key in ('count', '@odata.count'):
+            if key in payload:
+                return int(payload[key])
+
+    raise SCV2RequestError("The response does not contain a count")
+
+def read_created_id(response) -> Optional[str]:
+    """
+    Extract the ID of the entity created by a POST (or PUT) response.
+
+    The ID is only known from the response body, which may wrap the
+    entity in a `value` object.
+
+    Args:
+        response: A `requests` or `httpx` response of a create request
+
+    Returns:
+        The ID of the created entity, or `None` if the body does not carry one
+    """
+    try:
+        payload = response.json()
+    except ValueError:
+        return None
+
+    if isinstance(payload, dict):
+        payload = payload.get('value', payload)
+
+    return payload.get('id') if isinstance(payload, dict) else None
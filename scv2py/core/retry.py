@@ -0,0 +1,174 @@
+import random
+import time
+
+from email.utils import parsedate_to_datetime
+from typing import Iterable, Mapping, Optional
+
+class SCV2RetryPolicy:
+    """
+    Retry policy applied by the sessions to every call they make,
+    including the ones issued by the batch executor.
+
+    Delays grow exponentially (`backoff_factor * 2 ** attempt`, capped at
+    `backoff_max`) with full jitter. When the tenant answers 429 or 503 with
+    a `Retry-After` header, the delay requested by the server is honored.
+
+    Idempotent methods (GET, PUT, DELETE) and conditional PATCH requests
+    (carrying `If-Match`, which cannot be applied twice) are retried on any
+    retryable status and on connection errors, including connection resets.
+    POST and unconditional PATCH requests are only retried when the server
+    certainly did not process them: when the connection could not be
+    established, or when the tenant throttled the call (429/503).
+    """
+
+    # Methods which can be safely replayed
+    IDEMPOTENT_METHODS : frozenset = frozenset({ 'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE' })
+
+    # Status codes returned when the request was rejected before being processed
+    THROTTLING_STATUSES : frozenset = frozenset({ 429, 503 })
+
+    # Maximum number of retries, on top of the first attempt
+    __max_retries : int
+
+    # Base and maximum backoff delay, in seconds
+    __backoff_factor : float
+    __backoff_max : float
+
+    # Whether to randomize the backoff delay
+    __jitter : bool
+
+    # Status codes that trigger a retry
+    __retry_statuses : frozenset
+
+    # Whether to honor the Retry-After header
+    __respect_retry_after : bool
+
+    # Retry-After values above this limit (in seconds) are not waited for
+    __max_retry_after : float
+
+    def __init__(self,
+                 max_retries : int = 3,
+                 backoff_factor : float = 0.5,
+                 backoff_max : float = 30.0,
+                 jitter : bool = True,
+                 retry_statuses : Iterable[int] = (429, 502, 503, 504),
+                 respect_retry_after : bool = True,
+                 max_retry_after : float = 120.0) -> None:
+
+        if max_retries < 0:
+            raise ValueError("Max retries cannot be negative")
+
+        if backoff_factor < 0 or backoff_max < 0:
+            raise ValueError("Backoff delays cannot be negative")
+
+        self.__max_retries = max_retries
+        self.__backoff_factor = backoff_factor
+        self.__backoff_max = backoff_max
+        self.__jitter = jitter
+        self.__retry_statuses = frozenset(retry_statuses)
+        self.__respect_retry_after = respect_retry_after
+        self.__max_retry_after = max_retry_after
+
+    @property
+    def max_retries(self) -> int:
+        return self.__max_retries
+
+    def __is_replayable(self, http_method : str, req_headers : Optional[Mapping[str, str]]) -> bool:
+        http_method = http_method.upper()
+
+        if http_method in SCV2RetryPolicy.IDEMPOTENT_METHODS:
+            return True
+
+        # A conditional PATCH fails with 412 instead of being applied twice
+        return http_method == 'PATCH' and bool(req_headers) and bool(req_headers.get('If-Match'))
+
+    def get_backoff(self, attempt : int) -> float:
+        """
+        Get the delay before the retry following the given (zero based) attempt.
+        """
+        delay : float = min(self.__backoff_max, self.__backoff_factor * (2 ** attempt))
+
+        if self.__jitter:
+            return random.uniform(0, delay)
+
+        return delay
+
+    @staticmethod
+    def parse_retry_after(value : Optional[str]) -> Optional[float]:
+        """
+        Parse a Retry-After header value, either in seconds or as an HTTP date.
+
+        Returns:
+            The number of seconds to wait, or `None` if the value is missing or invalid
+        """
+        if not value:
+            return None
+
+        value = value.strip()
+
+        if value.isdigit():
+            return float(value)
+
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError, IndexError):
+            return None
+
+    def get_response_delay(self,
+                           attempt : int,
+                           http_method : str,
+                           req_headers : Optional[Mapping[str, str]],
+                           status_code : int,
+                           response_headers : Optional[Mapping[str, str]] = None) -> Optional[float]:
+        """
+        Decide whether a response should be retried.
+
+        Args:
+            attempt: Zero based index of the attempt that produced the response
+            http_method: HTTP method of the request
+            req_headers: Headers sent with the request
+            status_code: Status code of the response
+            response_headers: Headers of the response
+
+        Returns:
+            The delay in seconds before retrying, or `None` if the response must be returned as is
+        """
+        if attempt >= self.__max_retries or status_code not in self.__retry_statuses:
+            return None
+
+        throttled : bool = status_code in SCV2RetryPolicy.THROTTLING_STATUSES
+
+        if not throttled and not self.__is_replayable(http_method, req_headers):
+            return None
+
+        if throttled and self.__respect_retry_after and response_headers:
+            retry_after = SCV2RetryPolicy.parse_retry_after(response_headers.get('Retry-After'))
+            if retry_after is not None:
+                return retry_after if retry_after <= self.__max_retry_after else None
+
+        return self.get_backoff(attempt)
+
+    def get_error_delay(self,
+                        attempt : int,
+                        http_method : str,
+                        req_headers : Optional[Mapping[str, str]],
+                        request_sent : bool = True) -> Optional[float]:
+        """
+        Decide whether a failed call (connection error, reset, timeout) should be retried.
+
+        Args:
+            attempt: Zero based index of the failed attempt
+            http_method: HTTP method of the request
+            req_headers: Headers sent with the request
+            request_sent: `False` if the connection could not even be established
+
+        Returns:
+            The delay in seconds before retrying, or `None` if the error must be raised
+        """
+        if attempt >= self.__max_retries:
+            return None
+
+        if request_sent and not self.__is_replayable(http_method, req_headers):
+            return None
+
+        return self.get_backoff(attempt)
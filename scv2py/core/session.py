@@ -1,13 +1,43 @@
+import itertools
+import time
 import requests
 
-from functools import lru_cache
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import nullcontext
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, List, Mapping, Tuple, Union
 
-from scv2py.services import SCV2BaseEndpoint, SCV2Service, InternalAPIEndpointSanitizer
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
 
-from scv2py.exceptions import SCV2InvalidEndpointException, SCV2ConnectionError, SCV2RequestError, SCV2TimeoutError
+from scv2py.services import SCV2BaseEndpoint, SCV2Service
+from scv2py.services._internal.validators import InternalAPIEndpointSanitizer
+
+from scv2py.exceptions import SCV2InvalidEndpointException, SCV2ConnectionError, SCV2RequestError, SCV2TimeoutError, SCV2CancelledError
 
 from scv2py.core.request import SCV2Request, SCV2QueryParameterType, SCV2RequestType
 
+from scv2py.core.response import read_records, read_count
+
+from scv2py.core.retry import SCV2RetryPolicy
+
+from scv2py.core.rate_limit import SCV2RateLimiter
+
+from scv2py.core.cancellation import SCV2CancellationToken, current_token
+
+# The optional features (batches, bulk writes, streaming, records, caching,
+# coalescing, metrics, tracing, decode pools) are imported by the methods
+# using them, so that importing the session does not load them up front
+if TYPE_CHECKING:
+    from scv2py.core.batch import SCV2ClientBatchRequest
+    from scv2py.core.plan import SCV2BatchPlan
+    from scv2py.core.cache import SCV2ResponseCache, SCV2CacheEntry
+    from scv2py.core.etag import SCV2ETagStore
+    from scv2py.core.single_flight import _SingleFlight
+    from scv2py.core.metrics import SCV2Metrics
+    from scv2py.core.tracing import SCV2Tracer
+    from scv2py.core.decode_pool import SCV2DecodePool
+
 class SCV2Session:
 
     # This must be set to the full domain name of the tenant.
@@ -29,6 +59,9 @@ class SCV2Session:
     # The API base endpoint path
     __sc_api_base_path : str = '/sap/c4c/api/v1/'
 
+    # Call URLs of all the endpoints, by service and endpoint. Built once per session.
+    __sc_routes : Mapping[Tuple[SCV2Service, SCV2BaseEndpoint], str]
+
     # This is the User that will perform the calls
     __sc_user : str
     # Password of the user.
@@ -37,10 +70,48 @@ class SCV2Session:
     # Static request headers
     __sc_request_headers : dict
 
+    # Client-side rate limiter applied to every call. `None` disables rate limiting.
+    __sc_rate_limiter : SCV2RateLimiter = None
+
+    # Cache of GET responses. `None` disables caching.
+    __sc_cache : "SCV2ResponseCache" = None
+
     # Persistent session
     __sc_session : requests.Session
 
-    def __init__(self, sc_host : str, sc_user : str, sc_password : str, sc_verify_ssl : bool = True, sc_timeout : int = 60) -> None:
+    # Maximum number of connections kept alive towards the tenant.
+    # Should be at least as large as the number of concurrent batch workers.
+    __sc_pool_maxsize : int = 10
+
+    # Retry policy applied to every call. `None` disables retries.
+    __sc_retry_policy : SCV2RetryPolicy = None
+
+    # Last known ETags of the entities, used to fill `If-Match` on PATCH. `None` disables tracking.
+    __sc_etag_store : "SCV2ETagStore" = None
+
+    # Coalesces identical concurrent GET requests into one call. `None` when disabled.
+    __sc_single_flight : "_SingleFlight" = None
+
+    # Registry recording the metrics of every call. `None` disables instrumentation.
+    __sc_metrics : "SCV2Metrics" = None
+
+    # Timeline of the calls, exportable as Chrome trace JSON. `None` disables tracing.
+    __sc_tracer : "SCV2Tracer" = None
+
+    def __init__(self,
+                 sc_host : str,
+                 sc_user : str,
+                 sc_password : str,
+                 sc_verify_ssl : bool = True,
+                 sc_timeout : int = 60,
+                 sc_pool_maxsize : int = 10,
+                 sc_retry_policy : SCV2RetryPolicy = None,
+                 sc_rate_limiter : SCV2RateLimiter = None,
+                 sc_cache : "SCV2ResponseCache" = None,
+                 sc_etag_store : "SCV2ETagStore" = None,
+                 sc_coalesce_gets : bool = False,
+                 sc_metrics : "SCV2Metrics" = None,
+                 sc_tracer : "SCV2Tracer" = None) -> None:
 
         if not sc_host:
             raise ValueError("Host cannot be empty")
@@ -50,56 +121,385 @@ class SCV2Session:
 
         if sc_timeout <= 0:
             raise ValueError("Timeout must be a positive integer")
+
+        if sc_pool_maxsize <= 0:
+            raise ValueError("Pool size must be a positive integer")
         
         self.__sc_host = sc_host
+        self.__sc_routes = InternalAPIEndpointSanitizer.build_routing_table(f'{self.__sc_prot}://{sc_host}{self.__sc_api_base_path}')
         self.__sc_vssl = sc_verify_ssl
         self.__sc_timeout = sc_timeout
         self.__sc_user = sc_user
         self.__sc_pass = sc_password
+        self.__sc_pool_maxsize = sc_pool_maxsize
+        self.__sc_retry_policy = sc_retry_policy
+        self.__sc_rate_limiter = sc_rate_limiter
+        self.__sc_cache = sc_cache
+        self.__sc_etag_store = sc_etag_store
+        self.__sc_single_flight = None
+
+        if sc_coalesce_gets:
+            from scv2py.core.single_flight import _SingleFlight
+            self.__sc_single_flight = _SingleFlight()
+        self.__sc_metrics = sc_metrics
+        self.__sc_tracer = sc_tracer
 
         self.__sc_session = requests.Session()
         self.__sc_session.auth = (self.__sc_user, self.__sc_pass)
         self.__sc_session.verify = self.__sc_vssl
+        self.__sc_session.mount(f'{self.__sc_prot}://', HTTPAdapter(pool_maxsize=self.__sc_pool_maxsize))
 
         self.__sc_request_headers = { }
 
     def __enter__(self):
         return self
+
+    @property
+    def metrics(self) -> "SCV2Metrics":
+        """
+        The metrics registry of the session, or `None` if instrumentation is disabled.
+        """
+        return self.__sc_metrics
+
+    @property
+    def tracer(self) -> "SCV2Tracer":
+        """
+        The tracer of the session, or `None` if tracing is disabled.
+        """
+        return self.__sc_tracer
+
+    @property
+    def etag_store(self) -> "SCV2ETagStore":
+        """
+        The ETag store of the session, or `None` if ETags are not tracked.
+        """
+        return self.__sc_etag_store
     
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.close()
 
-    @lru_cache(maxsize=None)
     def __get_call_url(self, service : SCV2Service, endpoint : SCV2BaseEndpoint) -> str:
-        return f"{self.__sc_prot}://{self.__sc_host}{self.__sc_api_base_path}{service.value}/{endpoint.value}"
-
-    @lru_cache(maxsize=None)
-    def __validate_service_endpoint(self, service : SCV2Service, endpoint : SCV2BaseEndpoint) -> None:
-        # Veryfing that the passed endpoint is actually defined on the passed service.
-        # If not, raise an exception.
-        if(not InternalAPIEndpointSanitizer.is_valid_endpoint(service=service, endpoint=endpoint)):
-            raise SCV2InvalidEndpointException(f'Endpoint {endpoint.name} is not defined on service {service.name}.')
+        # Validating the service and endpoint and building the URL is a single lookup.
+        # Endpoints not defined on the passed service are not part of the table.
+        req_url : str = self.__sc_routes.get((service, endpoint))
+
+        if req_url is None:
+            raise SCV2InvalidEndpointException(f'Endpoint {getattr(endpoint, "name", endpoint)} is not defined on service {getattr(service, "name", service)}.')
+
+        return req_url
         
-    def __make_request(self, http_method : str, req_url : str, req_params : dict, req_payload : dict, req_headers : dict) -> requests.Response:
+    @staticmethod
+    def __was_request_sent(error : requests.RequestException) -> bool:
+        # A connect timeout or a refused/unresolvable connection
+        # means nothing reached the tenant.
+        if isinstance(error, requests.ConnectTimeout):
+            return False
+
+        reason = getattr(error.args[0], 'reason', None) if error.args else None
+
+        return not isinstance(reason, NewConnectionError)
+
+    def __make_request(self, service : SCV2Service, endpoint : SCV2BaseEndpoint, http_method : str, req_url : str, req_params : dict, req_payload : dict, req_headers : dict, stream : bool = False) -> requests.Response:
 
         response : requests.Response
 
-        try:
-            response = self.__sc_session.request(
-                method=http_method.upper(),
-                url=req_url,
-                json=req_payload,
-                params=req_params,
-                headers=req_headers,
-                timeout=self.__sc_timeout
+        attempt : int = 0
+
+        # Deadline and cancellation of the batch or iteration the call belongs to
+        token : SCV2CancellationToken = current_token()
+
+        while True:
+            timeout : float = self.__sc_timeout
+
+            if token is not None:
+                token.raise_if_cancelled()
+
+            # Every attempt, retries included, counts towards the rate limit.
+            # The wait stops on cancellation, and never runs past the deadline.
+            if self.__sc_rate_limiter is not None:
+                if self.__sc_tracer is None:
+                    self.__sc_rate_limiter.acquire(service, token)
+                else:
+                    with self.__sc_tracer.measure('rate limit', 'wait', service=service.value):
+                        self.__sc_rate_limiter.acquire(service, token)
+
+            if token is not None:
+                token.raise_if_cancelled()
+
+                # Calls never outlive the deadline, counted once the rate limit allowed them
+                remaining = token.remaining()
+                if remaining is not None and remaining < timeout:
+                    timeout = remaining
+
+            started : float = time.perf_counter()
+
+            try:
+                response = self.__sc_session.request(
+                    method=http_method.upper(),
+                    url=req_url,
+                    json=req_payload,
+                    params=req_params,
+                    headers=req_headers,
+                    timeout=timeout,
+                    stream=stream
+                    )
+            except requests.RequestException as e:
+                if self.__sc_metrics is not None:
+                    self.__sc_metrics.observe_error(service, endpoint, http_method, e, time.perf_counter() - started)
+
+                if self.__sc_tracer is not None:
+                    self.__sc_tracer.span(f'{http_method} {service.value}/{endpoint.value}', 'http', started, time.perf_counter(),
+                                          url=req_url, attempt=attempt, error=type(e).__name__)
+
+                delay = None if self.__sc_retry_policy is None else self.__sc_retry_policy.get_error_delay(
+                    attempt=attempt,
+                    http_method=http_method,
+                    req_headers=req_headers,
+                    request_sent=SCV2Session.__was_request_sent(e)
+                )
+
+                if token is not None and not SCV2Session.__fits_deadline(token, delay):
+                    # The reduced timeout, not the tenant, ended the call
+                    if isinstance(e, requests.Timeout) and timeout < self.__sc_timeout:
+                        raise SCV2CancelledError(f"Request {token.reason or 'deadline exceeded'}: {str(e)}") from e
+                    delay = None
+
+                if delay is None:
+                    if isinstance(e, requests.ConnectionError):
+                        raise SCV2ConnectionError(f"Connection error: {str(e)}") from e
+                    if isinstance(e, requests.Timeout):
+                        raise SCV2TimeoutError(f"Request timed out: {str(e)}") from e
+                    raise SCV2RequestError(f"Request error: {str(e)}") from e
+
+                if self.__sc_metrics is not None:
+                    self.__sc_metrics.observe_retry(service, endpoint, http_method)
+
+                self.__backoff(delay)
+                attempt += 1
+                continue
+
+            if self.__sc_tracer is not None:
+                self.__trace_attempt(service, endpoint, http_method, req_url, attempt, started, response, stream)
+
+            if self.__sc_metrics is not None:
+                # Streamed bodies are not read yet: their size is taken from the headers
+                self.__sc_metrics.observe_response(
+                    service, endpoint, http_method,
+                    status_code=response.status_code,
+                    duration=time.perf_counter() - started,
+                    request_bytes=len(response.request.body or b''),
+                    response_bytes=int(response.headers.get('Content-Length') or 0) if stream else len(response.content or b'')
                 )
+
+            delay = None if self.__sc_retry_policy is None else self.__sc_retry_policy.get_response_delay(
+                attempt=attempt,
+                http_method=http_method,
+                req_headers=req_headers,
+                status_code=response.status_code,
+                response_headers=response.headers
+            )
+
+            # Retries which cannot complete before the deadline are not attempted
+            if token is not None and not SCV2Session.__fits_deadline(token, delay):
+                delay = None
+
+            if delay is None:
+                # Writes make the cached reads of the same endpoint outdated
+                if self.__sc_cache is not None and http_method != 'GET' and response.ok:
+                    self.__sc_cache.invalidate(service, endpoint)
+
+                return response
+
+            if self.__sc_metrics is not None:
+                self.__sc_metrics.observe_retry(service, endpoint, http_method)
+
+            # Releasing the connection before waiting
+            response.close()
+            self.__backoff(delay)
+            attempt += 1
+
+    @staticmethod
+    def __fits_deadline(token : SCV2CancellationToken, delay : float) -> bool:
+        # Whether the token still allows a retry after `delay` seconds
+        remaining = token.remaining()
+        return not token.cancelled and (delay is None or remaining is None or delay < remaining)
+
+    def __decode_page(self, response : requests.Response, skip : int, decode_pool : "SCV2DecodePool" = None, records_select : str = None) -> list:
+        if self.__sc_tracer is None:
+            return SCV2Session.__read_page(response, decode_pool, records_select)
+
+        with self.__sc_tracer.measure('decode', 'json', skip=skip, bytes=len(response.content or b''), process_pool=decode_pool is not None):
+            return SCV2Session.__read_page(response, decode_pool, records_select)
+
+    @staticmethod
+    def __fill_window(fetch_page : Callable[[int, int], list], skip : int, size : int, page : list = None) -> list:
+        # Tenants cap `$top`, returning short pages before the end of the collection:
+        # the rest of the window is requested until it is full or nothing is left
+        if page is None:
+            page = fetch_page(skip, size)
+
+        while 0 < len(page) < size:
+            rest : list = fetch_page(skip + len(page), size - len(page))
+            if not rest:
+                break
+            page = page + rest
+
+        return page
+
+    @staticmethod
+    def __iter_windows(fetch_window : Callable[[int], Any], windows : Iterator[int], max_workers : int, max_pending : int, thread_name_prefix : str) -> Iterator[Tuple[int, Any]]:
+        # Fetches `$skip` windows on `max_workers` threads, yielding `(skip, result)` pairs
+        # in window order. Windows are submitted ahead of the consumer, but never more
+        # than `max_pending` of them (fetched or not, until consumed), to keep memory bounded.
+        pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=thread_name_prefix)
+
+        try:
+            pending : deque = deque()
+            for skip in windows:
+                pending.append((skip, pool.submit(fetch_window, skip)))
+                if len(pending) >= max_pending:
+                    break
+
+            while pending:
+                skip, future = pending.popleft()
+                result = future.result()
+
+                next_skip = next(windows, None)
+                if next_skip is not None:
+                    pending.append((next_skip, pool.submit(fetch_window, next_skip)))
+
+                yield skip, result
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def __iter_pipelined(self, request_page : Callable[[int, int], requests.Response], fetch_page : Callable[[int, int], list], page_size : int, decode_pool : "SCV2DecodePool", records_select : str) -> Iterator[Any]:
+        # Keeps one page request per worker process in flight, handing each body
+        # over to the decode pool as soon as it is received. The end of the
+        # collection is not known in advance: the windows requested past it
+        # come back empty and are dropped.
+        tracer : SCV2Tracer = self.__sc_tracer
+
+        def submit_window(skip : int) -> Future:
+            response : requests.Response = request_page(skip, page_size)
+            submitted : float = time.perf_counter()
+            future : Future = decode_pool.submit(response, records_select)
+
+            if tracer is not None:
+                size : int = len(response.content or b'')
+                future.add_done_callback(lambda _: tracer.span('decode', 'json', submitted, time.perf_counter(), skip=skip, bytes=size, process_pool=True))
+
+            return future
+
+        windows = SCV2Session.__iter_windows(submit_window, itertools.count(0, page_size), decode_pool.max_workers, decode_pool.max_workers, 'scv2-decode')
+
+        try:
+            for skip, decoded in windows:
+                page : list = SCV2Session.__fill_window(fetch_page, skip, page_size, decoded.result())
+                yield from page
+
+                # A window that could not be filled is the last one
+                if len(page) < page_size:
+                    return
+        finally:
+            windows.close()
+
+    @staticmethod
+    def __read_page(response : requests.Response, decode_pool : "SCV2DecodePool", records_select : str) -> list:
+        # Pages decoded by a process pool leave the GIL to the other threads meanwhile
+        if decode_pool is None:
+            return read_records(response)
+
+        return decode_pool.decode(response, records_select)
+
+    def __backoff(self, delay : float) -> None:
+        if self.__sc_tracer is None:
+            time.sleep(delay)
+            return
+
+        with self.__sc_tracer.measure('retry backoff', 'wait', delay=delay):
+            time.sleep(delay)
+
+    def __trace_attempt(self, service : SCV2Service, endpoint : SCV2BaseEndpoint, http_method : str, req_url : str, attempt : int, started : float, response : requests.Response, stream : bool) -> None:
+        # `elapsed` runs from sending the request to parsing the response headers.
+        # It includes getting a connection from the pool, which is not reported on its own.
+        ended : float = time.perf_counter()
+        headers_at : float = min(started + response.elapsed.total_seconds(), ended)
+
+        tracer : SCV2Tracer = self.__sc_tracer
+        tracer.span(f'{http_method} {service.value}/{endpoint.value}', 'http', started, ended,
+                    url=req_url, attempt=attempt, status=response.status_code)
+        tracer.span('ttfb', 'http', started, headers_at)
+
+        # Streamed bodies are read later, by the consumer of the response
+        if not stream:
+            tracer.span('download', 'http', headers_at, ended, bytes=len(response.content or b''))
+
+    def __track_etag(self, service : SCV2Service, endpoint : SCV2BaseEndpoint, resource_id : str, response : requests.Response) -> requests.Response:
+        if self.__sc_etag_store is not None:
+            self.__sc_etag_store.record(service, endpoint, resource_id, response)
+        return response
+
+    def __read_etag(self, service : SCV2Service, endpoint : SCV2BaseEndpoint, resource_id : str) -> str:
+        # Reads the entity again to get its current ETag (and store it)
+        response : requests.Response = self.get(service=service, endpoint=endpoint, resource_id=resource_id, use_cache=False)
+        response.close()
+
+        return response.headers.get('ETag') if response.ok else None
+
+    def __send_get(self, service : SCV2Service, endpoint : SCV2BaseEndpoint, resource_id : str, req_url : str, req_params : dict, use_cache : bool, stream : bool) -> requests.Response:
+        # Streamed responses are consumed by the caller, so they cannot be cached
+        if self.__sc_cache is None or not use_cache or stream:
+            response : requests.Response = self.__make_request(
+                service=service,
+                endpoint=endpoint,
+                http_method='GET',
+                req_url=req_url,
+                req_params=req_params,
+                req_payload={ },
+                req_headers=self.__sc_request_headers,
+                stream=stream
+            )
+
+            if resource_id is None:
+                return response
+
+            return self.__track_etag(service, endpoint, resource_id, response)
+
+        from scv2py.core.cache import SCV2ResponseCache
+
+        cache_key = SCV2ResponseCache.make_key(service, endpoint, resource_id, req_params)
+        cache_entry : SCV2CacheEntry = self.__sc_cache.get(cache_key)
+
+        if cache_entry is not None and cache_entry.is_fresh:
+            return cache_entry.response
+
+        # Stale entries are revalidated: a 304 means the cached body is still valid
+        req_headers : dict = self.__sc_request_headers
+        if cache_entry is not None:
+            req_headers = {**req_headers, 'If-None-Match': cache_entry.etag}
+
+        # Making the request
+        response : requests.Response = self.__make_request(
+            service=service,
+            endpoint=endpoint,
+            http_method='GET',
+            req_url=req_url,
+            req_params=req_params,
+            req_payload={ },
+            req_headers=req_headers
+        )
+
+        if cache_entry is not None and response.status_code == 304:
+            self.__sc_cache.refresh(cache_key)
+            return cache_entry.response
+
+        if response.status_code == 200:
+            self.__sc_cache.put(cache_key, response)
+
+        if resource_id is None:
             return response
-        except requests.ConnectionError as e:
-            raise SCV2ConnectionError(f"Connection error: {str(e)}") from e
-        except requests.Timeout as e:
-            raise SCV2TimeoutError(f"Request timed out: {str(e)}") from e
-        except requests.RequestException as e:
-            raise SCV2RequestError(f"Request error: {str(e)}") from e
+
+        return self.__track_etag(service, endpoint, resource_id, response)
 
     def set_default_headers(self, headers : dict) -> None:
         self.__sc_request_headers = headers
@@ -114,10 +514,10 @@ class SCV2Session:
             search : str = None,
             top : int = None,
             skip : int = None,
-            exclude : str = None) -> requests.Response:
-
-        # Validating both Service and Endpoint
-        self.__validate_service_endpoint(service=service, endpoint=endpoint)
+            exclude : str = None,
+            count : bool = None,
+            use_cache : bool = True,
+            stream : bool = False) -> requests.Response:
 
         # Generating the request URL
         req_url : str = self.__get_call_url(service=service, endpoint=endpoint)
@@ -137,7 +537,7 @@ class SCV2Session:
                 req_params['$select'] = select
 
             if(not orderby is None):
-                req_params['$order_by'] = orderby
+                req_params['$orderby'] = orderby
 
             if(not search is None):
                 req_params['$search'] = search
@@ -146,32 +546,317 @@ class SCV2Session:
                 req_params['$top'] = top
 
             if(not skip is None):
-                req_params['skip'] = skip
+                req_params['$skip'] = skip
 
             if(not exclude is None):
                 req_params['$exclude'] = exclude
 
-        # Making the request
-        response : requests.Response = self.__make_request(
-            http_method='GET',
-            req_url=req_url,
-            req_params=req_params,
-            req_payload={ },
-            req_headers=self.__sc_request_headers
-        )
-        
-        return response
-        
-    def post(self, service : SCV2Service, endpoint : SCV2BaseEndpoint, payload : dict) -> requests.Response:
+            if(not count is None):
+                req_params['$count'] = 'true' if count else 'false'
 
-        # Validating both Service and Endpoint
-        self.__validate_service_endpoint(service=service, endpoint=endpoint)
+        # Streamed responses belong to a single caller, so they are never shared
+        if self.__sc_single_flight is not None and not stream:
+            from scv2py.core.cache import SCV2ResponseCache
+
+            return self.__sc_single_flight.do(
+                (SCV2ResponseCache.make_key(service, endpoint, resource_id, req_params), use_cache),
+                self.__send_get, service, endpoint, resource_id, req_url, req_params, use_cache, stream
+            )
+
+        return self.__send_get(service, endpoint, resource_id, req_url, req_params, use_cache, stream)
+
+    def iter_collection(self,
+            service : SCV2Service,
+            endpoint : SCV2BaseEndpoint,
+            filter : str = None,
+            select : str = None,
+            orderby : str = None,
+            search : str = None,
+            exclude : str = None,
+            page_size : int = 100,
+            prefetch : bool = True,
+            stream : bool = False,
+            as_records : bool = False,
+            deadline : float = None,
+            cancel_token : SCV2CancellationToken = None,
+            decode_pool : "SCV2DecodePool" = None) -> Iterator[Any]:
+        """
+        Iterate over all the entities of a collection, one at a time.
+
+        Pages are requested with `$top`/`$skip`. While the caller processes a page,
+        the next one is already being fetched in the background.
+        An `orderby` expression should be provided to keep the pages stable.
+        Tenants may return fewer entities than `$top`: the iteration only ends
+        when a page request returns no entity.
+
+        With `stream`, each page is decoded incrementally while it is received,
+        so that memory usage depends on the size of one entity instead of one page.
+        Streamed pages are not prefetched.
+
+        With `as_records`, entities are returned as compact slotted records
+        (see `scv2py.core.records`) holding only the `select` fields.
+
+        With a `deadline` or a `cancel_token`, no page is requested once the
+        iteration is cancelled or the deadline (counted from the start of the
+        iteration) has passed, and page requests time out by the deadline.
+        The entities received until then are yielded, then SCV2CancelledError
+        is raised.
+
+        With a `decode_pool`, pages are decoded (and records built) in its worker
+        processes, and its `transform` is applied to each entity. One page per
+        worker process is requested at the same time (`prefetch` is ignored),
+        so a few requests past the end of the collection are wasted.
+
+        Args:
+            service: The service to read from
+            endpoint: The collection endpoint to read from
+            filter, select, orderby, search, exclude: OData query options, as in `get`
+            page_size: Number of entities requested per page
+            prefetch: Whether to fetch the next page while the current one is consumed
+            stream: Whether to decode the pages incrementally from the socket
+            as_records: Whether to return SCV2Record instances instead of dictionaries
+            deadline: Maximum duration of the whole iteration, in seconds
+            cancel_token: Token cancelling the iteration when cancelled
+            decode_pool: Process pool decoding the pages, not supported with `stream`
+
+        Returns:
+            An iterator over the entities of the collection
+
+        Raises:
+            SCV2RequestError: If a page request fails
+            SCV2CancelledError: If the iteration is cancelled or exceeds its deadline
+        """
+        if page_size <= 0:
+            raise ValueError("Page size must be a positive integer")
+
+        if stream and decode_pool is not None:
+            raise ValueError("Streamed pages cannot be decoded by a decode pool")
+
+        if as_records and not select:
+            raise ValueError("A select list is required to return records")
+
+        if as_records and decode_pool is None:
+            from scv2py.core.records import to_records
+
+            yield from to_records(self.iter_collection(
+                service=service,
+                endpoint=endpoint,
+                filter=filter,
+                select=select,
+                orderby=orderby,
+                search=search,
+                exclude=exclude,
+                page_size=page_size,
+                prefetch=prefetch,
+                stream=stream,
+                deadline=deadline,
+                cancel_token=cancel_token
+            ), select)
+            return
+
+        token : SCV2CancellationToken = None
+        if deadline is not None or cancel_token is not None:
+            token = SCV2CancellationToken(timeout=deadline, parent=cancel_token)
+
+        def request_page(skip : int, top : int) -> requests.Response:
+            # Bound on the thread sending the call, which may be the prefetch worker
+            with token or nullcontext():
+                return self.get(
+                    service=service,
+                    endpoint=endpoint,
+                    filter=filter,
+                    select=select,
+                    orderby=orderby,
+                    search=search,
+                    top=top,
+                    skip=skip,
+                    exclude=exclude,
+                    use_cache=False,
+                    stream=stream
+                )
+
+        def fetch_page(skip : int, top : int) -> list:
+            return self.__decode_page(request_page(skip, top), skip, decode_pool, select if as_records else None)
+
+        def fetch_window(skip : int) -> list:
+            return SCV2Session.__fill_window(fetch_page, skip, page_size)
+
+        if stream:
+            from scv2py.core.streaming import iter_response_entities
+
+            skip : int = 0
+            while True:
+                received : int = 0
+
+                # Short pages are completed up to the next multiple of `page_size`
+                for entity in iter_response_entities(request_page(skip, page_size - skip % page_size)):
+                    received += 1
+                    yield entity
+
+                if received == 0:
+                    return
+                skip += received
+
+        if decode_pool is not None:
+            yield from self.__iter_pipelined(request_page, fetch_page, page_size, decode_pool, select if as_records else None)
+            return
+
+        if not prefetch:
+            skip : int = 0
+            while True:
+                page : list = fetch_window(skip)
+                yield from page
+
+                # A window that could not be filled is the last one
+                if len(page) < page_size:
+                    return
+                skip += page_size
+
+        # A single background worker is enough: only one page is fetched ahead.
+        pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='scv2-prefetch')
+
+        try:
+            skip : int = 0
+            next_page = pool.submit(fetch_window, skip)
+
+            while next_page is not None:
+                page : list = next_page.result()
+
+                # A window that could not be filled is the last one
+                skip += page_size
+                next_page = pool.submit(fetch_window, skip) if len(page) == page_size else None
+
+                yield from page
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def count(self, service : SCV2Service, endpoint : SCV2BaseEndpoint, filter : str = None, search : str = None) -> int:
+        """
+        Get the number of entities of a collection matching the given filter, using `$count`.
+
+        Args:
+            service: The service to read from
+            endpoint: The collection endpoint to count
+            filter, search: OData query options, as in `get`
+
+        Returns:
+            The total number of matching entities
+
+        Raises:
+            SCV2RequestError: If the request fails or the response carries no count
+        """
+        return read_count(self.get(
+            service=service,
+            endpoint=endpoint,
+            filter=filter,
+            search=search,
+            top=1,
+            count=True,
+            use_cache=False
+        ))
+
+    def extract_collection(self,
+            service : SCV2Service,
+            endpoint : SCV2BaseEndpoint,
+            filter : str = None,
+            select : str = None,
+            orderby : str = 'id',
+            search : str = None,
+            exclude : str = None,
+            page_size : int = 1000,
+            max_workers : int = None,
+            as_records : bool = False,
+            decode_pool : "SCV2DecodePool" = None) -> Iterator[Any]:
+        """
+        Extract a full collection by fetching `$skip` windows in parallel.
+
+        The total is read first with `$count`, then the range is split into
+        windows of `page_size` entities which are fetched concurrently and
+        yielded back in order. `orderby` must define a stable, total order
+        (it defaults to `id`), otherwise windows may overlap or miss entities.
+        Entities created after the count was taken are not extracted. Windows
+        shortened by a `$top` cap of the tenant are completed with further requests.
+
+        Args:
+            service: The service to read from
+            endpoint: The collection endpoint to read from
+            filter, select, orderby, search, exclude: OData query options, as in `get`
+            page_size: Number of entities requested per window
+            max_workers: Maximum number of windows fetched at the same time.
+                         Defaults to the connection pool size of the session.
+            as_records: Whether to return SCV2Record instances holding only
+                        the `select` fields instead of dictionaries
+            decode_pool: Process pool decoding the windows (and building the
+                         records), applying its `transform` to each entity
+
+        Returns:
+            An iterator over the entities of the collection, in `orderby` order
+
+        Raises:
+            SCV2RequestError: If a window request fails, or returns fewer entities
+                              than counted (e.g. after deletions)
+        """
+        if page_size <= 0:
+            raise ValueError("Page size must be a positive integer")
+
+        if not orderby:
+            raise ValueError("A stable orderby expression is required for partitioned extraction")
+
+        if as_records and not select:
+            raise ValueError("A select list is required to return records")
+
+        max_workers = max_workers or self.__sc_pool_maxsize
+
+        total : int = self.count(service=service, endpoint=endpoint, filter=filter, search=search)
+
+        record_class = None
+
+        if as_records and decode_pool is None:
+            from scv2py.core.records import record_type
+            record_class = record_type(select)
+
+        def fetch_page(skip : int, top : int) -> list:
+            return self.__decode_page(self.get(
+                service=service,
+                endpoint=endpoint,
+                filter=filter,
+                select=select,
+                orderby=orderby,
+                search=search,
+                top=top,
+                skip=skip,
+                exclude=exclude,
+                use_cache=False
+            ), skip, decode_pool, select if as_records else None)
+
+        def fetch_window(skip : int) -> list:
+            expected : int = min(page_size, total - skip)
+            page : list = SCV2Session.__fill_window(fetch_page, skip, expected)
+
+            # Entities deleted since the count was taken leave a gap that cannot be read anymore
+            if len(page) < expected:
+                raise SCV2RequestError(f"Incomplete extraction: the window at $skip={skip} returned {len(page)} of {expected} entities")
+
+            # Records are built on the workers, so the consumer only receives compact rows
+            return page if record_class is None else [record_class.from_entity(entity) for entity in page]
+
+        windows = SCV2Session.__iter_windows(fetch_window, iter(range(0, total, page_size)), max_workers, max_workers * 2, 'scv2-extract')
+
+        try:
+            for _, page in windows:
+                yield from page
+        finally:
+            windows.close()
+
+    def post(self, service : SCV2Service, endpoint : SCV2BaseEndpoint, payload : dict) -> requests.Response:
 
         # Generating the request URL
         req_url : str = self.__get_call_url(service=service, endpoint=endpoint)
 
         # Making the request
         response : requests.Response = self.__make_request(
+            service=service,
+            endpoint=endpoint,
             http_method='POST',
             req_url=req_url,
             req_params={ },
@@ -179,12 +864,25 @@ class SCV2Session:
             req_headers=self.__sc_request_headers
         )
 
-        return response
+        # The ID of the created entity is read from the response
+        return self.__track_etag(service, endpoint, None, response)
+
+    def patch(self, service : SCV2Service, endpoint : SCV2BaseEndpoint, resource_id : str, payload : dict, etag : str = None) -> requests.Response:
+        """
+        Update an entity.
 
-    def patch(self, service : SCV2Service, endpoint : SCV2BaseEndpoint, resource_id : str, payload : dict, etag : str) -> requests.Response:
+        Without an explicit `etag`, the `If-Match` value is taken from the ETag
+        store of the session (reading the entity first if its ETag is unknown).
+        If the stored ETag turns out to be outdated (412), the entity is read
+        again and the update is retried once.
 
-        # Validating both Service and Endpoint
-        self.__validate_service_endpoint(service=service, endpoint=endpoint)
+        Raises:
+            ValueError: If no `etag` is given and the session has no ETag store
+        """
+
+        # Without a store to fill it in, the If-Match of the optimistic concurrency check is mandatory
+        if not etag and self.__sc_etag_store is None:
+            raise ValueError("ETag (If-Match header) is required for PATCH requests when the session has no ETag store")
 
         # Generating the request URL
         req_url : str = self.__get_call_url(service=service, endpoint=endpoint)
@@ -192,21 +890,38 @@ class SCV2Session:
         # For updates, the id  of the resource is appended at the end of the URL
         req_url = f'{req_url}/{resource_id}'
 
-        # Making the request
-        response : requests.Response = self.__make_request(
-            http_method='PATCH',
-            req_url=req_url,
-            req_params={ },
-            req_payload=payload,
-            req_headers={**self.__sc_request_headers, 'If-Match': etag}
-        )
+        etag_store : SCV2ETagStore = self.__sc_etag_store
+        stored_etag : bool = etag is None and etag_store is not None
 
-        return response
+        if stored_etag:
+            etag = etag_store.get(service, endpoint, resource_id) or self.__read_etag(service, endpoint, resource_id)
 
-    def put(self, service : SCV2Service, endpoint : SCV2BaseEndpoint, resource_id : str, payload : dict) -> requests.Response:
+        while True:
+            req_headers : dict = dict(self.__sc_request_headers)
+            if etag:
+                req_headers['If-Match'] = etag
+
+            # Making the request
+            response : requests.Response = self.__make_request(
+                service=service,
+                endpoint=endpoint,
+                http_method='PATCH',
+                req_url=req_url,
+                req_params={ },
+                req_payload=payload,
+                req_headers=req_headers
+            )
 
-        # Validating both Service and Endpoint
-        self.__validate_service_endpoint(service=service, endpoint=endpoint)
+            # The stored ETag is outdated: refreshing it and retrying once
+            if response.status_code == 412 and stored_etag and etag_store.retry_on_conflict:
+                stored_etag = False
+                response.close()
+                etag = self.__read_etag(service, endpoint, resource_id)
+                continue
+
+            return self.__track_etag(service, endpoint, resource_id, response)
+
+    def put(self, service : SCV2Service, endpoint : SCV2BaseEndpoint, resource_id : str, payload : dict) -> requests.Response:
 
         # Generating the request URL
         req_url : str = self.__get_call_url(service=service, endpoint=endpoint)
@@ -217,6 +932,8 @@ class SCV2Session:
 
         # Making the request
         response : requests.Response = self.__make_request(
+            service=service,
+            endpoint=endpoint,
             http_method='PUT',
             req_url=req_url,
             req_params={ },
@@ -224,13 +941,10 @@ class SCV2Session:
             req_headers=self.__sc_request_headers
         )
 
-        return response
+        return self.__track_etag(service, endpoint, resource_id or None, response)
 
     def delete(self, service : SCV2Service, endpoint : SCV2BaseEndpoint, resource_id : str) -> requests.Response:
 
-        # Validating both Service and Endpoint
-        self.__validate_service_endpoint(service=service, endpoint=endpoint)
-
         # Generating the request URL
         req_url : str = self.__get_call_url(service=service, endpoint=endpoint)
 
@@ -239,6 +953,8 @@ class SCV2Session:
 
         # Making the request
         response : requests.Response = self.__make_request(
+            service=service,
+            endpoint=endpoint,
             http_method='DELETE',
             req_url=req_url,
             req_params={ },
@@ -246,6 +962,9 @@ class SCV2Session:
             req_headers=self.__sc_request_headers
         )
 
+        if self.__sc_etag_store is not None and response.ok:
+            self.__sc_etag_store.discard(service, endpoint, resource_id)
+
         return response
 
 
@@ -277,6 +996,7 @@ class SCV2Session:
             top_param = request.params.get(SCV2QueryParameterType.TOP.value)
             skip_param = request.params.get(SCV2QueryParameterType.SKIP.value)
             exclude_param = request.params.get(SCV2QueryParameterType.EXCLUDE.value)
+            count_param = request.params.get(SCV2QueryParameterType.COUNT.value)
             
             return self.get(
                 service=request.service,
@@ -288,7 +1008,8 @@ class SCV2Session:
                 search=search_param,
                 top=top_param,
                 skip=skip_param,
-                exclude=exclude_param
+                exclude=exclude_param,
+                count=count_param
             )
         elif request.request_type == SCV2RequestType.POST:
             return self.post(
@@ -319,4 +1040,116 @@ class SCV2Session:
                 resource_id=request.resource_id
             )
         else:
-            raise ValueError(f"Unsupported request type: {request.request_type}")
\ No newline at end of file
+            raise ValueError(f"Unsupported request type: {request.request_type}")
+
+    def execute_batch(self,
+                      batch : "Union[SCV2ClientBatchRequest, SCV2BatchPlan]",
+                      max_workers : int = None,
+                      merge_gets : bool = False,
+                      on_result : Callable[[str, dict], None] = None,
+                      params : dict = None,
+                      deadline : float = None,
+                      cancel_token : SCV2CancellationToken = None) -> dict:
+        """
+        Execute all the requests of a client-side batch concurrently.
+
+        Independent requests run on a bounded worker pool sharing this session's
+        connections, ordered by priority. Dependent requests are scheduled as soon
+        as the request they depend on completes successfully.
+
+        With a `deadline` or a `cancel_token`, the requests (and dependents) not
+        sent yet when the batch is cancelled or the deadline passes are dropped,
+        and the calls in flight time out by the deadline. Their results carry a
+        SCV2CancelledError, the results of the other requests are kept.
+
+        Args:
+            batch: The SCV2ClientBatchRequest, or compiled SCV2BatchPlan, to execute
+            max_workers: Maximum number of concurrent requests.
+                         Defaults to the connection pool size of the session.
+            merge_gets: Whether GET requests reading single entities of the same
+                        service and endpoint are merged into a few collection GETs.
+                        The split responses only carry an `ETag` header when the
+                        tenant annotates the entities with `@odata.etag`, so GETs are
+                        not merged when the session has an `sc_etag_store`.
+            on_result: Optional function called with `(request_id, result)`
+                       as soon as each request completes
+            params: The values bound to the `{name}` placeholders of a compiled plan
+            deadline: Maximum duration of the whole batch, in seconds
+            cancel_token: Token cancelling the batch when cancelled
+
+        Returns:
+            Dictionary mapping each request ID to a result dictionary with the
+            `success`, `response` and `error` keys
+        """
+        from scv2py.core.batch import SCV2ClientBatchRequest
+        from scv2py.core.plan import SCV2BatchPlan
+        from scv2py.core.executor import SCV2BatchExecutor
+
+        if not isinstance(batch, (SCV2ClientBatchRequest, SCV2BatchPlan)):
+            raise ValueError("Expected an SCV2ClientBatchRequest or SCV2BatchPlan object")
+
+        executor = SCV2BatchExecutor(session=self, max_workers=max_workers or self.__sc_pool_maxsize, merge_gets=merge_gets)
+
+        return executor.execute(batch, on_result=on_result, params=params, deadline=deadline, cancel_token=cancel_token)
+
+    def iter_batch(self,
+                   batch : "Union[SCV2ClientBatchRequest, SCV2BatchPlan]",
+                   max_workers : int = None,
+                   merge_gets : bool = False,
+                   params : dict = None,
+                   deadline : float = None,
+                   cancel_token : SCV2CancellationToken = None) -> Iterator[Tuple[str, dict]]:
+        """
+        Execute a client-side batch, yielding `(request_id, result)` pairs as requests complete.
+
+        Unlike `execute_batch`, results are not collected: each response can be
+        processed and released as soon as it arrives.
+
+        Args:
+            batch: The SCV2ClientBatchRequest, or compiled SCV2BatchPlan, to execute
+            max_workers, merge_gets, params, deadline, cancel_token: As in `execute_batch`
+
+        Returns:
+            An iterator of `(request_id, result)` pairs, in completion order
+        """
+        from scv2py.core.batch import SCV2ClientBatchRequest
+        from scv2py.core.plan import SCV2BatchPlan
+        from scv2py.core.executor import SCV2BatchExecutor
+
+        if not isinstance(batch, (SCV2ClientBatchRequest, SCV2BatchPlan)):
+            raise ValueError("Expected an SCV2ClientBatchRequest or SCV2BatchPlan object")
+
+        executor = SCV2BatchExecutor(session=self, max_workers=max_workers or self.__sc_pool_maxsize, merge_gets=merge_gets)
+
+        return executor.iter_results(batch, params, deadline=deadline, cancel_token=cancel_token)
+
+    def bulk_write(self,
+                   service : SCV2Service,
+                   endpoint : SCV2BaseEndpoint,
+                   items : Iterable[Any],
+                   http_method : str = 'POST',
+                   max_workers : int = None) -> List[dict]:
+        """
+        Create or update many entities concurrently, collecting a result per item.
+
+        Failed writes do not stop the others. Use `SCV2BulkWriter.iter_write`
+        to process the results while the load is running.
+
+        Args:
+            service: The service to write to
+            endpoint: The endpoint to write to
+            items: For POST, the payloads to create. For PATCH and PUT,
+                   `(resource_id, payload)` or `(resource_id, payload, etag)` tuples.
+            http_method: One of POST, PATCH or PUT
+            max_workers: Maximum number of concurrent writes.
+                         Defaults to the connection pool size of the session.
+
+        Returns:
+            The results of all the items, ordered as the input, with the
+            `index`, `resource_id`, `success`, `status`, `etag` and `error` keys
+        """
+        from scv2py.core.bulk import SCV2BulkWriter
+
+        writer = SCV2BulkWriter(session=self, max_workers=max_workers or self.__sc_pool_maxsize)
+
+        return writer.write(service, endpoint, items, http_method)
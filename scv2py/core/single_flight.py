@@ -0,0 +1,104 @@
+import asyncio
+import threading
+
+from concurrent.futures import Future, wait
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from scv2py.core.cancellation import SCV2CancellationToken, current_token
+
+# Interval at which a waiting follower checks its cancellation token, in seconds
+_CANCEL_POLL_INTERVAL : float = 0.1
+
+class _SingleFlight:
+    # Coalesces concurrent calls sharing the same key: the first caller runs
+    # the call, the others wait for it and receive the same result (or exception).
+    # Completed calls are forgotten, so this never serves outdated results.
+
+    def __init__(self) -> None:
+        self.__lock = threading.Lock()
+        self.__calls : Dict[Hashable, Future] = { }
+
+    def do(self, key : Hashable, function : Callable[..., Any], *args, **kwargs) -> Any:
+        with self.__lock:
+            future : Future = self.__calls.get(key)
+            leader : bool = future is None
+
+            if leader:
+                future = Future()
+                self.__calls[key] = future
+
+        if not leader:
+            return _SingleFlight.__follow(future)
+
+        try:
+            result = function(*args, **kwargs)
+        except BaseException as e:
+            self.__forget(key)
+            future.set_exception(e)
+            raise
+
+        self.__forget(key)
+        future.set_result(result)
+
+        return result
+
+    @staticmethod
+    def __follow(future : Future) -> Any:
+        # Followers give up when their own deadline passes or their token is
+        # cancelled, even though the call of the leader goes on.
+        token : Optional[SCV2CancellationToken] = current_token()
+
+        if token is None:
+            return future.result()
+
+        while True:
+            token.raise_if_cancelled()
+
+            remaining : Optional[float] = token.remaining()
+            timeout : float = _CANCEL_POLL_INTERVAL if remaining is None else max(0.0, min(remaining, _CANCEL_POLL_INTERVAL))
+
+            if wait([future], timeout=timeout).done:
+                return future.result()
+
+    def __forget(self, key : Hashable) -> None:
+        with self.__lock:
+            self.__calls.pop(key, None)
+
+class _AsyncSingleFlight:
+    # asyncio counterpart of _SingleFlight, for calls running on the same event loop
+
+    def __init__(self) -> None:
+        self.__calls : Dict[Hashable, asyncio.Future] = { }
+
+    async def do(self, key : Hashable, function : Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        future : asyncio.Future = self.__calls.get(key)
+
+        while future is not None:
+            try:
+                # Shielded, so that a cancelled follower does not cancel the shared call
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # The leader was cancelled, not this task: the call is run again
+                if not future.cancelled():
+                    raise
+            future = self.__calls.get(key)
+
+        future = asyncio.get_running_loop().create_future()
+        self.__calls[key] = future
+
+        try:
+            result = await function(*args, **kwargs)
+        except BaseException as e:
+            self.__calls.pop(key, None)
+            if isinstance(e, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(e)
+                # Retrieving the exception, so that asyncio does not log it when there are no followers
+                future.exception()
+            raise
+
+        self.__calls.pop(key, None)
+        future.set_result(result)
+
+        return result
@@ -0,0 +1,165 @@
+import codecs
+import json
+import re
+
+from typing import Any, Iterable, Iterator
+
+from scv2py.exceptions import SCV2RequestError
+
+from scv2py.core.response import raise_for_status
+
+# Size of the chunks read from the socket
+STREAM_CHUNK_SIZE : int = 64 * 1024
+
+# Consumed characters are dropped from the buffer once they exceed this size
+_COMPACT_THRESHOLD : int = 64 * 1024
+
+_WHITESPACE = re.compile(r'\s*')
+
+# Last characters of the values that cannot be truncated
+_CLOSING : str = '"]}'
+
+# Characters that can follow a number or a literal
+_DELIMITERS : str = ',]}: \t\r\n'
+
+class _JSONStreamReader:
+    # Incremental reader over a stream of JSON bytes.
+    # Keeps only the not yet consumed characters in memory.
+
+    def __init__(self, chunks : Iterable[bytes]) -> None:
+        self.__chunks : Iterator[bytes] = iter(chunks)
+        self.__decoder = codecs.getincrementaldecoder('utf-8')()
+        self.__json = json.JSONDecoder()
+        self.buffer : str = ''
+        self.pos : int = 0
+        self.eof : bool = False
+
+    def read_more(self) -> bool:
+        if self.eof:
+            return False
+
+        if self.pos > _COMPACT_THRESHOLD:
+            self.buffer = self.buffer[self.pos:]
+            self.pos = 0
+
+        for chunk in self.__chunks:
+            if chunk:
+                self.buffer += self.__decoder.decode(chunk)
+                return True
+
+        self.buffer += self.__decoder.decode(b'', final=True)
+        self.eof = True
+        return True
+
+    def peek(self) -> str:
+        # Returns the next non whitespace character, without consuming it
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.read_more() or (self.eof and self.pos >= len(self.buffer)):
+                return ''
+
+    def expect(self, char : str) -> None:
+        if self.peek() != char:
+            raise SCV2RequestError(f"Invalid JSON response: expected '{char}' at position {self.pos}")
+        self.pos += 1
+
+    def read_value(self) -> Any:
+        self.peek()
+
+        while True:
+            try:
+                value, end = self.__json.raw_decode(self.buffer, self.pos)
+                # Strings, objects and arrays end with their closing character. Numbers and
+                # literals may be cut by the chunk boundary (`1.` of `1.5e10` decodes as `1`),
+                # so they are complete only when followed by a delimiter or the end of the stream.
+                if self.eof or self.buffer[end - 1] in _CLOSING or (end < len(self.buffer) and self.buffer[end] in _DELIMITERS):
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError as e:
+                if self.eof:
+                    raise SCV2RequestError(f"Invalid JSON response: {str(e)}") from e
+
+            self.read_more()
+
+def iter_json_entities(chunks : Iterable[bytes], key : str = 'value') -> Iterator[Any]:
+    """
+    Incrementally decode a collection payload, yielding its entities one at a time.
+
+    Supports both `{"value": [...], ...}` objects and bare arrays. Only the entity
+    being decoded is kept in memory, instead of the whole payload.
+
+    Args:
+        chunks: The raw bytes of the payload, in chunks
+        key: The key of the entities array in the payload object
+
+    Returns:
+        An iterator over the entities
+    """
+    reader = _JSONStreamReader(chunks)
+
+    first : str = reader.peek()
+
+    if first == '{':
+        reader.pos += 1
+
+        # Skipping all the members preceding the entities array
+        while True:
+            if reader.peek() == '}':
+                return
+
+            name = reader.read_value()
+            reader.expect(':')
+
+            if name == key:
+                break
+
+            reader.read_value()
+
+            if reader.peek() == ',':
+                reader.pos += 1
+
+        # Single entities are wrapped as well
+        if reader.peek() != '[':
+            yield reader.read_value()
+            return
+    elif first != '[':
+        raise SCV2RequestError("Invalid JSON response: expected an object or an array")
+
+    reader.expect('[')
+
+    while True:
+        char : str = reader.peek()
+
+        if char == ']':
+            return
+        if char == ',':
+            reader.pos += 1
+            continue
+        if char == '':
+            raise SCV2RequestError("Invalid JSON response: unterminated array")
+
+        yield reader.read_value()
+
+def iter_response_entities(response, key : str = 'value') -> Iterator[Any]:
+    """
+    Decode the entities of a streamed (`stream=True`) collection response as they arrive.
+
+    The response is closed once the entities have been consumed.
+
+    Args:
+        response: A `requests` response obtained with `stream=True`
+
+    Returns:
+        An iterator over the entities of the response
+
+    Raises:
+        SCV2RequestError: If the response carries an error status code or invalid JSON
+    """
+    try:
+        raise_for_status(response)
+
+        yield from iter_json_entities(response.iter_content(chunk_size=STREAM_CHUNK_SIZE), key=key)
+    finally:
+        response.close()
@@ -0,0 +1,166 @@
+import json
+import os
+import threading
+import time
+
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List
+
+class SCV2Tracer:
+    """
+    Records a timeline of the calls made by a session, exportable as Chrome
+    trace-event JSON (open it in chrome://tracing or https://ui.perfetto.dev).
+
+    Used by SCV2Session when passed as `sc_tracer`. Each attempt sent to the
+    tenant is recorded on the thread which sent it, split in:
+
+    - `ttfb`: from sending the request to receiving the response headers. This
+      includes getting a connection from the pool (or opening one), which
+      `requests` does not report separately.
+    - `download`: reading the response body.
+
+    Batch executions add the time each request waited in the ready queue
+    (`queue`, shown as an async track) and the run of the transform functions.
+    Paginated reads add the JSON `decode` of each page. Rate limiter waits and
+    retry backoffs are recorded as well.
+
+    Example:
+        tracer = SCV2Tracer()
+        session = SCV2Session(..., sc_tracer=tracer)
+        session.execute_batch(batch)
+        tracer.export('batch-trace.json')
+    """
+
+    # Maximum number of recorded events. Later events are dropped.
+    __max_events : int
+
+    def __init__(self, max_events : int = 1000000) -> None:
+
+        if max_events <= 0:
+            raise ValueError("Max events must be a positive integer")
+
+        self.__max_events = max_events
+        self.__lock = threading.Lock()
+        self.__local = threading.local()
+        self.__origin : float = time.perf_counter()
+        self.__events : List[dict] = [ ]
+        self.__threads : Dict[int, str] = { }
+        self.__dropped : int = 0
+
+    def __len__(self) -> int:
+        return len(self.__events)
+
+    @property
+    def dropped(self) -> int:
+        """
+        Number of events dropped because `max_events` was reached.
+        """
+        return self.__dropped
+
+    def __timestamp(self, instant : float) -> float:
+        # Trace events are expressed in microseconds
+        return round((instant - self.__origin) * 1000000, 3)
+
+    def __record(self, event : dict) -> None:
+        thread = threading.current_thread()
+
+        with self.__lock:
+            if len(self.__events) >= self.__max_events:
+                self.__dropped += 1
+                return
+
+            self.__threads.setdefault(thread.ident, thread.name)
+            self.__events.append(event)
+
+    def __args(self, args : Dict[str, Any]) -> Dict[str, Any]:
+        # Arguments of the enclosing scopes (e.g. the batch request ID) come first
+        scope : Dict[str, Any] = getattr(self.__local, 'scope', None)
+        return {**scope, **args} if scope else args
+
+    def span(self, name : str, category : str, start : float, end : float, **args) -> None:
+        """
+        Record a span of the current thread.
+
+        Args:
+            name: Name of the span
+            category: Category of the span (e.g. `http`, `batch`)
+            start: Start of the span, as a `time.perf_counter()` value
+            end: End of the span, as a `time.perf_counter()` value
+            args: Additional details shown with the span
+        """
+        self.__record({
+            'name': name,
+            'cat': category,
+            'ph': 'X',
+            'ts': self.__timestamp(start),
+            'dur': round(max(end - start, 0) * 1000000, 3),
+            'pid': os.getpid(),
+            'tid': threading.get_ident(),
+            'args': self.__args(args)
+        })
+
+    def async_span(self, name : str, category : str, key : Any, start : float, end : float, **args) -> None:
+        """
+        Record a span not bound to a thread (e.g. time spent waiting in a queue).
+        Spans of the same `name` and `key` are shown on the same track.
+        """
+        common : dict = { 'name': name, 'cat': category, 'id': str(key), 'pid': os.getpid(), 'tid': threading.get_ident() }
+
+        self.__record({**common, 'ph': 'b', 'ts': self.__timestamp(start), 'args': self.__args(args)})
+        self.__record({**common, 'ph': 'e', 'ts': self.__timestamp(end)})
+
+    @contextmanager
+    def measure(self, name : str, category : str, **args) -> Iterator[None]:
+        """
+        Record the code run in the `with` block as a span.
+        """
+        start : float = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.span(name, category, start, time.perf_counter(), **args)
+
+    @contextmanager
+    def scope(self, **args) -> Iterator[None]:
+        """
+        Add the given arguments to all the spans recorded by the current thread
+        in the `with` block.
+        """
+        previous : Dict[str, Any] = getattr(self.__local, 'scope', None)
+        self.__local.scope = {**(previous or { }), **args}
+        try:
+            yield
+        finally:
+            self.__local.scope = previous
+
+    def clear(self) -> None:
+        """
+        Remove all the recorded events.
+        """
+        with self.__lock:
+            self.__events = [ ]
+            self.__dropped = 0
+
+    def to_chrome_trace(self) -> dict:
+        """
+        Get the recorded timeline in the Chrome trace-event format.
+        """
+        with self.__lock:
+            events : List[dict] = list(self.__events)
+            threads : Dict[int, str] = dict(self.__threads)
+
+        pid : int = os.getpid()
+
+        metadata : List[dict] = [
+            { 'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': { 'name': name } }
+            for tid, name in threads.items()
+        ]
+
+        return { 'traceEvents': metadata + events, 'displayTimeUnit': 'ms' }
+
+    def export(self, path : str) -> None:
+        """
+        Write the recorded timeline to a Chrome trace-event JSON file.
+        """
+        with open(path, 'w', encoding='utf-8') as trace_file:
+            json.dump(self.to_chrome_trace(), trace_file, default=str)
@@ -2,16 +2,18 @@
 Exceptions raised by the scv2_api package.
 """
 
-from sc2py.exceptions.api_exceptions import (
+from scv2py.exceptions.api_exceptions import (
     SCV2InvalidEndpointException,
     SCV2ConnectionError,
     SCV2RequestError,
-    SCV2TimeoutError
+    SCV2TimeoutError,
+    SCV2CancelledError
 )
 
 __all__ = [
     'SCV2InvalidEndpointException',
     'SCV2ConnectionError',
     'SCV2RequestError',
-    'SCV2TimeoutError'
+    'SCV2TimeoutError',
+    'SCV2CancelledError'
 ]
\ No newline at end of file
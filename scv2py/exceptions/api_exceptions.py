@@ -4,4 +4,6 @@ class SCV2ConnectionError(Exception): pass
 
 class SCV2TimeoutError(Exception): pass
 
-class SCV2RequestError(Exception): pass
\ No newline at end of file
+class SCV2RequestError(Exception): pass
+
+class SCV2CancelledError(Exception): pass
@@ -1,18 +1,81 @@
 """
 Service definitions for the SAP Sales/Service Cloud V2 API.
+
+Endpoint enumerations are imported on first access, so that only the
+services actually used are loaded.
 """
 
+import importlib
+
+from typing import TYPE_CHECKING, Dict, List
+
 from scv2py.services.base import SCV2Service, SCV2BaseEndpoint
-from scv2py.services.sales_territory import SalesTerritoryServiceEndpoint
-from scv2py.services.collections_integration import CollectionsIntegrationServiceEndpoint
-from scv2py.services.contact_person import ContactPersonServiceEndpoint
-from scv2py.services.organizational_unit import OrganizationalUnitServiceEndpoint
-
-__all__ = [
-    'SCV2Service',
-    'SCV2BaseEndpoint',
-    'SalesTerritoryServiceEndpoint',
-    'CollectionsIntegrationServiceEndpoint',
-    'ContactPersonServiceEndpoint',
-    'OrganizationalUnitServiceEndpoint'
-]
\ No newline at end of file
+
+# Endpoint enumerations, with the module defining each of them
+_LAZY_ENDPOINTS : Dict[str, str] = {
+    'SalesTerritoryServiceEndpoint': 'scv2py.services.sales_territory',
+    'CollectionsIntegrationServiceEndpoint': 'scv2py.services.collections_integration',
+    'ContactPersonServiceEndpoint': 'scv2py.services.contact_person',
+    'OrganizationalUnitServiceEndpoint': 'scv2py.services.organizational_unit',
+    'AccountHierarchyServiceEndpoint': 'scv2py.services.account_hiearchy',
+    'AccountServiceEndpoint': 'scv2py.services.account',
+    'ActivityAssignmentServiceEndpoint': 'scv2py.services.activity_assignment',
+    'ActivityPlanServiceEndpoint': 'scv2py.services.activity_plan',
+    'AppointmentServiceEndpoint': 'scv2py.services.appointment',
+    'CaseServiceEndpoint': 'scv2py.services.case',
+    'CompetitorProductServiceEndpoint': 'scv2py.services.competitor_product',
+    'DocumentServiceServiceEndpoint': 'scv2py.services.document',
+    'EmployeeServiceEndpoint': 'scv2py.services.employee',
+    'FunctionalLocationServiceEndpoint': 'scv2py.services.functional_location',
+    'IndividualCustomerServiceEndpoint': 'scv2py.services.individual_customer',
+    'InstalledBaseServiceEndpoint': 'scv2py.services.installed_base',
+    'ChatServiceEndpoint': 'scv2py.services.chat',
+    'InteractionEmailServiceEndpoint': 'scv2py.services.interaction_email',
+    'InteractionPhoneServiceEndpoint': 'scv2py.services.interaction_phone',
+    'LeadServiceEndpoint': 'scv2py.services.lead',
+    'OpportunityServiceEndpoint': 'scv2py.services.opportunity',
+    'ProductGroupServiceEndpoint': 'scv2py.services.product_group',
+    'ProductServiceEndpoint': 'scv2py.services.product'
+}
+
+__all__ : List[str] = ['SCV2Service', 'SCV2BaseEndpoint'] + list(_LAZY_ENDPOINTS)
+
+def __getattr__(name : str):
+    module : str = _LAZY_ENDPOINTS.get(name)
+
+    if module is None:
+        raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+
+    return value
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
+
+# Static analyzers and IDEs do not run `__getattr__`
+if TYPE_CHECKING:
+    from scv2py.services.sales_territory import SalesTerritoryServiceEndpoint
+    from scv2py.services.collections_integration import CollectionsIntegrationServiceEndpoint
+    from scv2py.services.contact_person import ContactPersonServiceEndpoint
+    from scv2py.services.organizational_unit import OrganizationalUnitServiceEndpoint
+    from scv2py.services.account_hiearchy import AccountHierarchyServiceEndpoint
+    from scv2py.services.account import AccountServiceEndpoint
+    from scv2py.services.activity_assignment import ActivityAssignmentServiceEndpoint
+    from scv2py.services.activity_plan import ActivityPlanServiceEndpoint
+    from scv2py.services.appointment import AppointmentServiceEndpoint
+    from scv2py.services.case import CaseServiceEndpoint
+    from scv2py.services.competitor_product import CompetitorProductServiceEndpoint
+    from scv2py.services.document import DocumentServiceServiceEndpoint
+    from scv2py.services.employee import EmployeeServiceEndpoint
+    from scv2py.services.functional_location import FunctionalLocationServiceEndpoint
+    from scv2py.services.individual_customer import IndividualCustomerServiceEndpoint
+    from scv2py.services.installed_base import InstalledBaseServiceEndpoint
+    from scv2py.services.chat import ChatServiceEndpoint
+    from scv2py.services.interaction_email import InteractionEmailServiceEndpoint
+    from scv2py.services.interaction_phone import InteractionPhoneServiceEndpoint
+    from scv2py.services.lead import LeadServiceEndpoint
+    from scv2py.services.opportunity import OpportunityServiceEndpoint
+    from scv2py.services.product_group import ProductGroupServiceEndpoint
+    from scv2py.services.product import ProductServiceEndpoint
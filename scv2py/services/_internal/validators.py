@@ -1,4 +1,5 @@
-from typing import Type, Dict
+from types import MappingProxyType
+from typing import Type, Dict, Mapping, Tuple
 
 from scv2py.services import *
 
@@ -8,9 +9,42 @@ class InternalAPIEndpointSanitizer:
         SCV2Service.SALES_TERRITORY_SERVICE : SalesTerritoryServiceEndpoint,
         SCV2Service.UTILITIES_COLLECTION_SERVICE : CollectionsIntegrationServiceEndpoint,
         SCV2Service.CONTACT_PERSON_SERVICE : ContactPersonServiceEndpoint,
-        SCV2Service.ORGANIZATIONAL_UNIT_SERVICE : OrganizationalUnitServiceEndpoint
+        SCV2Service.ORGANIZATIONAL_UNIT_SERVICE : OrganizationalUnitServiceEndpoint,
+        SCV2Service.ACCOUNT_HIERARCHY_SERVICE : AccountHierarchyServiceEndpoint,
+        SCV2Service.ACCOUNT_SERVICE : AccountServiceEndpoint,
+        SCV2Service.ACTIVITY_ASSIGNMENT_RULE_SERVICE : ActivityAssignmentServiceEndpoint,
+        SCV2Service.ACTIVITY_PLAN_SERVICE : ActivityPlanServiceEndpoint,
+        SCV2Service.APPOINTMENT_SERVICE : AppointmentServiceEndpoint,
+        SCV2Service.CASE_SERVICE : CaseServiceEndpoint,
+        SCV2Service.COMPETITOR_PRODUCT_SERVICE : CompetitorProductServiceEndpoint,
+        SCV2Service.DOCUMENT_SERVICE : DocumentServiceServiceEndpoint,
+        SCV2Service.EMPLOYEE_SERVICE : EmployeeServiceEndpoint,
+        SCV2Service.FUNCTIONAL_LOCATION_SERVICE : FunctionalLocationServiceEndpoint,
+        SCV2Service.INDIVIDUAL_CUSTOMER_SERVICE : IndividualCustomerServiceEndpoint,
+        SCV2Service.INSTALL_BASE_SERVICE : InstalledBaseServiceEndpoint,
+        SCV2Service.CHAT_SERVICE : ChatServiceEndpoint,
+        SCV2Service.INTERACTION_EMAIL_SERVICE : InteractionEmailServiceEndpoint,
+        SCV2Service.INTERACTION_PHONE_SERVICE : InteractionPhoneServiceEndpoint,
+        SCV2Service.LEAD_SERVICE : LeadServiceEndpoint,
+        SCV2Service.OPPORTUNITY_SERVICE : OpportunityServiceEndpoint,
+        SCV2Service.PRODUCT_GROUP_SERVICE : ProductGroupServiceEndpoint,
+        SCV2Service.PRODUCT_SERVICE : ProductServiceEndpoint
     }
 
     @staticmethod
     def is_valid_endpoint(service : SCV2Service, endpoint : SCV2BaseEndpoint) -> bool:
-        return isinstance(endpoint, InternalAPIEndpointSanitizer.__SERVICE_ENDPOINT_MAP[service])
\ No newline at end of file
+        return isinstance(endpoint, InternalAPIEndpointSanitizer.__SERVICE_ENDPOINT_MAP[service])
+
+    @staticmethod
+    def get_endpoint_type(service : SCV2Service) -> Type[SCV2BaseEndpoint]:
+        return InternalAPIEndpointSanitizer.__SERVICE_ENDPOINT_MAP[service]
+
+    @staticmethod
+    def build_routing_table(base_url : str) -> Mapping[Tuple[SCV2Service, SCV2BaseEndpoint], str]:
+        # Read-only mapping from every (service, endpoint) pair defined by the API to its call URL.
+        # Pairs missing from the table are not valid calls.
+        return MappingProxyType({
+            (service, endpoint): f'{base_url}{service.value}/{endpoint.value}'
+            for service, endpoint_type in InternalAPIEndpointSanitizer.__SERVICE_ENDPOINT_MAP.items()
+            for endpoint in endpoint_type
+        })
@@ -1,6 +1,6 @@
 from scv2py.services.base import SCV2BaseEndpoint
 
-class AccountHierarchyServiceEndpoint(SCV2BaseEndpoint):
+class ProductGroupServiceEndpoint(SCV2BaseEndpoint):
     """
     Endpoints available in the Product Group Service.
     """
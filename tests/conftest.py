@@ -0,0 +1,46 @@
+import pytest
+
+from benchmarks.mock_tenant import MockTenant
+
+from scv2py.core.session import SCV2Session
+
+@pytest.fixture(autouse=True)
+def _trust_the_mock_tenant(monkeypatch):
+    # requests prefers these variables over the `verify` setting of the session
+    monkeypatch.delenv('REQUESTS_CA_BUNDLE', raising=False)
+    monkeypatch.delenv('CURL_CA_BUNDLE', raising=False)
+
+@pytest.fixture
+def make_tenant():
+    """
+    Start mock tenants (see `benchmarks.mock_tenant`), stopped after the test.
+    """
+    tenants = [ ]
+
+    def make(**kwargs) -> MockTenant:
+        tenant = MockTenant(**kwargs)
+        tenant.start()
+        tenants.append(tenant)
+        return tenant
+
+    yield make
+
+    for tenant in tenants:
+        tenant.stop()
+
+@pytest.fixture
+def make_session():
+    """
+    Open sessions on a mock tenant, closed after the test.
+    """
+    sessions = [ ]
+
+    def make(tenant : MockTenant, **kwargs) -> SCV2Session:
+        session = SCV2Session(sc_host=tenant.host, sc_user='user', sc_password='password', sc_verify_ssl=tenant.certificate, **kwargs)
+        sessions.append(session)
+        return session
+
+    yield make
+
+    for session in sessions:
+        session.close()
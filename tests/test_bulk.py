@@ -0,0 +1,66 @@
+import pytest
+
+from scv2py.services import SCV2Service, AccountServiceEndpoint
+
+from scv2py.core.bulk import SCV2BulkWriter
+
+SERVICE, ENDPOINT = SCV2Service.ACCOUNT_SERVICE, AccountServiceEndpoint.ACCOUNT
+
+def test_one_result_per_item(make_tenant, make_session):
+    tenant = make_tenant()
+    writer = SCV2BulkWriter(make_session(tenant), max_workers=2, max_pending=4)
+
+    items = [{ 'formattedName': f'Account {index}' } for index in range(25)]
+    results = writer.write(SERVICE, ENDPOINT, items)
+
+    assert [result['index'] for result in results] == list(range(25))
+    assert all(result['success'] and result['status'] == 201 for result in results)
+    assert len({ result['resource_id'] for result in results }) == 25
+
+def test_invalid_items_do_not_stop_the_load(make_tenant, make_session):
+    tenant = make_tenant()
+    writer = SCV2BulkWriter(make_session(tenant), max_workers=2, max_pending=4)
+
+    # The first window of the pipeline is made of invalid items only
+    items = [{ }] * 4 + [{ 'a': 1 }] * 3 + [{ }] * 5 + [{ 'a': 2 }]
+    results = writer.write(SERVICE, ENDPOINT, items)
+
+    assert [result['index'] for result in results] == list(range(len(items)))
+    assert [result['success'] for result in results] == [bool(item) for item in items]
+    assert all(isinstance(result['error'], ValueError) for result in results if not items[result['index']])
+
+def test_updates_report_outdated_etags(make_tenant, make_session):
+    tenant = make_tenant()
+    ids = tenant.seed(SERVICE.value, ENDPOINT.value, 3)
+    session = make_session(tenant)
+
+    results = session.bulk_write(SERVICE, ENDPOINT, [
+        (ids[0], { 'formattedName': 'A' }, 'W/"1"'),
+        (ids[1], { 'formattedName': 'B' }, 'W/"7"'),
+        (ids[2], None)
+    ], http_method='PATCH')
+
+    assert [result['status'] for result in results] == [200, 412, None]
+    assert results[0]['etag'] == 'W/"2"'
+    assert [result['resource_id'] for result in results] == [ids[0], ids[1], None]
+
+def test_the_input_is_read_lazily(make_tenant, make_session):
+    tenant = make_tenant()
+    writer = SCV2BulkWriter(make_session(tenant), max_workers=2, max_pending=4)
+    read = [ ]
+
+    def items():
+        for index in range(100):
+            read.append(index)
+            yield { 'formattedName': f'Account {index}' }
+
+    results = writer.iter_write(SERVICE, ENDPOINT, items())
+    next(results)
+    results.close()
+
+    assert len(read) <= 5
+    assert tenant.stats['requests'] <= 4
+
+def test_unsupported_method():
+    with pytest.raises(ValueError):
+        list(SCV2BulkWriter(session=None).iter_write(SERVICE, ENDPOINT, [ ], http_method='DELETE'))
@@ -0,0 +1,116 @@
+import threading
+import time
+
+import pytest
+
+from scv2py.exceptions import SCV2CancelledError
+from scv2py.services import SCV2Service, AccountServiceEndpoint
+
+from scv2py.core.batch import SCV2ClientBatchRequest
+from scv2py.core.cancellation import SCV2CancellationToken, current_token
+
+SERVICE, ENDPOINT = SCV2Service.ACCOUNT_SERVICE, AccountServiceEndpoint.ACCOUNT
+
+def _batch(ids) -> SCV2ClientBatchRequest:
+    batch = SCV2ClientBatchRequest()
+
+    for index, resource_id in enumerate(ids):
+        batch.add_get_request(f'r{index}', SERVICE, ENDPOINT, resource_id=resource_id)
+
+    batch.add_dependent_request('child', f'r{len(ids) - 1}', lambda response: {
+        'http_method': 'GET', 'sc_service': SERVICE, 'sc_endpoint': ENDPOINT, 'sc_resource_id': ids[0]
+    })
+
+    return batch
+
+def test_token():
+    parent = SCV2CancellationToken()
+    token = SCV2CancellationToken(timeout=10, parent=parent)
+
+    assert not token.cancelled and token.reason is None
+    assert 9 < token.remaining() <= 10
+
+    with token:
+        assert current_token() is token
+    assert current_token() is None
+
+    # The cancellation of the parent wakes up a waiting child
+    threading.Timer(0.1, parent.cancel).start()
+    started = time.monotonic()
+
+    assert token.wait(5)
+    assert time.monotonic() - started < 1
+    assert token.reason == 'cancelled'
+
+    with pytest.raises(SCV2CancelledError):
+        token.raise_if_cancelled()
+
+    expired = SCV2CancellationToken(timeout=0)
+    assert expired.expired and expired.reason == 'deadline exceeded'
+
+def test_batch_deadline(make_tenant, make_session):
+    tenant = make_tenant(latency=0.4)
+    ids = tenant.seed(SERVICE.value, ENDPOINT.value, 4)
+
+    started = time.monotonic()
+    results = make_session(tenant).execute_batch(_batch(ids), max_workers=1, deadline=0.6)
+
+    assert time.monotonic() - started < 1.2
+
+    # Partial results: every request has one, the dropped ones are cancelled
+    assert set(results) == { 'r0', 'r1', 'r2', 'r3', 'child' }
+    assert results['r0']['success']
+
+    for request_id in ('r2', 'r3', 'child'):
+        assert not results[request_id]['success']
+        assert isinstance(results[request_id]['error'], SCV2CancelledError)
+
+    # The call in flight at the deadline timed out by it
+    assert isinstance(results['r1']['error'], SCV2CancelledError)
+
+def test_batch_cancel(make_tenant, make_session):
+    tenant = make_tenant(latency=0.3)
+    ids = tenant.seed(SERVICE.value, ENDPOINT.value, 6)
+
+    token = SCV2CancellationToken()
+    threading.Timer(0.1, token.cancel).start()
+
+    started = time.monotonic()
+    results = make_session(tenant).execute_batch(_batch(ids), max_workers=2, cancel_token=token)
+
+    # The queued requests are dropped right away, the calls in flight complete
+    assert time.monotonic() - started < 0.6
+    assert results['r0']['success'] and results['r1']['success']
+    assert tenant.stats['requests'] == 2
+
+    for request_id in ('r2', 'r3', 'r4', 'r5', 'child'):
+        assert isinstance(results[request_id]['error'], SCV2CancelledError)
+
+def test_iter_collection_deadline(make_tenant, make_session):
+    tenant = make_tenant(latency=0.2)
+    ids = tenant.seed(SERVICE.value, ENDPOINT.value, 100)
+    received = [ ]
+
+    started = time.monotonic()
+    with pytest.raises(SCV2CancelledError):
+        for entity in make_session(tenant).iter_collection(SERVICE, ENDPOINT, page_size=10, prefetch=False, deadline=0.5):
+            received.append(entity['id'])
+
+    assert time.monotonic() - started < 1.0
+
+    # The entities received before the deadline were yielded
+    assert 0 < len(received) < len(ids) and received == ids[:len(received)]
+
+def test_cancelled_token_sends_nothing(make_tenant, make_session):
+    tenant = make_tenant()
+    ids = tenant.seed(SERVICE.value, ENDPOINT.value, 1)
+    session = make_session(tenant)
+
+    token = SCV2CancellationToken()
+    token.cancel()
+
+    with pytest.raises(SCV2CancelledError):
+        with token:
+            session.get(SERVICE, ENDPOINT, resource_id=ids[0])
+
+    assert tenant.stats['requests'] == 0
@@ -0,0 +1,35 @@
+import time
+
+from scv2py.services import SCV2Service, AccountServiceEndpoint
+
+from scv2py.core.decode_pool import SCV2DecodePool
+
+SERVICE, ENDPOINT = SCV2Service.ACCOUNT_SERVICE, AccountServiceEndpoint.ACCOUNT
+
+def test_pipelined_pages_in_order(make_tenant, make_session):
+    tenant = make_tenant(max_page_size=40)
+    ids = tenant.seed(SERVICE.value, ENDPOINT.value, 230)
+    session = make_session(tenant)
+
+    with SCV2DecodePool(max_workers=2) as pool:
+        # Windows shortened by the server page cap are completed
+        entities = list(session.iter_collection(SERVICE, ENDPOINT, page_size=50, decode_pool=pool))
+
+    assert [entity['id'] for entity in entities] == ids
+
+def test_one_window_per_worker(make_tenant, make_session):
+    tenant = make_tenant()
+    tenant.seed(SERVICE.value, ENDPOINT.value, 100)
+    session = make_session(tenant)
+
+    with SCV2DecodePool(max_workers=2) as pool:
+        entities = session.iter_collection(SERVICE, ENDPOINT, page_size=10, decode_pool=pool)
+        next(entities)
+
+        # Let the windows submitted ahead of the consumer complete
+        time.sleep(0.5)
+
+        # The consumed window, and one window per worker
+        assert tenant.stats['requests'] == 3
+
+        entities.close()
@@ -0,0 +1,49 @@
+import pytest
+
+from scv2py.services import SCV2Service, AccountServiceEndpoint
+
+from scv2py.core.batch import SCV2ClientBatchRequest
+from scv2py.core.etag import SCV2ETagStore
+
+SERVICE, ENDPOINT = SCV2Service.ACCOUNT_SERVICE, AccountServiceEndpoint.ACCOUNT
+
+def test_patch_without_etag_requires_a_store(make_tenant, make_session):
+    tenant = make_tenant()
+    ids = tenant.seed(SERVICE.value, ENDPOINT.value, 1)
+    session = make_session(tenant)
+
+    with pytest.raises(ValueError):
+        session.patch(SERVICE, ENDPOINT, ids[0], { 'formattedName': 'A' })
+
+    # Nothing was sent
+    assert tenant.stats['requests'] == 0
+
+    assert session.patch(SERVICE, ENDPOINT, ids[0], { 'formattedName': 'A' }, etag='W/"1"').status_code == 200
+
+def test_batch_patch_without_etag_fails_without_a_store(make_tenant, make_session):
+    tenant = make_tenant()
+    ids = tenant.seed(SERVICE.value, ENDPOINT.value, 1)
+
+    batch = SCV2ClientBatchRequest()
+    batch.add_patch_request('p', SERVICE, ENDPOINT, ids[0], { 'formattedName': 'A' })
+
+    result = make_session(tenant).execute_batch(batch)['p']
+    assert not result['success'] and isinstance(result['error'], ValueError)
+
+    result = make_session(tenant, sc_etag_store=SCV2ETagStore()).execute_batch(batch)['p']
+    assert result['success'] and result['response'].headers['ETag'] == 'W/"2"'
+
+def test_store_refreshes_outdated_etags(make_tenant, make_session):
+    tenant = make_tenant()
+    ids = tenant.seed(SERVICE.value, ENDPOINT.value, 1)
+    store = SCV2ETagStore()
+    session = make_session(tenant, sc_etag_store=store)
+
+    session.get(SERVICE, ENDPOINT, resource_id=ids[0])
+    assert store.get(SERVICE, ENDPOINT, ids[0]) == 'W/"1"'
+
+    # Updated by someone else: the stored ETag is outdated
+    make_session(tenant).patch(SERVICE, ENDPOINT, ids[0], { 'formattedName': 'B' }, etag='W/"1"')
+
+    assert session.patch(SERVICE, ENDPOINT, ids[0], { 'formattedName': 'C' }).status_code == 200
+    assert store.get(SERVICE, ENDPOINT, ids[0]) == 'W/"3"'
@@ -0,0 +1,137 @@
+from scv2py.exceptions import SCV2RequestError
+from scv2py.services import SCV2Service, AccountServiceEndpoint
+
+from scv2py.core.batch import SCV2ClientBatchRequest
+
+SERVICE, ENDPOINT = SCV2Service.ACCOUNT_SERVICE, AccountServiceEndpoint.ACCOUNT
+
+def _read(resource_id):
+    return { 'http_method': 'GET', 'sc_service': SERVICE, 'sc_endpoint': ENDPOINT, 'sc_resource_id': resource_id }
+
+def test_priorities(make_tenant, make_session):
+    tenant = make_tenant()
+    ids = tenant.seed(SERVICE.value, ENDPOINT.value, 4)
+
+    batch = SCV2ClientBatchRequest()
+    for index, priority in enumerate([0, 1, 5, 2]):
+        batch.add_get_request(f'r{index}', SERVICE, ENDPOINT, priority=priority, resource_id=ids[index])
+
+    # A single worker sends the requests one by one, highest priority first
+    order = [request_id for request_id, _ in make_session(tenant).iter_batch(batch, max_workers=1)]
+    assert order == ['r2', 'r3', 'r1', 'r0']
+
+def test_dependents(make_tenant, make_session):
+    tenant = make_tenant()
+    ids = tenant.seed(SERVICE.value, ENDPOINT.value, 2)
+
+    batch = SCV2ClientBatchRequest()
+    batch.add_get_request('parent', SERVICE, ENDPOINT, resource_id=ids[0])
+    batch.add_dependent_request('child', 'parent', lambda response: _read(ids[1]), priority=10)
+    batch.add_get_request('missing', SERVICE, ENDPOINT, resource_id='unknown')
+    batch.add_dependent_request('orphan', 'missing', lambda response: _read(ids[1]))
+    batch.add_dependent_request('grandchild', 'orphan', lambda response: _read(ids[1]))
+
+    order = [ ]
+    results = make_session(tenant).execute_batch(batch, on_result=lambda request_id, result: order.append(request_id))
+
+    assert results['child']['success'] and results['child']['response'].json()['value']['id'] == ids[1]
+    assert order.index('parent') < order.index('child')
+
+    # Dependents of a failed request fail as well, down the whole chain
+    assert results['missing']['response'].status_code == 404
+    for request_id in ('orphan', 'grandchild'):
+        assert not results[request_id]['success'] and isinstance(results[request_id]['error'], SCV2RequestError)
+
+    # The failed dependents were never sent
+    assert tenant.stats['requests'] == 3
+
+def test_fan_out(make_tenant, make_session):
+    tenant = make_tenant()
+    ids = tenant.seed(SERVICE.value, ENDPOINT.value, 3)
+    received = [ ]
+
+    def read_all(response):
+        return [_read(resource_id) for resource_id in ids]
+
+    def collect(responses):
+        received.extend(response.json()['value']['id'] for response in responses)
+        return _read(ids[0])
+
+    batch = SCV2ClientBatchRequest()
+    batch.add_get_request('parent', SERVICE, ENDPOINT, resource_id=ids[0])
+    batch.add_dependent_request('each', 'parent', read_all)
+    batch.add_dependent_request('after', 'each', collect)
+
+    order = [request_id for request_id, _ in make_session(tenant).iter_batch(batch)]
+    results = make_session(tenant).execute_batch(batch)
+
+    # The fanned out requests are reported before the request which created them
+    assert sorted(order[1:4]) == ['each[0]', 'each[1]', 'each[2]']
+    assert order[4:] == ['each', 'after']
+
+    assert [response.json()['value']['id'] for response in results['each']['response']] == ids
+    assert results['after']['success'] and received[:3] == ids
+
+def test_failed_fan_out(make_tenant, make_session):
+    tenant = make_tenant()
+    ids = tenant.seed(SERVICE.value, ENDPOINT.value, 1)
+
+    batch = SCV2ClientBatchRequest()
+    batch.add_get_request('parent', SERVICE, ENDPOINT, resource_id=ids[0])
+    batch.add_dependent_request('each', 'parent', lambda response: [_read(ids[0]), _read('unknown')])
+
+    results = make_session(tenant).execute_batch(batch)
+
+    assert results['each[0]']['success'] and not results['each[1]']['success']
+    assert not results['each']['success'] and isinstance(results['each']['error'], SCV2RequestError)
+
+def test_identical_gets_are_sent_once(make_tenant, make_session):
+    tenant = make_tenant(latency=0.1)
+    ids = tenant.seed(SERVICE.value, ENDPOINT.value, 1)
+
+    batch = SCV2ClientBatchRequest()
+    for index in range(4):
+        batch.add_get_request(f'r{index}', SERVICE, ENDPOINT, resource_id=ids[0])
+
+    results = make_session(tenant).execute_batch(batch)
+
+    assert all(result['success'] for result in results.values())
+    assert tenant.stats['requests'] == 1
+
+def test_merged_gets(make_tenant, make_session):
+    tenant = make_tenant()
+    ids = tenant.seed(SERVICE.value, ENDPOINT.value, 5)
+
+    batch = SCV2ClientBatchRequest()
+    for resource_id in ids:
+        batch.add_get_request(resource_id, SERVICE, ENDPOINT, resource_id=resource_id)
+    batch.add_get_request('missing', SERVICE, ENDPOINT, resource_id='unknown')
+
+    results = make_session(tenant).execute_batch(batch, merge_gets=True)
+
+    for resource_id in ids:
+        assert results[resource_id]['success']
+        assert results[resource_id]['response'].json()['value']['id'] == resource_id
+
+    # Entities missing from the merged answer are read one by one
+    assert results['missing']['response'].status_code == 404
+    assert tenant.stats['requests'] == 2
+
+def test_merged_gets_of_a_plan(make_tenant, make_session):
+    tenant = make_tenant()
+    ids = tenant.seed(SERVICE.value, ENDPOINT.value, 4)
+
+    batch = SCV2ClientBatchRequest()
+    batch.add_get_request('a', SERVICE, ENDPOINT, resource_id='{first}')
+    batch.add_get_request('b', SERVICE, ENDPOINT, resource_id='{second}')
+    batch.add_dependent_request('c', 'a', lambda response: _read(response.json()['value']['id']))
+
+    plan = batch.compile()
+    session = make_session(tenant)
+
+    for first, second in ((ids[0], ids[1]), (ids[2], ids[3])):
+        results = session.execute_batch(plan, merge_gets=True, params={ 'first': first, 'second': second })
+        assert [results[request_id]['response'].json()['value']['id'] for request_id in 'abc'] == [first, second, first]
+
+    # One merged GET and one dependent GET per run
+    assert tenant.stats['requests'] == 4
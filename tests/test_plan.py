@@ -0,0 +1,81 @@
+import pytest
+
+from scv2py.services import SCV2Service, AccountServiceEndpoint
+
+from scv2py.core.batch import SCV2ClientBatchRequest
+
+SERVICE, ENDPOINT = SCV2Service.ACCOUNT_SERVICE, AccountServiceEndpoint.ACCOUNT
+
+def _read(parent_response):
+    return { 'http_method': 'GET', 'sc_service': SERVICE, 'sc_endpoint': ENDPOINT }
+
+def test_levels_and_graph():
+    batch = SCV2ClientBatchRequest()
+    batch.add_get_request('a', SERVICE, ENDPOINT)
+    batch.add_get_request('b', SERVICE, ENDPOINT, priority=5)
+    batch.add_dependent_request('c', depends_on='a', transform_function=_read)
+    batch.add_dependent_request('d', depends_on='c', transform_function=_read)
+    batch.add_dependent_request('e', depends_on='a', transform_function=_read)
+
+    plan = batch.compile()
+    assert plan.levels == (('a', 'b'), ('c', 'e'), ('d',))
+
+    roots, children = plan.bind_graph()
+    assert [entry['_id'] for entry in roots] == ['b', 'a']
+    assert { parent: [entry['_id'] for entry in entries] for parent, entries in children.items() } == { 'a': ['c', 'e'], 'c': ['d'] }
+
+def test_missing_parent():
+    batch = SCV2ClientBatchRequest()
+    batch.add_get_request('a', SERVICE, ENDPOINT)
+    batch.add_dependent_request('b', depends_on='a', transform_function=_read)
+    batch.remove_request('a')
+
+    with pytest.raises(ValueError, match="Parent request 'a'"):
+        batch.compile()
+
+def test_cycle():
+    batch = SCV2ClientBatchRequest()
+    batch.add_get_request('a', SERVICE, ENDPOINT)
+    batch.add_get_request('root', SERVICE, ENDPOINT)
+    batch.add_dependent_request('b', depends_on='a', transform_function=_read)
+    batch.remove_request('a')
+    batch.add_dependent_request('a', depends_on='b', transform_function=_read)
+
+    with pytest.raises(ValueError, match='Circular dependency between requests: a, b'):
+        batch.compile()
+
+def test_binding():
+    batch = SCV2ClientBatchRequest()
+    batch.add_get_request('single', SERVICE, ENDPOINT, resource_id='{account_id}')
+    batch.add_get_request('mixed', SERVICE, ENDPOINT, filter="id eq '{account_id}' and name eq '{{x}}'")
+    batch.add_get_request('escaped', SERVICE, ENDPOINT, filter="name eq '{{x}}'")
+    batch.add_get_request('plain', SERVICE, ENDPOINT, filter="name eq '{x'")
+
+    plan = batch.compile()
+    assert plan.parameters == { 'account_id' }
+
+    entries = { entry['_id']: entry for entry in plan.bind({ 'account_id': 42 }) }
+
+    # A value made of a single placeholder keeps the type of the bound value
+    assert entries['single']['sc_resource_id'] == 42
+
+    # Escaped braces are unescaped whether or not the string has placeholders
+    assert entries['mixed']['sc_params']['$filter'] == "id eq '42' and name eq '{x}'"
+    assert entries['escaped']['sc_params']['$filter'] == "name eq '{x}'"
+    assert entries['plain']['sc_params']['$filter'] == "name eq '{x'"
+
+    # Requests without anything to bind are shared by the runs
+    assert entries['plain'] is plan.get_requests()[3]
+
+    with pytest.raises(ValueError, match='account_id'):
+        plan.bind()
+
+def test_plan_is_a_snapshot():
+    batch = SCV2ClientBatchRequest()
+    batch.add_get_request('a', SERVICE, ENDPOINT, filter="id eq '{account_id}'")
+
+    plan = batch.compile()
+    batch.remove_request('a')
+
+    assert len(plan) == 1
+    assert plan.bind({ 'account_id': 1 })[0]['sc_params']['$filter'] == "id eq '1'"
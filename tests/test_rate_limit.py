@@ -0,0 +1,53 @@
+import threading
+import time
+
+import pytest
+
+from scv2py.exceptions import SCV2CancelledError
+
+from scv2py.core.rate_limit import SCV2RateLimiter, SCV2FileRateLimiter, fcntl
+from scv2py.core.cancellation import SCV2CancellationToken
+
+def test_refused_reservation_keeps_the_slot():
+    limiter = SCV2RateLimiter(rate=1, burst=1)
+
+    assert limiter.reserve() == 0
+
+    # The next slot is a second away: refused, and not taken
+    assert limiter.reserve(max_delay=0.1) is None
+    assert 0.9 < limiter.reserve() <= 1.0
+
+def test_acquire_past_the_deadline_does_not_take_a_slot():
+    limiter = SCV2RateLimiter(rate=1, burst=1)
+    limiter.acquire()
+
+    started : float = time.monotonic()
+    with pytest.raises(SCV2CancelledError):
+        limiter.acquire(cancel_token=SCV2CancellationToken(timeout=0.2))
+    assert time.monotonic() - started < 0.1
+
+    assert limiter.reserve() <= 1.0
+
+def test_acquire_stops_waiting_on_cancel():
+    limiter = SCV2RateLimiter(rate=1, burst=1)
+    limiter.acquire()
+
+    token = SCV2CancellationToken(timeout=5)
+    started : float = time.monotonic()
+
+    threading.Timer(0.2, token.cancel).start()
+
+    with pytest.raises(SCV2CancelledError):
+        limiter.acquire(cancel_token=token)
+    assert time.monotonic() - started < 0.5
+
+@pytest.mark.skipif(fcntl is None, reason='fcntl is not available')
+def test_file_limiter_shares_the_budget(tmp_path):
+    path = str(tmp_path / 'rate')
+    first = SCV2FileRateLimiter(path, rate=1, burst=1)
+    second = SCV2FileRateLimiter(path, rate=1, burst=1)
+
+    assert first.reserve() == 0
+    assert second.reserve(max_delay=0.1) is None
+    assert 0.9 < second.reserve() <= 1.0
+    assert second.blocking and not SCV2RateLimiter.blocking
@@ -0,0 +1,66 @@
+import threading
+import time
+
+import pytest
+
+from scv2py.exceptions import SCV2CancelledError
+from scv2py.services import SCV2Service, AccountServiceEndpoint
+
+from scv2py.core.cancellation import SCV2CancellationToken
+
+SERVICE, ENDPOINT = SCV2Service.ACCOUNT_SERVICE, AccountServiceEndpoint.ACCOUNT
+
+def _start_leader(session, resource_id) -> threading.Thread:
+    leader = threading.Thread(target=session.get, args=(SERVICE, ENDPOINT), kwargs={ 'resource_id': resource_id })
+    leader.start()
+
+    # Let the leader register its call before the follower joins it
+    time.sleep(0.2)
+
+    return leader
+
+def test_follower_honours_its_deadline(make_tenant, make_session):
+    tenant = make_tenant(latency=1.5)
+    ids = tenant.seed(SERVICE.value, ENDPOINT.value, 1)
+    session = make_session(tenant, sc_coalesce_gets=True)
+    leader = _start_leader(session, ids[0])
+
+    started = time.monotonic()
+
+    with pytest.raises(SCV2CancelledError):
+        with SCV2CancellationToken(timeout=0.3):
+            session.get(SERVICE, ENDPOINT, resource_id=ids[0])
+
+    assert time.monotonic() - started < 1.0
+
+    leader.join()
+    assert tenant.stats['requests'] == 1
+
+def test_follower_honours_cancel(make_tenant, make_session):
+    tenant = make_tenant(latency=1.5)
+    ids = tenant.seed(SERVICE.value, ENDPOINT.value, 1)
+    session = make_session(tenant, sc_coalesce_gets=True)
+    leader = _start_leader(session, ids[0])
+
+    token = SCV2CancellationToken()
+    threading.Timer(0.2, token.cancel).start()
+    started = time.monotonic()
+
+    with pytest.raises(SCV2CancelledError):
+        with token:
+            session.get(SERVICE, ENDPOINT, resource_id=ids[0])
+
+    assert time.monotonic() - started < 1.0
+    leader.join()
+
+def test_follower_shares_the_response(make_tenant, make_session):
+    tenant = make_tenant(latency=0.5)
+    ids = tenant.seed(SERVICE.value, ENDPOINT.value, 1)
+    session = make_session(tenant, sc_coalesce_gets=True)
+    leader = _start_leader(session, ids[0])
+
+    with SCV2CancellationToken(timeout=5):
+        assert session.get(SERVICE, ENDPOINT, resource_id=ids[0]).status_code == 200
+
+    leader.join()
+    assert tenant.stats['requests'] == 1
@@ -0,0 +1,69 @@
+import json
+
+import pytest
+
+from scv2py.exceptions import SCV2RequestError
+
+from scv2py.core.streaming import iter_json_entities
+
+# Payloads whose entities are compared with a plain `json.loads`
+FIXTURES = {
+    'numbers': b'{"value":[1.5e10,2,-3,0.25,1E-7,12345678901234567890]}',
+    'literals': b'{"value":[true,false,null]}',
+    'entities': b'{"@odata.context":"$metadata#Accounts","value":[{"id":"A1","revenue":1.5,"tags":["a","b"]},{"id":"A2","revenue":null}],"count":2}',
+    'members after value': b'{"value":[{"id":1}],"@odata.nextLink":"next"}',
+    'nested': b'{"value":[{"a":{"b":[1,{"c":[]}]},"d":{}}]}',
+    'strings': '{"value":["café \U0001f600","a\\"b\\\\c\\u00e9",", ] }"]}'.encode('utf-8'),
+    'whitespace': b' {\n "value" : [ 1 ,\t2.0 , { "id" : 3 } ]\r\n} ',
+    'single entity': b'{"value":{"id":"A1","revenue":10.5}}',
+    'bare array': b'[1,2.5,{"id":3}]',
+    'empty': b'{"value":[]}',
+    'no value': b'{"count":0}'
+}
+
+def _expected(payload : bytes) -> list:
+    decoded = json.loads(payload)
+
+    if isinstance(decoded, dict):
+        decoded = decoded.get('value', [])
+
+    return decoded if isinstance(decoded, list) else [decoded]
+
+@pytest.mark.parametrize('name', FIXTURES)
+def test_every_split_offset(name):
+    payload : bytes = FIXTURES[name]
+    expected : list = _expected(payload)
+
+    for offset in range(len(payload) + 1):
+        assert list(iter_json_entities([payload[:offset], payload[offset:]])) == expected, offset
+
+@pytest.mark.parametrize('name', FIXTURES)
+def test_every_split_pair(name):
+    payload : bytes = FIXTURES[name]
+    expected : list = _expected(payload)
+
+    for first in range(len(payload) + 1):
+        for second in range(first, len(payload) + 1):
+            chunks = [payload[:first], payload[first:second], payload[second:]]
+            assert list(iter_json_entities(chunks)) == expected, (first, second)
+
+@pytest.mark.parametrize('name', FIXTURES)
+def test_single_byte_chunks(name):
+    payload : bytes = FIXTURES[name]
+
+    assert list(iter_json_entities(payload[i:i + 1] for i in range(len(payload)))) == _expected(payload)
+
+def test_custom_key():
+    assert list(iter_json_entities([b'{"value":[1],"items":[2,', b'3]}'], key='items')) == [2, 3]
+
+@pytest.mark.parametrize('payload', [
+    b'{"value":[1,2',
+    b'{"value":[{"id":1}',
+    b'{"value":[1.5e]}',
+    b'{"value":[tru]}',
+    b'"value"'
+])
+def test_invalid_payloads(payload):
+    for offset in range(len(payload) + 1):
+        with pytest.raises(SCV2RequestError):
+            list(iter_json_entities([payload[:offset], payload[offset:]]))
@@ -0,0 +1,52 @@
+import json
+
+from scv2py.services import SCV2Service, AccountServiceEndpoint, LeadServiceEndpoint
+
+from scv2py.core.sync import SCV2DeltaSync
+
+SERVICE, ENDPOINT = SCV2Service.ACCOUNT_SERVICE, AccountServiceEndpoint.ACCOUNT
+
+def test_sync_reads_past_capped_pages(make_tenant, make_session, tmp_path):
+    tenant = make_tenant(max_page_size=100)
+    ids = tenant.seed(SERVICE.value, ENDPOINT.value, 1050)
+    delta = SCV2DeltaSync(make_session(tenant), checkpoint_path=str(tmp_path / 'sync.json'))
+
+    synced = [entity['id'] for entity in delta.sync(SERVICE, ENDPOINT, page_size=300)]
+
+    assert sorted(synced) == sorted(ids)
+    assert delta.get_watermark(SERVICE, ENDPOINT)['key'] == max(ids)
+
+def test_sync_resumes_from_the_watermark(make_tenant, make_session, tmp_path):
+    tenant = make_tenant()
+    ids = tenant.seed(SERVICE.value, ENDPOINT.value, 50)
+    session = make_session(tenant)
+    path = str(tmp_path / 'sync.json')
+
+    # Stopping in the middle of the second page: only the first one is checkpointed
+    first_run = [ ]
+    for entity in SCV2DeltaSync(session, checkpoint_path=path).sync(SERVICE, ENDPOINT, page_size=20):
+        first_run.append(entity['id'])
+        if len(first_run) == 30:
+            break
+
+    second_run = [entity['id'] for entity in SCV2DeltaSync(session, checkpoint_path=path).sync(SERVICE, ENDPOINT, page_size=20)]
+
+    assert sorted(set(first_run[:20] + second_run)) == sorted(ids)
+    assert len(second_run) == 30
+
+    # Nothing changed since: nothing to read
+    assert list(SCV2DeltaSync(session, checkpoint_path=path).sync(SERVICE, ENDPOINT, page_size=20)) == [ ]
+
+def test_endpoints_share_one_checkpoint_file(make_tenant, make_session, tmp_path):
+    tenant = make_tenant()
+    tenant.seed(SERVICE.value, ENDPOINT.value, 5)
+    path = tmp_path / 'sync.json'
+    delta = SCV2DeltaSync(make_session(tenant), checkpoint_path=str(path))
+
+    list(delta.sync(SERVICE, ENDPOINT))
+    delta.reset(SCV2Service.LEAD_SERVICE, LeadServiceEndpoint.LEAD)
+
+    assert list(json.loads(path.read_text())) == [f'{SERVICE.value}/{ENDPOINT.value}']
+
+    delta.reset(SERVICE, ENDPOINT)
+    assert delta.get_watermark(SERVICE, ENDPOINT) is None